@@ -0,0 +1,149 @@
+"""
+Maintenance commands, run with `python -m app.cli <command>`.
+"""
+import argparse
+import sys
+from datetime import date
+
+from app.config import EXPENSE_BULK_BATCH_SIZE, RECURRING_BATCH_SIZE
+from app.db import SessionLocal
+from app.models import category, exchange_rate, expense, expense_monthly_total, recurring_expense, user  # noqa: F401  (register mappers)
+from app.schemas.statement_import_schema import DebitSign, StatementFormat, StatementImportResult
+from app.services.balance_service import reconcile_balances
+from app.services.exchange_rate_service import load_rates, parse_rates_csv, revalue_expenses
+from app.services.monthly_total_service import rebuild_monthly_totals
+from app.services.recurring_expense_service import materialise_due_occurrences
+from app.services.statement_import_service import import_statement
+from app.services.user_service import get_user_by_email
+
+
+def reconcile_balances_command(args: argparse.Namespace) -> None:
+    with SessionLocal() as db:
+        repaired = reconcile_balances(db, user_id=args.user_id)
+
+    for user_id, stored, actual in repaired:
+        print(f"user {user_id}: total_spent {stored} -> {actual}")
+    print(f"{len(repaired)} balance(s) repaired")
+
+
+def rebuild_monthly_totals_command(args: argparse.Namespace) -> None:
+    with SessionLocal() as db:
+        rebuild_monthly_totals(db, user_id=args.user_id)
+    print("monthly totals rebuilt")
+
+
+def load_rates_command(args: argparse.Namespace) -> None:
+    with open(args.path, encoding="utf-8-sig", newline="") as stream:
+        try:
+            rates = list(parse_rates_csv(stream))
+        except ValueError as exc:
+            sys.exit(f"{args.path}: {exc}")
+
+    with SessionLocal() as db:
+        written = load_rates(db, rates, batch_size=args.batch_size)
+        print(f"{written} exchange rate(s) loaded")
+        if args.skip_rebuild or not rates:
+            return
+        # New or corrected rates change what existing foreign expenses are worth.
+        revalued = revalue_expenses(db, min(day for day, _, _, _ in rates))
+        rebuild_monthly_totals(db)
+        repaired = reconcile_balances(db)
+    print(f"{revalued} expense(s) revalued, monthly totals rebuilt, {len(repaired)} balance(s) repaired")
+
+
+def materialise_recurring_command(args: argparse.Namespace) -> None:
+    with SessionLocal() as db:
+        created = materialise_due_occurrences(db, today=args.date, batch_size=args.batch_size)
+    print(f"{created} recurring expense(s) created")
+
+
+def import_statement_command(args: argparse.Namespace) -> None:
+    statement_format = StatementFormat(args.format or ("ofx" if args.path.lower().endswith((".ofx", ".qfx")) else "csv"))
+    csv_options = {}
+    if statement_format == StatementFormat.csv:
+        csv_options = dict(
+            date_column=args.date_column,
+            amount_column=args.amount_column,
+            description_column=args.description_column,
+            category_column=args.category_column,
+            date_format=args.date_format,
+            debit_sign=DebitSign(args.debit_sign)
+        )
+
+    def report(result: StatementImportResult) -> None:
+        print(f"\r{result.rows_read} rows read, {result.imported} imported, {result.failed} failed",
+              end="", file=sys.stderr, flush=True)
+
+    with SessionLocal() as db:
+        owner = get_user_by_email(db, args.email)
+        if owner is None:
+            sys.exit(f"No user with email {args.email}")
+        with open(args.path, encoding=args.encoding, errors="replace", newline="") as stream:
+            result = import_statement(
+                db, owner, stream,
+                statement_format=statement_format,
+                default_category=args.default_category,
+                batch_size=args.batch_size,
+                on_progress=report,
+                **csv_options
+            )
+
+    print(file=sys.stderr)
+    for error in result.errors:
+        print(f"line {error.line}: {error.detail}")
+    print(f"{result.imported} expense(s) imported, {result.skipped} credit(s) skipped, "
+          f"{result.failed} row(s) failed, {result.categories_created} categor(ies) created")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Home Budget API maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = commands.add_parser("reconcile-balances", help="Recompute users' total_spent and repair drift")
+    reconcile.add_argument("--user-id", type=int, default=None, help="Only reconcile this user")
+    reconcile.set_defaults(handler=reconcile_balances_command)
+
+    rebuild = commands.add_parser("rebuild-monthly-totals", help="Recompute the monthly spending rollup table")
+    rebuild.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's rows")
+    rebuild.set_defaults(handler=rebuild_monthly_totals_command)
+
+    rates = commands.add_parser("load-rates", help="Load daily exchange rates from a date,base,quote,rate CSV file")
+    rates.add_argument("path", help="CSV file; each rate is the price of one base unit in the quote currency")
+    rates.add_argument("--batch-size", type=int, default=EXPENSE_BULK_BATCH_SIZE)
+    rates.add_argument("--skip-rebuild", action="store_true",
+                       help="Do not revalue existing expenses, monthly totals and balances with the new rates")
+    rates.set_defaults(handler=load_rates_command)
+
+    recurring = commands.add_parser("materialise-recurring", help="Create the expenses of due recurring expense rules")
+    recurring.add_argument("--date", type=date.fromisoformat, default=None,
+                           help="Create occurrences up to this YYYY-MM-DD date (default: today)")
+    recurring.add_argument("--batch-size", type=int, default=RECURRING_BATCH_SIZE, help="Rules per batch")
+    recurring.set_defaults(handler=materialise_recurring_command)
+
+    importer = commands.add_parser("import-statement", help="Import a CSV or OFX bank statement as expenses")
+    importer.add_argument("path", help="Statement file")
+    importer.add_argument("--email", required=True, help="Email of the user who owns the expenses")
+    importer.add_argument("--format", choices=[f.value for f in StatementFormat], default=None,
+                          help="Statement format (default: from the file extension)")
+    importer.add_argument("--date-column", default="date")
+    importer.add_argument("--amount-column", default="amount")
+    importer.add_argument("--description-column", default="description")
+    importer.add_argument("--category-column", default="category")
+    importer.add_argument("--date-format", default=None, help="strptime format of CSV dates (default: ISO 8601)")
+    importer.add_argument("--debit-sign", choices=[s.value for s in DebitSign], default=DebitSign.negative.value,
+                          help="Sign of debits in CSV amounts; the other sign is a credit and is skipped")
+    importer.add_argument("--default-category", default="Imported")
+    importer.add_argument("--encoding", default="utf-8-sig")
+    importer.add_argument("--batch-size", type=int, default=EXPENSE_BULK_BATCH_SIZE)
+    importer.set_defaults(handler=import_statement_command)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
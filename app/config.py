@@ -0,0 +1,66 @@
+import os
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional async driver URL (postgresql+asyncpg://..., sqlite+aiosqlite://...). When set, request
+# handlers get an AsyncSession; DATABASE_URL is still used by migrations, the CLI and streamed responses.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Connection pool settings, applied to every non-SQLite engine.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+# bcrypt runs on a dedicated thread pool; requests beyond workers + queue are rejected with 503.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", str(4 * PASSWORD_HASH_WORKERS)))
+
+# Authenticated users are cached per token subject; USER_CACHE_SIZE=0 disables the cache.
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+# Rows per INSERT statement for bulk expense writes.
+EXPENSE_BULK_BATCH_SIZE = int(os.getenv("EXPENSE_BULK_BATCH_SIZE", "1000"))
+
+# Currency of users created without one, and of all data that predates multi-currency support.
+DEFAULT_CURRENCY = os.getenv("DEFAULT_CURRENCY", "EUR")
+# Exchange rates looked up when single expenses are written; loading rates clears the cache of
+# the loading process only, so other processes see replaced rates after RATE_CACHE_TTL.
+RATE_CACHE_SIZE = int(os.getenv("RATE_CACHE_SIZE", "10000"))
+RATE_CACHE_TTL = float(os.getenv("RATE_CACHE_TTL", "3600"))
+
+# Percentages of a category's monthly budget at which a budget alert is recorded.
+BUDGET_ALERT_THRESHOLDS = tuple(sorted(
+    int(value) for value in os.getenv("BUDGET_ALERT_THRESHOLDS", "80,100").split(",") if value.strip()
+))
+
+# Seconds between runs of the in-process scheduler that turns due recurring expense rules into
+# expenses; 0 disables it (run `python -m app.cli materialise-recurring` from cron instead).
+RECURRING_SCHEDULER_INTERVAL = float(os.getenv("RECURRING_SCHEDULER_INTERVAL", "3600"))
+# Rules handled per batch of bulk statements by each scheduler run.
+RECURRING_BATCH_SIZE = int(os.getenv("RECURRING_BATCH_SIZE", "1000"))
+
+# Aggregate and balance responses are cached per user and query; RESPONSE_CACHE_SIZE=0 disables the cache.
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "10000"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+# Opt-in slow-query log: statements slower than SLOW_QUERY_THRESHOLD_MS are logged for a
+# SLOW_QUERY_SAMPLE_RATE fraction of cases. On PostgreSQL, slow SELECTs are also EXPLAIN ANALYZEd
+# in the background, with at most SLOW_QUERY_EXPLAIN_QUEUE_SIZE plans waiting.
+SLOW_QUERY_THRESHOLD_MS = float(os.environ["SLOW_QUERY_THRESHOLD_MS"]) if os.getenv("SLOW_QUERY_THRESHOLD_MS") else None
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "1.0"))
+SLOW_QUERY_EXPLAIN = _env_bool("SLOW_QUERY_EXPLAIN", True)
+SLOW_QUERY_EXPLAIN_QUEUE_SIZE = int(os.getenv("SLOW_QUERY_EXPLAIN_QUEUE_SIZE", "16"))
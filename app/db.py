@@ -1,23 +1,152 @@
+import threading
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-import os
-from dotenv import load_dotenv
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
 
+from app.config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    SLOW_QUERY_EXPLAIN,
+    SLOW_QUERY_EXPLAIN_QUEUE_SIZE,
+    SLOW_QUERY_SAMPLE_RATE,
+    SLOW_QUERY_THRESHOLD_MS,
+)
+from app.instrumentation import instrument_engine
+from app.slow_query_log import enable_slow_query_log
 
-load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-print("DATABASE_URL =", DATABASE_URL)
+class PoolWaitStats:
+    """
+    How long callers waited to check a connection out of a pool.
+    """
 
-engine = create_engine(DATABASE_URL)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "wait_seconds_total": self.total_wait,
+                "wait_seconds_max": self.max_wait,
+                "wait_seconds_avg": self.total_wait / self.checkouts if self.checkouts else 0.0,
+            }
+
+
+def instrumented_pool_class(pool_class):
+    """
+    Subclass of `pool_class` that times every checkout. The stats live on the class, so they
+    survive the pool being recreated by engine.dispose().
+    """
+    class InstrumentedPool(pool_class):
+        wait_stats = PoolWaitStats()
+
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                self.wait_stats.record(time.perf_counter() - started)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def engine_options(url: str, pool_class=QueuePool) -> dict:
+    # SQLite picks its own pool per file/memory database; the sizing options only apply to real servers.
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": instrumented_pool_class(pool_class),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def pool_status(engine) -> dict:
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    for name, attribute in (("size", "size"), ("idle", "checkedin"), ("checked_out", "checkedout")):
+        if hasattr(pool, attribute):
+            status[name] = getattr(pool, attribute)()
+    if hasattr(pool, "overflow"):
+        # QueuePool counts overflow from -pool_size; only connections beyond the pool size matter here.
+        status["overflow"] = max(pool.overflow(), 0)
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(wait_stats.snapshot())
+    return status
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = (
+    create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, AsyncAdaptedQueuePool))
+    if ASYNC_DATABASE_URL else None
+)
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+
+slow_query_log = (
+    enable_slow_query_log(
+        [engine] + ([async_engine.sync_engine] if async_engine is not None else []),
+        SLOW_QUERY_THRESHOLD_MS,
+        sample_rate=SLOW_QUERY_SAMPLE_RATE,
+        explain_engine=engine if SLOW_QUERY_EXPLAIN else None,
+        queue_size=SLOW_QUERY_EXPLAIN_QUEUE_SIZE
+    )
+    if SLOW_QUERY_THRESHOLD_MS is not None else None
+)
+
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
+)
+
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+if AsyncSessionLocal is not None:
+    async def get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+else:
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """
+    Call a synchronous service function `fn(session, *args, **kwargs)` without blocking the event loop:
+    through AsyncSession.run_sync in async mode, or on the threadpool with a regular Session.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
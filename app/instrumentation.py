@@ -0,0 +1,218 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class RequestMetrics:
+    """
+    Work done on behalf of one request. Shared by reference with the threadpool and bcrypt
+    workers the request uses, so counters are updated under a lock.
+    """
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope or {}
+        self._lock = threading.Lock()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.password_hash_time = 0.0
+
+    @property
+    def route(self) -> str:
+        return _route_label(self.scope)
+
+    def add_sql(self, duration: float) -> None:
+        with self._lock:
+            self.sql_count += 1
+            self.sql_time += duration
+
+    def add_password_hash(self, duration: float) -> None:
+        with self._lock:
+            self.password_hash_time += duration
+
+
+current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    """
+    Prometheus-style cumulative histogram keyed by a tuple of label values.
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), then sum.
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            prefix = label_text + "," if label_text else ""
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _format_bound(bound)
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            braces = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{self.name}_sum{braces} {total}")
+            lines.append(f"{self.name}_count{braces} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_bound(bound: float) -> str:
+    return str(float(bound))
+
+
+REQUEST_LABELS = ("method", "route", "status")
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time spent handling a request.", REQUEST_LABELS, LATENCY_BUCKETS
+)
+request_sql_queries = Histogram(
+    "http_request_sql_queries", "SQL statements executed per request.", REQUEST_LABELS, QUERY_COUNT_BUCKETS
+)
+request_sql_duration = Histogram(
+    "http_request_sql_duration_seconds", "Time spent in SQL statements per request.", REQUEST_LABELS, LATENCY_BUCKETS
+)
+response_size = Histogram(
+    "http_response_size_bytes", "Size of response bodies.", REQUEST_LABELS, SIZE_BUCKETS
+)
+request_password_hash_duration = Histogram(
+    "http_request_password_hash_duration_seconds",
+    "Time spent in bcrypt per request, for requests that hash or verify a password.",
+    REQUEST_LABELS,
+    LATENCY_BUCKETS
+)
+
+HISTOGRAMS = (request_duration, request_sql_queries, request_sql_duration, response_size, request_password_hash_duration)
+
+
+def render_metrics() -> str:
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+def record_password_hash(duration: float) -> None:
+    metrics = current_request.get()
+    if metrics is not None:
+        metrics.add_password_hash(duration)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    metrics = current_request.get()
+    if metrics is not None:
+        metrics.add_sql(time.perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine) -> None:
+    """
+    Attribute the time of every statement run on `engine` to the current request.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _route_label(scope) -> str:
+    # Label by the matched path template so per-id URLs do not create a series each.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, SQL count and time, response size and bcrypt time per
+    route, and reporting the request's own figures in a Server-Timing header. For streamed
+    responses the header covers the work done before the first byte; the histograms cover all of it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics(scope)
+        token = current_request.set(metrics)
+        started = time.perf_counter()
+        status_code = 500
+        body_size = 0
+
+        async def send_with_timing(message):
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(metrics, time.perf_counter() - started).encode("latin-1")))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            labels = (scope["method"], metrics.route, str(status_code))
+            request_duration.observe(labels, time.perf_counter() - started)
+            request_sql_queries.observe(labels, metrics.sql_count)
+            request_sql_duration.observe(labels, metrics.sql_time)
+            response_size.observe(labels, body_size)
+            if metrics.password_hash_time:
+                request_password_hash_duration.observe(labels, metrics.password_hash_time)
+
+
+def _server_timing(metrics: RequestMetrics, elapsed: float) -> str:
+    timings = [
+        f"app;dur={elapsed * 1000:.1f}",
+        f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.sql_count} queries"',
+    ]
+    if metrics.password_hash_time:
+        timings.append(f"bcrypt;dur={metrics.password_hash_time * 1000:.1f}")
+    return ", ".join(timings)
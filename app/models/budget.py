@@ -0,0 +1,26 @@
+from sqlalchemy import BigInteger, Column, Integer, ForeignKey, UniqueConstraint
+from decimal import Decimal
+from app.db import Base
+from app.money import from_cents, to_cents
+
+class Budget(Base):
+    """
+    Monthly spending limit of one category, in the user's currency; it applies to every month.
+    """
+    __tablename__ = "budgets"
+    __table_args__ = (
+        UniqueConstraint("user_id", "category_id", name="uq_budgets_user_category"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    amount_cents = Column(BigInteger, nullable=False)
+
+    @property
+    def amount(self) -> Decimal:
+        return from_cents(self.amount_cents)
+
+    @amount.setter
+    def amount(self, value) -> None:
+        self.amount_cents = to_cents(value)
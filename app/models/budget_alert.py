@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, Integer, ForeignKey, Date, DateTime, Index, UniqueConstraint
+from app.db import Base
+
+class BudgetAlert(Base):
+    """
+    A category's spending in `month` reaching `threshold` percent of its budget, recorded once
+    per category, month and threshold by the expense write that crossed it.
+    """
+    __tablename__ = "budget_alerts"
+    __table_args__ = (
+        UniqueConstraint("category_id", "month", "threshold", name="uq_budget_alerts_category_month_threshold"),
+        Index("ix_budget_alerts_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    month = Column(Date, nullable=False)
+    threshold = Column(Integer, nullable=False)
+    budget_cents = Column(BigInteger, nullable=False)
+    spent_cents = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime, nullable=False)
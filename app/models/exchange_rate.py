@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Date, Numeric
+from app.db import Base
+
+class ExchangeRate(Base):
+    """
+    One unit of `base` costs `rate` units of `quote`, from `date` until the pair's next rate.
+    """
+    __tablename__ = "exchange_rates"
+
+    # The primary key (base, quote, date) also serves the latest-rate-on-or-before lookups.
+    base = Column(String(3), primary_key=True)
+    quote = Column(String(3), primary_key=True)
+    date = Column(Date, primary_key=True)
+    rate = Column(Numeric(18, 8), nullable=False)
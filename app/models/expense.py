@@ -1,19 +1,76 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import DDL, BigInteger, Column, Integer, String, ForeignKey, Date, DateTime, Index, event
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
+from decimal import Decimal
+from app.config import DEFAULT_CURRENCY
 from app.db import Base
+from app.money import from_cents, to_cents
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_user_id_date", "user_id", "date"),
+        Index("ix_expenses_user_id_category_id_date", "user_id", "category_id", "date"),
+        Index("ix_expenses_user_id_id", "user_id", "id"),
+        Index("ix_expenses_user_id_version", "user_id", "version"),
+        # One expense per occurrence of a recurring rule, however often the scheduler runs.
+        Index(
+            "uq_expenses_recurring_expense_id_occurrence_date", "recurring_expense_id", "occurrence_date", unique=True
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    amount = Column(Float, nullable=False)
+    amount_cents = Column(BigInteger, nullable=False)
+    currency = Column(String(3), nullable=False, default=DEFAULT_CURRENCY, server_default=DEFAULT_CURRENCY)
+    # The amount in the owner's currency at the rate used when the row was written. Totals and
+    # rollups add exactly this value and take it back on update or delete, whatever rates say now.
+    converted_cents = Column(BigInteger, nullable=False)
     description = Column(String, nullable=True)
     category_id = Column(Integer, ForeignKey("categories.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     date = Column(DateTime, default=datetime.now(timezone.utc))
+    # The owner's data_version when the row was last written; GET /api/sync reads changes by it.
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, nullable=True)
+    # Set on expenses created by a recurring rule, for the occurrence they stand for.
+    recurring_expense_id = Column(Integer, ForeignKey("recurring_expenses.id", ondelete="SET NULL"), nullable=True)
+    occurrence_date = Column(Date, nullable=True)
 
 
     category = relationship("Category", back_populates="expenses")
     user = relationship("User", back_populates="expenses")
 
+    @property
+    def amount(self) -> Decimal | None:
+        return None if self.amount_cents is None else from_cents(self.amount_cents)
+
+    @amount.setter
+    def amount(self, value) -> None:
+        self.amount_cents = to_cents(value)
+
+
+# Full-text search over descriptions (queried in app/services/expense_search.py). The index is not a
+# mapped column because each database represents it differently: a generated tsvector column with a
+# GIN index on PostgreSQL, an external-content FTS5 table kept current by triggers on SQLite.
+POSTGRES_SEARCH_DDL = (
+    "ALTER TABLE expenses ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, ''))) STORED",
+    "CREATE INDEX ix_expenses_search_vector ON expenses USING gin (search_vector)",
+)
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE expenses_fts USING fts5("
+    "description, content='expenses', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER expenses_fts_insert AFTER INSERT ON expenses BEGIN "
+    "INSERT INTO expenses_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER expenses_fts_delete AFTER DELETE ON expenses BEGIN "
+    "INSERT INTO expenses_fts(expenses_fts, rowid, description) VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER expenses_fts_update AFTER UPDATE OF description ON expenses BEGIN "
+    "INSERT INTO expenses_fts(expenses_fts, rowid, description) VALUES ('delete', old.id, old.description); "
+    "INSERT INTO expenses_fts(rowid, description) VALUES (new.id, new.description); END",
+)
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Expense.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Expense.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Expense.__table__, "after_drop", DDL("DROP TABLE IF EXISTS expenses_fts").execute_if(dialect="sqlite"))
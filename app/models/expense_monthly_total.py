@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, Integer, ForeignKey, Date, Index, UniqueConstraint
+from app.db import Base
+
+class ExpenseMonthlyTotal(Base):
+    __tablename__ = "expense_monthly_totals"
+    __table_args__ = (
+        UniqueConstraint("user_id", "category_id", "month", name="uq_expense_monthly_totals_user_category_month"),
+        Index("ix_expense_monthly_totals_user_id_month", "user_id", "month"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"))
+    month = Column(Date, nullable=False)
+    # In the user's currency, converted when each expense was written.
+    total_cents = Column(BigInteger, nullable=False, default=0)
+    expense_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,38 @@
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, Date, DateTime, Index
+from decimal import Decimal
+from app.config import DEFAULT_CURRENCY
+from app.db import Base
+from app.money import from_cents, to_cents
+
+class RecurringExpense(Base):
+    """
+    A rule that creates an expense on `day_of_month` every `interval_months` months from
+    `start_date` until `end_date`. Months shorter than `day_of_month` use their last day.
+    """
+    __tablename__ = "recurring_expenses"
+    __table_args__ = (
+        Index("ix_recurring_expenses_user_id_id", "user_id", "id"),
+        Index("ix_recurring_expenses_next_date", "next_date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    amount_cents = Column(BigInteger, nullable=False)
+    currency = Column(String(3), nullable=False, default=DEFAULT_CURRENCY, server_default=DEFAULT_CURRENCY)
+    description = Column(String, nullable=True)
+    interval_months = Column(Integer, nullable=False, default=1, server_default="1")
+    day_of_month = Column(Integer, nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)
+    # The first occurrence not yet materialised as an expense; NULL once the rule has ended.
+    next_date = Column(Date, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
+    @property
+    def amount(self) -> Decimal:
+        return from_cents(self.amount_cents)
+
+    @amount.setter
+    def amount(self, value) -> None:
+        self.amount_cents = to_cents(value)
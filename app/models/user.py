@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, Numeric, String, Boolean, DateTime
+from sqlalchemy import BigInteger, Integer, Numeric, String, Boolean, DateTime
 from datetime import datetime, timezone
 
+from app.config import DEFAULT_CURRENCY
 from app.db import Base
 
 
@@ -15,7 +16,12 @@ class User(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[DateTime] = mapped_column(DateTime, default=datetime.now(timezone.utc), nullable=False)
     updated_at: Mapped[DateTime] = mapped_column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    # Currency of starting_balance, total_spent_cents and the monthly rollups.
+    currency: Mapped[str] = mapped_column(String(3), default=DEFAULT_CURRENCY, server_default=DEFAULT_CURRENCY, nullable=False)
     starting_balance: Mapped[float] = mapped_column(Numeric(10, 2), default=1000.00, nullable=False)
+    total_spent_cents: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    data_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    data_updated_at: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
 
     categories = relationship("Category", back_populates="user", cascade="all, delete")
     expenses = relationship("Expense", back_populates="user")
@@ -0,0 +1,27 @@
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+# Amounts are stored as integer cents: sums stay exact, and integer aggregation is cheaper than
+# floating point or NUMERIC in both PostgreSQL and SQLite.
+
+
+def to_cents(amount: Decimal | int | float | str, rounding: Optional[str] = None) -> int:
+    """
+    `amount` in integer cents. Amounts with fractions of a cent raise ValueError, unless a
+    `rounding` mode (decimal.ROUND_*) says which way to round them.
+    """
+    try:
+        # repr gives the shortest decimal that reads back as the float, so 0.1 is 10 cents.
+        cents = Decimal(repr(amount) if isinstance(amount, float) else amount) * 100
+        whole = cents.to_integral_value(rounding=rounding)
+    except InvalidOperation as exc:
+        raise ValueError(f"invalid amount: {amount!r}") from exc
+    if not cents.is_finite():
+        raise ValueError(f"invalid amount: {amount!r}")
+    if rounding is None and whole != cents:
+        raise ValueError("amount must not have fractions of a cent")
+    return int(whole)
+
+
+def from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
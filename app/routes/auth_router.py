@@ -6,6 +6,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.services.auth_service import authenticate_user, create_access_token
+from app.services.password_service import PasswordHasherBusy
 from app.db import get_db
 
 auth_router = APIRouter(
@@ -24,13 +25,21 @@ auth_router = APIRouter(
         "Use this endpoint to obtain a Bearer token for authenticated requests."
     ),
     status_code=status.HTTP_200_OK,
-    operation_id="login_for_access_token"
+    operation_id="login_for_access_token",
+    responses={503: {"description": "Password hashing capacity exhausted, retry later"}}
 )
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Session = Depends(get_db)
 ) -> Token:
-    user = authenticate_user(form_data.username, form_data.password, db)
+    try:
+        user = await authenticate_user(form_data.username, form_data.password, db)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent login attempts, retry shortly",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
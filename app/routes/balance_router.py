@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.db import get_db
-from app.models.expense import Expense
+from app.db import get_db, run_db
 from app.models.user import User
 from app.services.auth_service import get_current_user
+from app.services.balance_service import get_balance as get_user_balance
+from app.services.data_version_service import check_data_version
+from app.services.response_cache_service import response_cache
 
 
 balance_router = APIRouter(
@@ -19,16 +20,16 @@ balance_router = APIRouter(
         "Returns the user's current financial balance.\n\n"
         "- `starting_balance`: The users initial balance.\n"
         "- `total_spent`: Total expenses recorded by the user.\n"
-        "- `current_balance`: The remaining balance (starting balance minus total spent)."),
-    operation_id="get_current_balance")
-def get_balance(
+        "- `current_balance`: The remaining balance (starting balance minus total spent).\n"
+        "- `currency`: The user's currency, which foreign expenses are converted into."),
+    operation_id="get_current_balance",
+    responses={304: {"description": "Not modified since the ETag or date in the request"}})
+async def get_balance(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    data_version: int = Depends(check_data_version)
 ):
-    total_spent = db.query(Expense).filter(Expense.user_id == current_user.id).with_entities(func.coalesce(func.sum(Expense.amount), 0)).scalar()
-    current_balance = float(current_user.starting_balance) - float(total_spent or 0)
-    return {
-        "starting_balance": float(current_user.starting_balance), 
-        "total_spent": float(total_spent), 
-        "current_balance": current_balance
-        }
+    # Keyed on the version the ETag was built from, so the body always matches its tag.
+    return await response_cache.get_or_load(
+        current_user.id, data_version, "balance", {}, lambda: run_db(db, get_user_balance, current_user)
+    )
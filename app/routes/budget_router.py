@@ -0,0 +1,107 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from app.schemas.budget_schema import BudgetAlertRead, BudgetRead, BudgetStatusReport, BudgetUpdate
+from app.models.user import User
+from app.db import get_db, run_db
+from app.services.auth_service import get_current_user
+from app.services.budget_service import (
+    delete_budget,
+    get_budget,
+    get_budget_alerts,
+    get_budget_status,
+    set_budget,
+    MAX_ALERTS
+)
+from app.services.monthly_total_service import month_start
+
+
+budget_router = APIRouter(
+    prefix="/budgets",
+    tags=["Budgets"]
+)
+
+
+@budget_router.get(
+    "/status",
+    response_model=BudgetStatusReport,
+    summary="Get spending against budgets",
+    description=(
+        "Spending of every category of the authenticated user in one month, next to the category's "
+        "monthly budget, in the user's currency. Categories without a budget are listed with their "
+        "spending only.\n\n"
+        "`month` may be any day of the month; it defaults to the current month."))
+async def read_budget_status(
+    month: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    month = month_start(month or datetime.now(timezone.utc))
+    categories = await run_db(db, get_budget_status, current_user, month)
+    return {"month": month, "currency": current_user.currency, "categories": categories}
+
+
+@budget_router.get(
+    "/alerts",
+    response_model=List[BudgetAlertRead],
+    summary="Get budget alerts",
+    description=(
+        "The most recent times a category's spending reached a threshold of its monthly budget, newest "
+        "first. Each category, month and threshold is reported once."))
+async def read_budget_alerts(
+    month: Optional[date] = Query(None, description="Only alerts of the month containing this day"),
+    limit: int = Query(MAX_ALERTS, ge=1, le=MAX_ALERTS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await run_db(db, get_budget_alerts, current_user, month_start(month) if month else None, limit)
+
+
+@budget_router.get(
+    "/{category_id}",
+    response_model=BudgetRead,
+    summary="Get a category's budget",
+    responses={404: {"description": "No budget for this category"}})
+async def read_budget(
+    category_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    budget = await run_db(db, get_budget, category_id, current_user)
+    if not budget:
+        raise HTTPException(status_code=404, detail="Budget not found")
+    return budget
+
+
+@budget_router.put(
+    "/{category_id}",
+    response_model=BudgetRead,
+    summary="Set a category's budget",
+    description="Create or replace the monthly budget of a category owned by the authenticated user.",
+    responses={404: {"description": "Category not found or not owned by user"}})
+async def update_budget(
+    category_id: int,
+    budget: BudgetUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    updated = await run_db(db, set_budget, category_id, budget.amount, current_user)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Category not found or not yours")
+    return updated
+
+
+@budget_router.delete(
+    "/{category_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Remove a category's budget",
+    responses={404: {"description": "No budget for this category"}})
+async def remove_budget(
+    category_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if not await run_db(db, delete_budget, category_id, current_user):
+        raise HTTPException(status_code=404, detail="Budget not found")
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.schemas.category_schema import CategoryCreate, CategoryUpdate, CategoryRead
 from app.models.user import User
-from app.db import get_db
+from app.db import get_db, run_db
 from app.services.auth_service import get_current_user
+from app.services.data_version_service import check_data_version
+from app.services.serialization_service import category_rows_json
 from app.services.category_service import (
     create_category,
-    get_categories,
+    get_category_rows,
     get_category,
     update_category,
     delete_category
@@ -27,25 +29,28 @@ category_router = APIRouter(
     status_code=status.HTTP_201_CREATED,
     summary="Create a new category",
     description="Create a new category for the current authenticated user.")
-def create_new_category(
+async def create_new_category(
     category: CategoryCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return create_category(db, category, current_user)
+    return await run_db(db, create_category, category, current_user)
 
 
 @category_router.get(
     "/",
     response_model=List[CategoryRead],
     summary="Get all categories for current user",
-    description="Retrieve all categories that belong to the authenticated user.")
-@category_router.get("/", response_model=List[CategoryRead])
-def read_user_categories(
+    description="Retrieve all categories that belong to the authenticated user.",
+    dependencies=[Depends(check_data_version)],
+    responses={304: {"description": "Not modified since the ETag or date in the request"}})
+async def read_user_categories(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return get_categories(db, current_user)
+    rows = await run_db(db, get_category_rows, current_user)
+    return Response(category_rows_json(rows), media_type="application/json", headers=response.headers)
 
 
 @category_router.get(
@@ -55,12 +60,12 @@ def read_user_categories(
     description="Retrieve a single category by its ID if it belongs to the authenticated user.",
     responses={404: {"description": "Category not found"}})
 @category_router.get("/{category_id}", response_model=CategoryRead)
-def read_single_category(
+async def read_single_category(
     category_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    category = get_category(db, category_id, current_user)
+    category = await run_db(db, get_category, category_id, current_user)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     return category
@@ -73,13 +78,13 @@ def read_single_category(
     summary="Update a category by ID",
     description="Update a category's details if it belongs to the authenticated user.",
     responses={404: {"description": "Category not found or not owned by user"}})
-def update_existing_category(
+async def update_existing_category(
     category_id: int,
     update_data: CategoryUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    category = update_category(db, category_id, update_data, current_user)
+    category = await run_db(db, update_category, category_id, update_data, current_user)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found or not yours")
     return category
@@ -91,11 +96,11 @@ def update_existing_category(
     summary="Delete a category by ID",
     description="Delete a category if it belongs to the authenticated user.",
     responses={404: {"description": "Category not found or not owned by user"}})
-def delete_existing_category(
+async def delete_existing_category(
     category_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    success = delete_category(db, category_id, current_user)
+    success = await run_db(db, delete_category, category_id, current_user)
     if not success:
         raise HTTPException(status_code=404, detail="Category not found or not yours")
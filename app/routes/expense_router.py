@@ -1,19 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import codecs
+import io
+import logging
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, List, Optional
 from datetime import datetime
+from decimal import Decimal
 
-from app.schemas.expense_schema import ExpenseCreate, ExpenseUpdate, ExpenseRead
+from app.schemas.expense_schema import ExpenseBulkResult, ExpenseCreate, ExpenseUpdate, ExpenseRead
+from app.schemas.expense_export_schema import ExportFormat
+from app.schemas.statement_import_schema import DebitSign, StatementFormat, StatementImportResult
 from app.models.user import User
-from app.db import get_db
+from app.db import SessionLocal, get_db, run_db
 from app.services.auth_service import get_current_user
+from app.services.data_version_service import check_data_version
 from app.services.expense_service import (
     create_expense,
-    get_expenses,
+    create_expenses_bulk,
+    decode_cursor,
+    get_expense_row_page,
     get_expense,
+    iter_expense_rows,
     update_expense,
-    delete_expense
+    delete_expense,
+    DEFAULT_PAGE_SIZE,
+    MAX_BULK_ITEMS,
+    MAX_PAGE_SIZE
 )
+from app.services.exchange_rate_service import MissingRateError
+from app.services.expense_export_service import MEDIA_TYPES, export_expenses, format_available
+from app.services.serialization_service import expense_row_json, expense_rows_json
+from app.services.statement_import_service import import_statement
+from app.config import EXPENSE_BULK_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
 
 expense_router = APIRouter(
     prefix="/expenses",
@@ -25,13 +47,116 @@ expense_router = APIRouter(
     response_model=ExpenseRead,
     status_code=status.HTTP_201_CREATED,
     summary="Create a new expense",
-    description="Create a new expense record for the authenticated user.")
-def create_new_expense(
+    description=(
+        "Create a new expense record for the authenticated user. An expense in another currency "
+        "than the user's counts towards the totals at the exchange rate of its date."),
+    responses={422: {"description": "No exchange rate for the expense's currency and date"}})
+async def create_new_expense(
     expense: ExpenseCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return create_expense(db, expense, current_user)
+    try:
+        return await run_db(db, create_expense, expense, current_user)
+    except MissingRateError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
+@expense_router.post(
+    "/bulk",
+    response_model=ExpenseBulkResult,
+    summary="Create many expenses at once",
+    description=(
+        "Validate and insert a list of expenses (same fields as `POST /expenses`) in a single transaction, "
+        f"up to {MAX_BULK_ITEMS} per request.\n\n"
+        "Rows that fail validation or reference a category the user does not own are skipped and "
+        "reported in `errors` by their position in the list; all other rows are created."),
+    responses={413: {"description": "Too many items in one request"}})
+async def create_expenses_in_bulk(
+    items: List[Any],
+    batch_size: int = Query(EXPENSE_BULK_BATCH_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_ITEMS} expenses per request"
+        )
+    return await run_db(db, create_expenses_bulk, items, current_user, batch_size=batch_size)
+
+
+@expense_router.post(
+    "/import",
+    response_model=StatementImportResult,
+    summary="Import a bank statement",
+    description=(
+        "Import expenses from an uploaded CSV or OFX bank statement.\n\n"
+        "The upload is parsed incrementally and written in committed batches of `batch_size` rows, "
+        "so very large statements import with bounded memory. CSV files need a header row; the "
+        "`*_column` parameters name the columns holding each field. Only debits are imported, as positive "
+        "expenses: in CSV files they are negative amounts unless `debit_sign` is `positive`, in OFX files "
+        "negative TRNAMT values. Credits are counted in `skipped`. Categories are matched by name and "
+        "created when missing; rows without one go to `default_category`.\n\n"
+        "Unparseable rows are counted in `failed`; the first few are listed in `errors`."),
+    responses={422: {"description": "Unknown encoding"}})
+async def import_bank_statement(
+    file: UploadFile = File(...),
+    statement_format: Optional[StatementFormat] = Query(None, alias="format"),
+    date_column: str = Query("date"),
+    amount_column: str = Query("amount"),
+    description_column: str = Query("description"),
+    category_column: str = Query("category"),
+    date_format: Optional[str] = Query(None, description="strptime format of CSV dates; ISO 8601 when omitted"),
+    debit_sign: DebitSign = Query(DebitSign.negative, description="Sign of debits in CSV amounts"),
+    default_category: str = Query("Imported", min_length=1),
+    encoding: str = Query("utf-8-sig"),
+    batch_size: int = Query(EXPENSE_BULK_BATCH_SIZE, ge=1, le=10000),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        raise HTTPException(status_code=422, detail=f"Unknown encoding: {encoding}")
+    if statement_format is None:
+        is_ofx = (file.filename or "").lower().endswith((".ofx", ".qfx"))
+        statement_format = StatementFormat.ofx if is_ofx else StatementFormat.csv
+    stream = io.TextIOWrapper(file.file, encoding=encoding, errors="replace", newline="")
+
+    def log_progress(result: StatementImportResult) -> None:
+        logger.info(
+            "Statement import for user %s: %d rows read, %d imported, %d failed",
+            current_user.id, result.rows_read, result.imported, result.failed
+        )
+
+    csv_options = {}
+    if statement_format == StatementFormat.csv:
+        csv_options = dict(
+            date_column=date_column,
+            amount_column=amount_column,
+            description_column=description_column,
+            category_column=category_column,
+            date_format=date_format,
+            debit_sign=debit_sign
+        )
+    try:
+        # Parsing and reading the spooled upload block, so the whole import runs on the threadpool
+        # with its own session, even when request sessions are async.
+        return await run_in_threadpool(
+            _import_statement, current_user, stream,
+            statement_format=statement_format,
+            default_category=default_category,
+            batch_size=batch_size,
+            on_progress=log_progress,
+            **csv_options
+        )
+    finally:
+        stream.detach()
+
+
+def _import_statement(user: User, stream: io.TextIOBase, **options) -> StatementImportResult:
+    with SessionLocal() as db:
+        return import_statement(db, user, stream, **options)
 
 
 @expense_router.get(
@@ -39,25 +164,112 @@ def create_new_expense(
     response_model=List[ExpenseRead],
     summary="Get expenses with optional filters",
     description=(
-        "Retrieve a list of expenses for the authenticated user, "
-        "optionally filtered by category, amount range, and date range."))
-def read_expenses(
+        "Retrieve a page of expenses for the authenticated user, newest first, "
+        "optionally filtered by category, amount range, and date range.\n\n"
+        "When more results exist, the `X-Next-Cursor` response header holds the cursor "
+        "to pass back for the next page.\n\n"
+        "With `stream=true` every matching expense is returned as NDJSON, one expense per line.\n\n"
+        "`search` keeps expenses whose description contains every word of the search, words also "
+        "matching as prefixes. Matches are returned best first as a single page of up to `limit` "
+        "results, so `search` cannot be combined with `cursor`."),
+    dependencies=[Depends(check_data_version)],
+    responses={
+        304: {"description": "Not modified since the ETag or date in the request"},
+        400: {"description": "Invalid cursor, or cursor combined with search"}
+    })
+async def read_expenses(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     category_id: Optional[int] = Query(None),
-    min_amount: Optional[float] = Query(None),
-    max_amount: Optional[float] = Query(None),
+    min_amount: Optional[Decimal] = Query(None, max_digits=15, decimal_places=2),
+    max_amount: Optional[Decimal] = Query(None, max_digits=15, decimal_places=2),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    search: Optional[str] = Query(None, min_length=1, max_length=200),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = Query(False)
+):
+    filters = dict(
+        category_id=category_id,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        start_date=start_date,
+        end_date=end_date,
+        cursor=cursor,
+        search=search
+    )
+    if cursor and search:
+        raise HTTPException(status_code=400, detail="Search results cannot be paged with a cursor")
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if stream:
+        return StreamingResponse(
+            _stream_expenses(current_user, filters),
+            media_type="application/x-ndjson"
+        )
+
+    rows, next_cursor = await run_db(db, get_expense_row_page, current_user, limit=limit, **filters)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    # Pre-rendered, so FastAPI skips validating the response; headers set so far are carried over.
+    return Response(expense_rows_json(rows), media_type="application/json", headers=response.headers)
+
+
+def _stream_expenses(user: User, filters: dict):
+    # The request session is closed before the body is sent, so the stream owns its own session.
+    with SessionLocal() as db:
+        for row in iter_expense_rows(db, user, **filters):
+            yield expense_row_json(row) + b"\n"
+
+
+@expense_router.get(
+    "/export",
+    summary="Export expenses",
+    description=(
+        "Download every matching expense as CSV, or as an Arrow IPC stream or Parquet file when pyarrow "
+        "is installed. Accepts the same filters as `GET /expenses`.\n\n"
+        "Rows are streamed from a server-side cursor as they are read, so exports of any size start "
+        "immediately and use constant memory."),
+    response_class=StreamingResponse,
+    responses={501: {"description": "Format not available on this server"}})
+async def export_user_expenses(
+    current_user: User = Depends(get_current_user),
+    export_format: ExportFormat = Query(ExportFormat.csv, alias="format"),
+    category_id: Optional[int] = Query(None),
+    min_amount: Optional[Decimal] = Query(None, max_digits=15, decimal_places=2),
+    max_amount: Optional[Decimal] = Query(None, max_digits=15, decimal_places=2),
     start_date: Optional[datetime] = Query(None),
-    end_date: Optional[datetime] = Query(None)
+    end_date: Optional[datetime] = Query(None),
+    search: Optional[str] = Query(None, min_length=1, max_length=200)
 ):
-    return get_expenses(
-        db, current_user,
+    if not format_available(export_format):
+        raise HTTPException(status_code=501, detail=f"{export_format.value} export requires pyarrow")
+    filters = dict(
         category_id=category_id,
         min_amount=min_amount,
         max_amount=max_amount,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        search=search
     )
+    return StreamingResponse(
+        _export_expenses(current_user, export_format, filters),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="expenses.{export_format.value}"'}
+    )
+
+
+def _export_expenses(user: User, export_format: ExportFormat, filters: dict):
+    with SessionLocal() as db:
+        yield from export_expenses(iter_expense_rows(db, user, **filters), export_format)
+
 
 @expense_router.get(
     "/{expense_id}",
@@ -65,12 +277,12 @@ def read_expenses(
     summary="Get expense by ID",
     description="Retrieve a single expense by its ID if owned by the authenticated user.",
     responses={404: {"description": "Expense not found"}})
-def read_single_expense(
+async def read_single_expense(
     expense_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    expense = get_expense(db, expense_id, current_user)
+    expense = await run_db(db, get_expense, expense_id, current_user)
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
     
@@ -82,14 +294,20 @@ def read_single_expense(
     response_model=ExpenseRead,
     summary="Update an existing expense",
     description="Update expense details if it belongs to the authenticated user.",
-    responses={404: {"description": "Expense not found or not owned by user"}})
-def update_existing_expense(
+    responses={
+        404: {"description": "Expense not found or not owned by user"},
+        422: {"description": "No exchange rate for the expense's currency and date"}
+    })
+async def update_existing_expense(
     expense_id: int,
     update_data: ExpenseUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    expense = update_expense(db, expense_id, update_data, current_user)
+    try:
+        expense = await run_db(db, update_expense, expense_id, update_data, current_user)
+    except MissingRateError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found or not yours")
     
@@ -102,12 +320,12 @@ def update_existing_expense(
     summary="Delete an expense",
     description="Delete an expense by ID if it belongs to the authenticated user.",
     responses={404: {"description": "Expense not found or not owned by user"}})
-def delete_existing_expense(
+async def delete_existing_expense(
     expense_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    success = delete_expense(db, expense_id, current_user)
+    success = await run_db(db, delete_expense, expense_id, current_user)
     if not success:
 
         raise HTTPException(status_code=404, detail="Expense not found or not yours")
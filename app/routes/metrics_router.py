@@ -0,0 +1,50 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.db import async_engine, engine, pool_status
+from app.instrumentation import render_metrics
+from app.services.exchange_rate_service import rate_cache
+from app.services.response_cache_service import response_cache
+from app.services.user_service import user_cache
+
+
+metrics_router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+
+@metrics_router.get(
+    "",
+    summary="Request metrics in Prometheus format",
+    description=(
+        "Per-route histograms of request latency, SQL statements and SQL time per request, "
+        "response size and bcrypt time, in the Prometheus text exposition format."),
+    response_class=PlainTextResponse,
+    operation_id="get_prometheus_metrics")
+def get_prometheus_metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@metrics_router.get(
+    "/pool",
+    summary="Database connection pool status",
+    description=(
+        "Returns the state of each database connection pool.\n\n"
+        "- `size`, `idle`, `checked_out`, `overflow`: current pool occupancy.\n"
+        "- `checkouts`, `wait_seconds_*`: how long requests waited to obtain a connection."),
+    operation_id="get_pool_status")
+def get_pool_status():
+    status = {"sync": pool_status(engine)}
+    if async_engine is not None:
+        status["async"] = pool_status(async_engine.sync_engine)
+    return status
+
+
+@metrics_router.get(
+    "/cache",
+    summary="In-process cache statistics",
+    description="Returns size, hit and miss counters of the in-process caches.",
+    operation_id="get_cache_stats")
+def get_cache_stats():
+    return {"users": user_cache.stats(), "responses": response_cache.stats(), "exchange_rates": rate_cache.stats()}
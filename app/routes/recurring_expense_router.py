@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.schemas.recurring_expense_schema import RecurringExpenseCreate, RecurringExpenseRead, RecurringExpenseUpdate
+from app.models.user import User
+from app.db import get_db, run_db
+from app.services.auth_service import get_current_user
+from app.services.recurring_expense_service import (
+    create_recurring_expense,
+    delete_recurring_expense,
+    get_recurring_expense,
+    get_recurring_expenses,
+    update_recurring_expense
+)
+
+
+recurring_expense_router = APIRouter(
+    prefix="/recurring-expenses",
+    tags=["Recurring expenses"]
+)
+
+
+@recurring_expense_router.post(
+    "/",
+    response_model=RecurringExpenseRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a recurring expense",
+    description=(
+        "Create a rule that adds an expense every `interval_months` months on `day_of_month`, from "
+        "`start_date` until `end_date`. Occurrences up to today are created immediately; later ones "
+        "are created by the background scheduler as they fall due."),
+    responses={404: {"description": "Category not found or not owned by user"}})
+async def create_new_recurring_expense(
+    rule: RecurringExpenseCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    created = await run_db(db, create_recurring_expense, rule, current_user)
+    if not created:
+        raise HTTPException(status_code=404, detail="Category not found or not yours")
+    return created
+
+
+@recurring_expense_router.get(
+    "/",
+    response_model=List[RecurringExpenseRead],
+    summary="Get all recurring expenses",
+    description="Retrieve the recurring expense rules of the authenticated user.")
+async def read_recurring_expenses(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await run_db(db, get_recurring_expenses, current_user)
+
+
+@recurring_expense_router.get(
+    "/{rule_id}",
+    response_model=RecurringExpenseRead,
+    summary="Get a recurring expense by ID",
+    responses={404: {"description": "Recurring expense not found"}})
+async def read_recurring_expense(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    rule = await run_db(db, get_recurring_expense, rule_id, current_user)
+    if not rule:
+        raise HTTPException(status_code=404, detail="Recurring expense not found")
+    return rule
+
+
+@recurring_expense_router.put(
+    "/{rule_id}",
+    response_model=RecurringExpenseRead,
+    summary="Update a recurring expense",
+    description=(
+        "Change the amount, currency, description or category of future occurrences, or the end date. "
+        "Expenses already created are not changed."),
+    responses={
+        404: {"description": "Recurring expense not found or not owned by user"},
+        422: {"description": "Category not owned by user, or end date before the start date"}
+    })
+async def update_existing_recurring_expense(
+    rule_id: int,
+    update_data: RecurringExpenseUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        rule = await run_db(db, update_recurring_expense, rule_id, update_data, current_user)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if not rule:
+        raise HTTPException(status_code=404, detail="Recurring expense not found or not yours")
+    return rule
+
+
+@recurring_expense_router.delete(
+    "/{rule_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a recurring expense",
+    description="Stop a recurring expense. Expenses it already created are kept.",
+    responses={404: {"description": "Recurring expense not found or not owned by user"}})
+async def delete_existing_recurring_expense(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if not await run_db(db, delete_recurring_expense, rule_id, current_user):
+        raise HTTPException(status_code=404, detail="Recurring expense not found or not yours")
@@ -2,9 +2,12 @@ from fastapi import APIRouter, Depends, Query, status
 from datetime import datetime
 from typing import Optional
 from sqlalchemy.orm import Session
-from app.db import get_db
+from app.db import get_db, run_db
 from app.services.auth_service import get_current_user
-from app.services.spending_aggregation_service import get_total_spending
+from app.schemas.spending_aggregation_schema import SpendingBreakdown, SpendingGroupBy
+from app.services.data_version_service import get_data_version
+from app.services.response_cache_service import response_cache
+from app.services.spending_aggregation_service import get_spending_breakdown, get_total_spending
 
 spending_aggregation_router = APIRouter(
     prefix="/aggregate",
@@ -16,16 +19,52 @@ spending_aggregation_router = APIRouter(
     summary="Get total spending",
     description=(
         "Calculate the total spending of the authenticated user, "
-        "optionally filtered by date range and category."
+        "optionally filtered by date range and category.\n\n"
+        "With `group_by` (category, day, week, month or category_month) the response also "
+        "lists the total of every bucket, computed in a single query. Weeks start on Monday.\n\n"
+        "Amounts are in the user's currency, with foreign expenses converted at the rate of their date.\n\n"
+        "Results are cached per user and parameters until the user's expenses change."
     ),
     status_code=status.HTTP_200_OK)
-def total_spending(
+async def total_spending(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     category_id: Optional[int] = Query(None),
+    group_by: Optional[SpendingGroupBy] = Query(None),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
-    total = get_total_spending(db, current_user.id, start_date, end_date, category_id)
+    params = dict(start_date=start_date, end_date=end_date, category_id=category_id, group_by=group_by)
+    data_version, _ = await run_db(db, get_data_version, current_user)
+    return await response_cache.get_or_load(
+        current_user.id,
+        data_version,
+        "aggregate",
+        params,
+        lambda: _total_spending(db, current_user.id, current_user.currency, **params)
+    )
 
-    return {"total_spending": total}
+
+async def _total_spending(
+    db: Session,
+    user_id: int,
+    currency: str,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    category_id: Optional[int],
+    group_by: Optional[SpendingGroupBy]
+) -> dict:
+    if group_by:
+        buckets = await run_db(
+            db, get_spending_breakdown, user_id, group_by, start_date, end_date, category_id
+        )
+        return SpendingBreakdown(
+            group_by=group_by,
+            currency=currency,
+            total_spending=sum(bucket["total"] for bucket in buckets),
+            buckets=buckets
+        ).model_dump(mode="json", exclude_none=True)
+
+    total = await run_db(db, get_total_spending, user_id, start_date, end_date, category_id)
+
+    return {"total_spending": total, "currency": currency}
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.schemas.sync_schema import SyncRead
+from app.models.user import User
+from app.db import get_db, run_db
+from app.services.auth_service import get_current_user
+from app.services.serialization_service import sync_json
+from app.services.sync_service import get_changes
+
+
+sync_router = APIRouter(
+    prefix="/sync",
+    tags=["Sync"]
+)
+
+
+@sync_router.get(
+    "/",
+    response_model=SyncRead,
+    summary="Get changes since a sync token",
+    description=(
+        "Return the categories and expenses created or updated, and the ids of those deleted, since "
+        "the `token` of an earlier response. Omit `since` (or pass 0) for a full copy of the user's data.\n\n"
+        "Apply `deleted` before the changed rows: an id can be deleted and then reused by a new row. "
+        "Pass the returned `token` as `since` on the next call."),
+    responses={410: {"description": "Unknown sync token; sync again without `since`"}})
+async def read_changes(
+    since: int = Query(0, ge=0, description="`token` of the previous sync response"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        changes = await run_db(db, get_changes, current_user, since)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(exc))
+    return Response(sync_json(changes), media_type="application/json")
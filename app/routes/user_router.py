@@ -2,10 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_db, run_db
 from app.models.user import User
 from app.schemas.user_schema import UserCreate, UserSchema
 from app.services.auth_service import get_current_active_user
+from app.services.password_service import PasswordHasherBusy, get_password_hash, run_password_task
 from app.services.user_service import create_user, delete_user, get_user, get_users
 
 
@@ -16,21 +17,21 @@ user_router = APIRouter(
 
 
 @user_router.get('/', response_model=List[UserSchema], summary="List all users")
-def user_list(db: Session = Depends(get_db)):
-    db_users = get_users(db)
+async def user_list(db: Session = Depends(get_db)):
+    db_users = await run_db(db, get_users)
 
     return db_users
 
 
 @user_router.get('/me', response_model=UserSchema, summary="Get current authenticated user")
-def user_list(current_user: User = Depends(get_current_active_user)):
+async def user_list(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 
 
 @user_router.get('/{user_id}', response_model=UserSchema, summary="Get user details by ID")
-def user_detail(user_id: int, db: Session = Depends(get_db)):
-    db_user = get_user(db, user_id)
+async def user_detail(user_id: int, db: Session = Depends(get_db)):
+    db_user = await run_db(db, get_user, user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -38,15 +39,28 @@ def user_detail(user_id: int, db: Session = Depends(get_db)):
 
 
 @user_router.delete('/{user_id}', status_code=status.HTTP_204_NO_CONTENT, summary="Delete a user by ID")
-def user_delete(user_id: int, db: Session = Depends(get_db)):
-    db_user = get_user(db, user_id)
+async def user_delete(user_id: int, db: Session = Depends(get_db)):
+    db_user = await run_db(db, get_user, user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    delete_user(db, db_user.id)
+    await run_db(db, delete_user, db_user.id)
     return {"message": "User deleted"}
 
 
-@user_router.post("/", response_model=UserSchema, status_code=status.HTTP_201_CREATED, summary="Create a new user")
-def user_post(user: UserCreate, db:Session = Depends(get_db)):
-    return create_user(db, user)
\ No newline at end of file
+@user_router.post(
+    "/",
+    response_model=UserSchema,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a new user",
+    responses={503: {"description": "Password hashing capacity exhausted, retry later"}})
+async def user_post(user: UserCreate, db:Session = Depends(get_db)):
+    try:
+        hashed_password = await run_password_task(get_password_hash, user.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent password operations, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    return await run_db(db, create_user, user, hashed_password=hashed_password)
\ No newline at end of file
@@ -0,0 +1,35 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.db import SessionLocal
+from app.services.recurring_expense_service import materialise_due_occurrences
+
+logger = logging.getLogger(__name__)
+
+
+def run_recurring_expenses() -> int:
+    with SessionLocal() as db:
+        return materialise_due_occurrences(db)
+
+
+async def _run_periodically(interval: float) -> None:
+    while True:
+        try:
+            created = await asyncio.to_thread(run_recurring_expenses)
+            if created:
+                logger.info("Created %d recurring expense(s)", created)
+        except Exception:
+            logger.exception("Recurring expense run failed")
+        await asyncio.sleep(interval)
+
+
+def start_recurring_scheduler(interval: float) -> Optional[asyncio.Task]:
+    """
+    Materialise due recurring expenses now and then every `interval` seconds, on a worker thread
+    so the event loop keeps serving requests. Every worker process may run one: runs skip the
+    rules another run holds and never duplicate occurrences. Returns None when `interval` is 0.
+    """
+    if interval <= 0:
+        return None
+    return asyncio.create_task(_run_periodically(interval), name="recurring-expenses")
@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import List, Optional
+
+from app.schemas.expense_schema import Money
+
+
+class BudgetUpdate(BaseModel):
+    amount: Money = Field(..., gt=0, description="Monthly limit in the user's currency")
+
+
+class BudgetRead(BaseModel):
+    category_id: int
+    amount: Money
+
+    class Config:
+        orm_mode = True
+
+
+class BudgetStatus(BaseModel):
+    category_id: int
+    category_name: str
+    budget: Optional[Money] = None
+    spent: Money
+    remaining: Optional[Money] = None
+    percent_used: Optional[float] = None
+
+
+class BudgetStatusReport(BaseModel):
+    month: date
+    currency: str
+    categories: List[BudgetStatus]
+
+
+class BudgetAlertRead(BaseModel):
+    category_id: int
+    month: date
+    threshold: int = Field(..., description="Percent of the budget that spending reached")
+    budget: Money
+    spent: Money
+    created_at: datetime
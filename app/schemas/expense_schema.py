@@ -1,11 +1,24 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PlainSerializer
 from datetime import datetime
-from typing import Optional
+from decimal import Decimal
+from typing import Annotated, List, Optional
+
+
+# An exact amount in cents precision. JSON carries it as a number, as before; up to 15 digits
+# the number reads back as exactly this decimal.
+Money = Annotated[
+    Decimal,
+    Field(max_digits=15, decimal_places=2),
+    PlainSerializer(float, return_type=float, when_used="json")
+]
+# ISO 4217 code, such as EUR or USD.
+CurrencyCode = Annotated[str, Field(pattern=r"^[A-Z]{3}$")]
 
 
 class ExpenseBase(BaseModel):
     description: Optional[str] = None
-    amount: float = Field(..., gt=0)
+    amount: Money = Field(..., gt=0)
+    currency: Optional[CurrencyCode] = Field(None, description="Defaults to the user's currency")
     category_id: int
     date: Optional[datetime] = None
 
@@ -16,7 +29,8 @@ class ExpenseCreate(ExpenseBase):
 
 class ExpenseUpdate(BaseModel):
     description: Optional[str] = None
-    amount: Optional[float] = Field(None, gt=0)
+    amount: Optional[Money] = Field(None, gt=0)
+    currency: Optional[CurrencyCode] = None
     category_id: Optional[int] = None
     date: Optional[datetime] = None
 
@@ -32,9 +46,21 @@ class CategoryRead(BaseModel):
 class ExpenseRead(BaseModel):
     id: int
     description: Optional[str]
-    amount: float
+    amount: Money
+    currency: str
     date: datetime
     category: CategoryRead
 
     class Config:
         orm_mode = True
+
+
+class ExpenseBulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class ExpenseBulkResult(BaseModel):
+    created: int
+    ids: List[int]
+    errors: List[ExpenseBulkError]
@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field, model_validator
+from datetime import date
+from typing import Optional
+
+from app.schemas.expense_schema import CurrencyCode, Money
+
+
+class RecurringExpenseBase(BaseModel):
+    description: Optional[str] = None
+    amount: Money = Field(..., gt=0)
+    currency: Optional[CurrencyCode] = Field(None, description="Defaults to the user's currency")
+    category_id: int
+    interval_months: int = Field(1, ge=1, le=120, description="Months between occurrences")
+    day_of_month: int = Field(..., ge=1, le=31, description="Months without this day use their last day")
+    start_date: date
+    end_date: Optional[date] = Field(None, description="Last day an occurrence may fall on; open-ended if omitted")
+
+
+class RecurringExpenseCreate(RecurringExpenseBase):
+    @model_validator(mode="after")
+    def _ends_after_start(self):
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+
+class RecurringExpenseUpdate(BaseModel):
+    description: Optional[str] = None
+    amount: Optional[Money] = Field(None, gt=0)
+    currency: Optional[CurrencyCode] = None
+    category_id: Optional[int] = None
+    end_date: Optional[date] = None
+
+
+class RecurringExpenseRead(RecurringExpenseBase):
+    id: int
+    currency: str
+    next_date: Optional[date] = Field(None, description="Next occurrence to be created; null once the rule has ended")
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from datetime import date
+from enum import Enum
+from typing import List, Optional
+
+from app.schemas.expense_schema import Money
+
+
+class SpendingGroupBy(str, Enum):
+    category = "category"
+    day = "day"
+    week = "week"
+    month = "month"
+    category_month = "category_month"
+
+
+class SpendingBucket(BaseModel):
+    category_id: Optional[int] = None
+    period: Optional[date] = None
+    total: Money
+
+
+class SpendingBreakdown(BaseModel):
+    group_by: SpendingGroupBy
+    currency: str
+    total_spending: Money
+    buckets: List[SpendingBucket]
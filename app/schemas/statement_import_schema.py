@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from enum import Enum
+from typing import List
+
+
+class StatementFormat(str, Enum):
+    csv = "csv"
+    ofx = "ofx"
+
+
+class DebitSign(str, Enum):
+    negative = "negative"
+    positive = "positive"
+
+
+class StatementImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class StatementImportResult(BaseModel):
+    rows_read: int = 0
+    imported: int = 0
+    failed: int = 0
+    skipped: int = 0
+    categories_created: int = 0
+    errors: List[StatementImportError] = []
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List
+
+from app.schemas.category_schema import CategoryRead
+from app.schemas.expense_schema import ExpenseRead
+
+
+class SyncDeleted(BaseModel):
+    categories: List[int]
+    expenses: List[int]
+
+
+class SyncRead(BaseModel):
+    token: int
+    categories: List[CategoryRead]
+    expenses: List[ExpenseRead]
+    deleted: SyncDeleted
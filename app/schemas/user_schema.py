@@ -1,4 +1,8 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from typing import Optional
+
+from app.config import DEFAULT_CURRENCY
+from app.schemas.expense_schema import CurrencyCode
 
 
 class UserBase(BaseModel):
@@ -8,10 +12,12 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     password: str
+    currency: Optional[CurrencyCode] = Field(None, description=f"Currency of balances and totals, {DEFAULT_CURRENCY} by default")
 
 
 class UserSchema(UserBase):
     id: int
+    currency: str
 
     class Config:
         from_attributes = True
\ No newline at end of file
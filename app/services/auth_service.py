@@ -5,14 +5,15 @@ from dotenv import load_dotenv
 from jwt.exceptions import InvalidTokenError
 from app.models.token import TokenData
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, status
 from datetime import datetime, timedelta, timezone
 import jwt
-from app.db import get_db
+from app.db import get_db, run_db
 from app.models.user import User
-from app.services.password_service import verify_password
-from app.services.user_service import get_user_by_email
+from app.services.password_service import run_password_task, verify_password
+from app.services.user_service import get_user_by_email, user_cache
 
 
 load_dotenv()
@@ -24,11 +25,11 @@ ALGORITHM = "HS256"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 
-def authenticate_user(email: str, password: str, db:Session = Depends(get_db)):
-    user = get_user_by_email(db, email)
+async def authenticate_user(email: str, password: str, db:Session = Depends(get_db)):
+    user = await run_db(db, get_user_by_email, email)
     if not user:
         return False
-    if not verify_password(password, user.password):
+    if not await run_password_task(verify_password, password, user.password):
         return False
     return user
 
@@ -44,6 +45,15 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
+def _load_user_for_cache(db: Session, email: str):
+    user = get_user_by_email(db, email=email)
+    state = inspect(user, raiseerr=False)
+    if state is not None and state.session is not None:
+        # Detach the cached instance so later commits in other requests cannot expire it.
+        state.session.expunge(user)
+    return user
+
+
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db:Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -58,9 +68,12 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db:Ses
         token_data = TokenData(email=email)
     except InvalidTokenError:
         raise credentials_exception
-    user = get_user_by_email(db, email=token_data.email)
+    user = user_cache.get(token_data.email)
     if user is None:
-        raise credentials_exception
+        user = await run_db(db, _load_user_for_cache, token_data.email)
+        if user is None:
+            raise credentials_exception
+        user_cache.set(token_data.email, user)
     return user
 
 
@@ -0,0 +1,90 @@
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.orm import Session
+
+from app.models.expense import Expense
+from app.models.user import User
+from app.money import from_cents
+from app.services.data_version_service import bump_data_version
+
+
+def adjust_total_spent(db: Session, user_id: int, delta_cents: int) -> None:
+    """
+    Add `delta_cents` to the user's running total inside the caller's transaction.
+    The increment happens in SQL so concurrent writers cannot lose updates.
+    """
+    if not delta_cents:
+        return
+    db.query(User).filter(User.id == user_id).update(
+        {User.total_spent_cents: User.total_spent_cents + delta_cents},
+        synchronize_session=False
+    )
+
+
+def adjust_total_spent_for_users(db: Session, deltas: dict[int, int]) -> None:
+    """
+    adjust_total_spent for several users, as one executemany UPDATE.
+    """
+    rows = [{"target_id": user_id, "delta": delta} for user_id, delta in deltas.items() if delta]
+    if not rows:
+        return
+    users = User.__table__
+    db.execute(
+        update(users)
+        .where(users.c.id == bindparam("target_id"))
+        .values(total_spent_cents=users.c.total_spent_cents + bindparam("delta")),
+        rows
+    )
+
+
+def get_balance(db: Session, user: User) -> dict:
+    starting_balance, total_spent_cents, currency = (
+        db.query(User.starting_balance, User.total_spent_cents, User.currency)
+        .filter(User.id == user.id)
+        .one()
+    )
+    total_spent = from_cents(total_spent_cents)
+    return {
+        "starting_balance": starting_balance,
+        "total_spent": total_spent,
+        "current_balance": starting_balance - total_spent,
+        "currency": currency
+    }
+
+
+def reconcile_balances(db: Session, user_id: Optional[int] = None) -> list[tuple[int, Decimal, Decimal]]:
+    """
+    Recompute total_spent from the expenses' stored amounts in each user's currency, and
+    repair every user whose stored value drifted. Returns (user_id, stored, actual) for each
+    repaired user.
+    """
+    actual = (
+        db.query(Expense.user_id, func.sum(Expense.converted_cents).label("total"))
+        .group_by(Expense.user_id)
+        .subquery()
+    )
+    query = db.query(User.id, User.total_spent_cents, actual.c.total).outerjoin(actual, actual.c.user_id == User.id)
+    if user_id is not None:
+        query = query.filter(User.id == user_id)
+
+    repaired = []
+    for drifted_id, stored, total in query.all():
+        if stored == (total or 0):
+            continue
+        # Recount under the user's row lock so a concurrent write cannot slip in between.
+        db.query(User).filter(User.id == drifted_id).with_for_update().one()
+        total = int(
+            db.query(func.sum(Expense.converted_cents))
+            .filter(Expense.user_id == drifted_id)
+            .scalar() or 0
+        )
+        db.query(User).filter(User.id == drifted_id).update(
+            {User.total_spent_cents: total},
+            synchronize_session=False
+        )
+        bump_data_version(db, drifted_id)
+        repaired.append((drifted_id, from_cents(stored), from_cents(total)))
+
+    db.commit()
+    return repaired
@@ -0,0 +1,201 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import Row, and_, insert, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session
+
+from app.config import BUDGET_ALERT_THRESHOLDS
+from app.models.budget import Budget
+from app.models.budget_alert import BudgetAlert
+from app.models.category import Category
+from app.models.expense_monthly_total import ExpenseMonthlyTotal
+from app.models.user import User
+from app.money import from_cents
+
+MAX_ALERTS = 100
+
+
+def get_budget(db: Session, category_id: int, user: User) -> Optional[Budget]:
+    return db.query(Budget).filter(Budget.user_id == user.id, Budget.category_id == category_id).first()
+
+
+def set_budget(db: Session, category_id: int, amount: Decimal, user: User) -> Optional[Budget]:
+    """
+    Create or replace the monthly budget of one of the user's categories; None if the category
+    is not theirs.
+    """
+    if not db.query(Category.id).filter(Category.id == category_id, Category.user_id == user.id).first():
+        return None
+    budget = get_budget(db, category_id, user)
+    if budget is None:
+        budget = Budget(user_id=user.id, category_id=category_id)
+        db.add(budget)
+    budget.amount = amount
+    db.commit()
+    db.refresh(budget)
+    return budget
+
+
+def delete_budget(db: Session, category_id: int, user: User) -> bool:
+    deleted = db.query(Budget).filter(
+        Budget.user_id == user.id,
+        Budget.category_id == category_id
+    ).delete(synchronize_session=False)
+    db.commit()
+    return bool(deleted)
+
+
+def delete_category_budget(db: Session, user_id: int, category_id: int) -> None:
+    """
+    Remove a category's budget and alerts inside the caller's transaction, before the category goes.
+    """
+    for model in (BudgetAlert, Budget):
+        db.query(model).filter(
+            model.user_id == user_id,
+            model.category_id == category_id
+        ).delete(synchronize_session=False)
+
+
+def get_budget_status(db: Session, user: User, month: date) -> list[dict]:
+    """
+    Spending against budget of every category of the user in `month`, in one query: the spending
+    comes from the monthly rollup rather than the expenses. Categories without a budget have
+    None for budget, remaining and percent_used.
+    """
+    return [_status(row) for row in _budget_status_query(db, user, month).all()]
+
+
+def _budget_status_query(db: Session, user: User, month: date) -> Query:
+    return (
+        db.query(
+            Category.id.label("category_id"),
+            Category.name.label("category_name"),
+            Budget.amount_cents.label("budget_cents"),
+            ExpenseMonthlyTotal.total_cents.label("spent_cents")
+        )
+        .outerjoin(Budget, and_(Budget.user_id == Category.user_id, Budget.category_id == Category.id))
+        .outerjoin(ExpenseMonthlyTotal, and_(
+            ExpenseMonthlyTotal.user_id == Category.user_id,
+            ExpenseMonthlyTotal.category_id == Category.id,
+            ExpenseMonthlyTotal.month == month
+        ))
+        .filter(Category.user_id == user.id)
+        .order_by(Category.id)
+    )
+
+
+def _status(row: Row) -> dict:
+    spent = row.spent_cents or 0
+    budget = row.budget_cents
+    return {
+        "category_id": row.category_id,
+        "category_name": row.category_name,
+        "budget": None if budget is None else from_cents(budget),
+        "spent": from_cents(spent),
+        "remaining": None if budget is None else from_cents(budget - spent),
+        "percent_used": None if budget is None else round(spent * 100 / budget, 1),
+    }
+
+
+def get_budget_alerts(db: Session, user: User, month: Optional[date] = None, limit: int = MAX_ALERTS) -> list[dict]:
+    """
+    The user's most recent budget alerts, newest first, optionally only those of one month.
+    """
+    query = db.query(BudgetAlert).filter(BudgetAlert.user_id == user.id)
+    if month is not None:
+        query = query.filter(BudgetAlert.month == month)
+    alerts = query.order_by(BudgetAlert.created_at.desc(), BudgetAlert.id.desc()).limit(limit).all()
+    return [
+        {
+            "category_id": alert.category_id,
+            "month": alert.month,
+            "threshold": alert.threshold,
+            "budget": from_cents(alert.budget_cents),
+            "spent": from_cents(alert.spent_cents),
+            "created_at": alert.created_at,
+        }
+        for alert in alerts
+    ]
+
+
+def crossed_thresholds(budget_cents: int, before_cents: int, after_cents: int) -> list[int]:
+    """
+    The alert thresholds, in percent of `budget_cents`, that spending going from `before_cents`
+    to `after_cents` reaches for the first time.
+    """
+    return [
+        threshold for threshold in BUDGET_ALERT_THRESHOLDS
+        if before_cents * 100 < budget_cents * threshold <= after_cents * 100
+    ]
+
+
+def record_budget_crossings(
+    db: Session,
+    user_id: int,
+    deltas: dict[tuple[Optional[int], date], tuple[int, int]],
+    totals: dict[tuple[Optional[int], date], int]
+) -> None:
+    """
+    Record an alert for every budget threshold crossed by an expense write, inside the caller's
+    transaction. `deltas` are the write's monthly_deltas and `totals` the running totals that
+    apply_monthly_deltas returned for them, so nothing is re-summed: the spending before the
+    write is the running total minus the delta.
+    """
+    record_budget_crossings_for_users(
+        db,
+        {(user_id, category_id, month): delta for (category_id, month), delta in deltas.items()},
+        {(user_id, category_id, month): total for (category_id, month), total in totals.items()}
+    )
+
+
+def record_budget_crossings_for_users(
+    db: Session,
+    deltas: dict[tuple[int, Optional[int], date], tuple[int, int]],
+    totals: dict[tuple[int, Optional[int], date], int]
+) -> None:
+    """
+    record_budget_crossings for writes of several users, keyed by (user_id, category_id, month)
+    as for apply_monthly_deltas_for_users.
+    """
+    raised = {key: totals[key] for key, (delta, _) in deltas.items() if delta > 0 and key[1] is not None}
+    if not raised:
+        return
+    pairs = {(user_id, category_id) for user_id, category_id, _ in raised}
+    budgets = {
+        (user_id, category_id): amount
+        for user_id, category_id, amount in db.query(Budget.user_id, Budget.category_id, Budget.amount_cents)
+        .filter(tuple_(Budget.user_id, Budget.category_id).in_(pairs))
+    }
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"user_id": user_id, "category_id": category_id, "month": month, "threshold": threshold,
+         "budget_cents": budgets[(user_id, category_id)], "spent_cents": total, "created_at": now}
+        for (user_id, category_id, month), total in raised.items() if (user_id, category_id) in budgets
+        for threshold in crossed_thresholds(
+            budgets[(user_id, category_id)], total - deltas[(user_id, category_id, month)][0], total
+        )
+    ]
+    if rows:
+        _insert_new_alerts(db, rows)
+
+
+def _insert_new_alerts(db: Session, rows: list[dict]) -> None:
+    # A threshold crossed again, after spending dropped back below it, keeps its first alert.
+    dialect = db.bind.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        db.execute(
+            dialect_insert(BudgetAlert).on_conflict_do_nothing(index_elements=["category_id", "month", "threshold"]),
+            rows
+        )
+        return
+
+    for row in rows:
+        exists = db.query(BudgetAlert.id).filter(
+            BudgetAlert.category_id == row["category_id"],
+            BudgetAlert.month == row["month"],
+            BudgetAlert.threshold == row["threshold"]
+        ).first()
+        if not exists:
+            db.execute(insert(BudgetAlert), row)
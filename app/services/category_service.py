@@ -1,10 +1,17 @@
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 from app.models.category import Category
+from app.models.expense import Expense
 from app.schemas.category_schema import CategoryCreate, CategoryUpdate
 from app.models.user import User
+from app.services.balance_service import adjust_total_spent
+from app.services.budget_service import delete_category_budget
+from app.services.monthly_total_service import delete_category_totals
+from app.services.recurring_expense_service import delete_category_recurring_expenses
+from app.services.sync_service import CATEGORY, EXPENSE, change_stamp, record_deletions
 
 def create_category(db: Session, category_data: CategoryCreate, user: User) -> Category:
-    category = Category(**category_data.dict(), user_id=user.id)
+    category = Category(**category_data.dict(), user_id=user.id, **change_stamp(db, user.id))
     db.add(category)
     db.commit()
     db.refresh(category)
@@ -16,6 +23,13 @@ def get_categories(db: Session, user: User) -> list[Category]:
     return db.query(Category).filter(Category.user_id == user.id).all()
 
 
+def get_category_rows(db: Session, user: User) -> list[Row]:
+    """
+    The user's categories as plain (id, name) rows.
+    """
+    return db.query(Category.id, Category.name).filter(Category.user_id == user.id).all()
+
+
 def get_category(db: Session, category_id: int, user: User) -> Category | None:
     return db.query(Category).filter(Category.id == category_id, Category.user_id == user.id).first()
 
@@ -25,7 +39,7 @@ def update_category(db: Session, category_id: int, update_data: CategoryUpdate,
     if not category:
         return None
     
-    for key, value in update_data.dict(exclude_unset=True).items():
+    for key, value in {**update_data.dict(exclude_unset=True), **change_stamp(db, user.id)}.items():
         setattr(category, key, value)
 
     db.commit()
@@ -38,8 +52,20 @@ def delete_category(db: Session, category_id: int, user: User) -> bool:
     category = get_category(db, category_id, user)
     if not category:
         return False
-    
+
+    cascaded = (
+        db.query(Expense.id, Expense.converted_cents)
+        .filter(Expense.category_id == category.id, Expense.user_id == user.id)
+        .all()
+    )
+    stamp = change_stamp(db, user.id)
+    record_deletions(db, user.id, CATEGORY, [category.id], stamp)
+    record_deletions(db, user.id, EXPENSE, [row.id for row in cascaded], stamp)
+    delete_category_totals(db, user.id, category.id)
+    delete_category_budget(db, user.id, category.id)
+    delete_category_recurring_expenses(db, user.id, category.id)
     db.delete(category)
+    adjust_total_spent(db, user.id, -sum(row.converted_cents for row in cascaded))
     db.commit()
 
     return True
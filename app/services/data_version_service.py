@@ -0,0 +1,101 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional
+from fastapi import Depends, Header, HTTPException, Response, status
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db import get_db, run_db
+from app.models.user import User
+from app.services.auth_service import get_current_user
+
+
+def bump_data_version(db: Session, user_id: int) -> int:
+    """
+    Mark the user's categories and expenses as changed inside the caller's transaction, which
+    also makes their cached responses unreachable once it commits. Returns the new version.
+    """
+    statement = (
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1, data_updated_at=datetime.now(timezone.utc))
+        .returning(User.data_version)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(statement).scalar_one()
+
+
+def bump_data_versions(db: Session, user_ids: Iterable[int]) -> dict[int, int]:
+    """
+    bump_data_version for several users in one statement. Returns their new versions by user id.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return {}
+    statement = (
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(data_version=User.data_version + 1, data_updated_at=datetime.now(timezone.utc))
+        .returning(User.id, User.data_version)
+        .execution_options(synchronize_session=False)
+    )
+    return dict(db.execute(statement).all())
+
+
+def get_data_version(db: Session, user: User) -> tuple[int, Optional[datetime]]:
+    # Read from the table, not `user`: authenticated users are cached and may be stale.
+    version, updated_at = (
+        db.query(User.data_version, User.data_updated_at)
+        .filter(User.id == user.id)
+        .one()
+    )
+    if updated_at is not None and updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return version, updated_at
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" and "x" are the same tag.
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def _not_modified_since(if_modified_since: str, updated_at: Optional[datetime]) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if updated_at is None:
+        return True
+    return updated_at.replace(microsecond=0) <= since
+
+
+async def check_data_version(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> int:
+    """
+    Conditional GET for endpoints whose response depends only on the user's categories and
+    expenses: set ETag/Last-Modified from the data version and answer 304 when the client's
+    copy is current, before the endpoint runs its queries. Returns the data version.
+    """
+    # Read before the endpoint's queries: a write landing in between gives the response an
+    # older tag than its content, which only costs the client one extra download later.
+    version, updated_at = await run_db(db, get_data_version, current_user)
+    headers = {"ETag": f'W/"{current_user.id}-{version}"', "Cache-Control": "private, no-cache"}
+    if updated_at is not None:
+        headers["Last-Modified"] = format_datetime(updated_at, usegmt=True)
+
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, headers["ETag"])
+    else:
+        not_modified = if_modified_since is not None and _not_modified_since(if_modified_since, updated_at)
+    if not_modified:
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return version
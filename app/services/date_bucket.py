@@ -0,0 +1,21 @@
+from sqlalchemy import Date, func, type_coerce
+from sqlalchemy.orm import Session
+
+# SQLite date() modifiers that move a timestamp to the start of its bucket; weeks start on Monday.
+_SQLITE_MODIFIERS = {
+    "day": (),
+    "week": ("weekday 0", "-6 days"),
+    "month": ("start of month",),
+}
+
+
+def truncate_date(db: Session, unit: str, column):
+    """
+    SQL expression truncating a datetime column to the first day of its day, week or month,
+    typed as a Date on both PostgreSQL and SQLite.
+    """
+    if unit not in _SQLITE_MODIFIERS:
+        raise ValueError(f"Unsupported date bucket: {unit}")
+    if db.bind.dialect.name == "postgresql":
+        return type_coerce(func.date(func.date_trunc(unit, column)), Date)
+    return type_coerce(func.date(column, *_SQLITE_MODIFIERS[unit]), Date)
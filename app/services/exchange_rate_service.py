@@ -0,0 +1,156 @@
+import csv
+from datetime import date, datetime, time
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Iterable, Iterator
+from sqlalchemy import BigInteger, case, cast, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache
+from app.config import EXPENSE_BULK_BATCH_SIZE, RATE_CACHE_SIZE, RATE_CACHE_TTL
+from app.models.exchange_rate import ExchangeRate
+from app.models.expense import Expense
+from app.models.user import User
+
+RATE_PLACES = Decimal("0.00000001")
+
+# (base, quote, day) -> rate dated exactly that day. Misses and lookups that fell back to an
+# earlier date are not cached, so a rate loaded later, possibly by another process, is picked
+# up by the next write.
+rate_cache = TTLCache(maxsize=RATE_CACHE_SIZE, ttl=RATE_CACHE_TTL)
+
+
+class MissingRateError(ValueError):
+    def __init__(self, base: str, quote: str, on: date):
+        super().__init__(f"No {base}/{quote} exchange rate on or before {on.isoformat()}")
+
+
+def _day(value: date | datetime) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def get_rate(db: Session, base: str, quote: str, on: date | datetime) -> Decimal:
+    """
+    Price of one `base` unit in `quote` on `on`: the pair's latest rate dated on or before it.
+    Raises MissingRateError when there is none.
+    """
+    if base == quote:
+        return Decimal(1)
+    key = (base, quote, _day(on))
+    rate = rate_cache.get(key)
+    if rate is None:
+        found = db.execute(
+            select(ExchangeRate.rate, ExchangeRate.date)
+            .where(ExchangeRate.base == base, ExchangeRate.quote == quote, ExchangeRate.date <= key[2])
+            .order_by(ExchangeRate.date.desc())
+            .limit(1)
+        ).first()
+        if found is None:
+            raise MissingRateError(base, quote, key[2])
+        rate = Decimal(found.rate)
+        if found.date == key[2]:
+            rate_cache.set(key, rate)
+    return rate
+
+
+def convert_cents(db: Session, cents: int, currency: str, target: str, on: date | datetime) -> int:
+    """
+    `cents` of `currency` in cents of `target`, rounded like converted_cents rounds in SQL.
+    """
+    if currency == target:
+        return cents
+    return int((cents * get_rate(db, currency, target, on)).to_integral_value(ROUND_HALF_UP))
+
+
+def converted_cents(amount_cents, currency, target, on):
+    """
+    SQL expression converting `amount_cents` of `currency` into `target` at the rate in effect on
+    `on`, for revaluing rows in the database. Rows without a rate count as NULL.
+    """
+    # An as-of join: the newest rate dated on or before the row's date, found through the
+    # (base, quote, date) primary key. Rows already in the target currency skip the lookup.
+    rate = (
+        select(ExchangeRate.rate)
+        .where(ExchangeRate.base == currency, ExchangeRate.quote == target, ExchangeRate.date <= on)
+        .order_by(ExchangeRate.date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return case((currency == target, amount_cents), else_=cast(func.round(amount_cents * rate), BigInteger))
+
+
+def revalue_expenses(db: Session, since: date) -> int:
+    """
+    Convert foreign expenses dated on or after `since` again at the current rates, after rates
+    were loaded or corrected, and commit. Expenses still without a rate keep their amount.
+    Monthly totals and balances must then be rebuilt. Returns the number of expenses changed.
+    """
+    owner_currency = select(User.currency).where(User.id == Expense.user_id).scalar_subquery()
+    revalued = converted_cents(Expense.amount_cents, Expense.currency, owner_currency, Expense.date)
+    changed = (
+        db.query(Expense)
+        .filter(
+            Expense.currency != owner_currency,
+            Expense.date >= datetime.combine(since, time.min),
+            revalued != Expense.converted_cents
+        )
+        .update({Expense.converted_cents: revalued}, synchronize_session=False)
+    )
+    db.commit()
+    return changed
+
+
+def parse_rates_csv(lines: Iterable[str]) -> Iterator[tuple[date, str, str, Decimal]]:
+    """
+    Read (date, base, quote, rate) rows from a CSV file with a `date,base,quote,rate` header,
+    where one `base` costs `rate` `quote`. Raises ValueError naming the first bad line.
+    """
+    reader = csv.DictReader(lines)
+    for record in reader:
+        try:
+            base, quote = record["base"].strip().upper(), record["quote"].strip().upper()
+            if len(base) != 3 or len(quote) != 3 or not (base + quote).isalpha():
+                raise ValueError("currencies must be three-letter codes")
+            rate = Decimal(record["rate"].strip())
+            if not rate.is_finite() or rate <= 0:
+                raise ValueError("rate must be positive")
+            yield date.fromisoformat(record["date"].strip()), base, quote, rate
+        except (KeyError, AttributeError, InvalidOperation, ValueError) as exc:
+            raise ValueError(f"line {reader.line_num}: {exc or 'invalid rate'}") from exc
+
+
+def load_rates(
+    db: Session,
+    rates: Iterable[tuple[date, str, str, Decimal]],
+    batch_size: int = EXPENSE_BULK_BATCH_SIZE
+) -> int:
+    """
+    Insert or replace the given rates, adding the inverse of each pair unless the input has it
+    for the same date, and commit. Returns the number of rows written.
+    """
+    given = {(day, base, quote): rate for day, base, quote, rate in rates}
+    rows = dict(given)
+    for (day, base, quote), rate in given.items():
+        rows.setdefault((day, quote, base), Decimal(1) / rate)
+    rows = [
+        {"date": day, "base": base, "quote": quote, "rate": rate.quantize(RATE_PLACES)}
+        for (day, base, quote), rate in rows.items()
+    ]
+
+    dialect = db.bind.dialect.name
+    for offset in range(0, len(rows), batch_size):
+        batch = rows[offset:offset + batch_size]
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            statement = dialect_insert(ExchangeRate)
+            statement = statement.on_conflict_do_update(
+                index_elements=["base", "quote", "date"],
+                set_={"rate": statement.excluded.rate}
+            )
+            db.execute(statement, batch)
+        else:
+            for row in batch:
+                db.merge(ExchangeRate(**row))
+    db.commit()
+    rate_cache.clear()
+    return len(rows)
@@ -0,0 +1,123 @@
+import csv
+import io
+from typing import Iterable, Iterator
+from sqlalchemy import Row
+
+from app.money import from_cents
+from app.schemas.expense_export_schema import ExportFormat
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - exercised only when pyarrow is absent
+    pyarrow = None
+
+EXPORT_COLUMNS = ("id", "date", "amount", "currency", "description", "category_id", "category")
+CSV_FLUSH_ROWS = 500
+# Each Arrow record batch becomes one Parquet row group, so keep these reasonably large.
+ARROW_BATCH_SIZE = 10000
+
+MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.arrow: "application/vnd.apache.arrow.stream",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+
+def format_available(export_format: ExportFormat) -> bool:
+    return export_format == ExportFormat.csv or pyarrow is not None
+
+
+def export_expenses(rows: Iterable[Row], export_format: ExportFormat) -> Iterator[bytes]:
+    """
+    Encode expense rows from iter_expense_rows as a stream of byte chunks in the given format.
+    """
+    if export_format == ExportFormat.csv:
+        return _export_csv(rows)
+    if pyarrow is None:
+        raise RuntimeError(f"{export_format.value} export requires pyarrow")
+    return _export_arrow(rows, parquet=export_format == ExportFormat.parquet)
+
+
+def _export_csv(rows: Iterable[Row]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for count, (expense_id, date, amount_cents, currency, description, category_id, category) in enumerate(rows, 1):
+        writer.writerow((
+            expense_id, date.isoformat(), from_cents(amount_cents), currency, description or "", category_id, category
+        ))
+        if count % CSV_FLUSH_ROWS == 0:
+            yield _drain(buffer).encode("utf-8")
+    tail = _drain(buffer)
+    if tail:
+        yield tail.encode("utf-8")
+
+
+def _drain(buffer: io.StringIO) -> str:
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands whatever pyarrow has written so far back to the caller."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema():
+    return pyarrow.schema([
+        ("id", pyarrow.int64()),
+        ("date", pyarrow.timestamp("us")),
+        ("amount", pyarrow.float64()),
+        ("currency", pyarrow.string()),
+        ("description", pyarrow.string()),
+        ("category_id", pyarrow.int64()),
+        ("category", pyarrow.string()),
+    ])
+
+
+def _export_arrow(rows: Iterable[Row], parquet: bool) -> Iterator[bytes]:
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    if parquet:
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    else:
+        writer = pyarrow.ipc.new_stream(sink, schema)
+
+    def write(batch: list) -> None:
+        writer.write_batch(pyarrow.record_batch(list(zip(*batch)), schema=schema))
+
+    batch = []
+    for expense_id, date, amount_cents, currency, description, category_id, category in rows:
+        batch.append((expense_id, date, amount_cents / 100, currency, description, category_id, category))
+        if len(batch) == ARROW_BATCH_SIZE:
+            write(batch)
+            batch = []
+            yield sink.drain()
+    if batch:
+        write(batch)
+    writer.close()
+    yield sink.drain()
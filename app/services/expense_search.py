@@ -0,0 +1,42 @@
+import re
+from sqlalchemy import column, false, func, literal_column, table
+from sqlalchemy.orm import Query, Session
+
+from app.models.expense import Expense
+
+MAX_SEARCH_TERMS = 8
+
+_TERM = re.compile(r"\w+")
+_expenses_fts = table("expenses_fts", column("rowid"))
+
+
+def search_terms(search: str) -> list[str]:
+    """
+    Words of a search string, lowercased. Operators and punctuation are dropped, so user input
+    can never change the structure of the full-text query.
+    """
+    return _TERM.findall(search.lower())[:MAX_SEARCH_TERMS]
+
+
+def apply_search(db: Session, query: Query, search: str) -> Query:
+    """
+    Restrict an expense query to descriptions containing every search term, each term also
+    matching as a prefix ("cof" finds "coffee"), and order the matches best first.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return query.filter(false())
+
+    if db.bind.dialect.name == "postgresql":
+        tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        vector = literal_column("expenses.search_vector")
+        return query.filter(vector.op("@@")(tsquery)).order_by(func.ts_rank(vector, tsquery).desc())
+
+    fts = literal_column("expenses_fts")
+    match = " ".join(f'"{term}"*' for term in terms)
+    # bm25() is lower for better matches.
+    return (
+        query.join(_expenses_fts, _expenses_fts.c.rowid == Expense.id)
+        .filter(fts.op("MATCH")(match))
+        .order_by(func.bm25(fts))
+    )
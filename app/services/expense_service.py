@@ -1,59 +1,358 @@
-from datetime import datetime
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import base64
+from datetime import datetime, timezone
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from typing import Any, Iterable, Iterator, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import Row, and_, insert, or_
+from sqlalchemy.orm import Query, Session, joinedload
+from app.config import EXPENSE_BULK_BATCH_SIZE
+from app.money import to_cents
+from app.models.category import Category
 from app.models.expense import Expense
 from app.schemas.expense_schema import ExpenseCreate, ExpenseUpdate
 from app.models.user import User
+from app.services.balance_service import adjust_total_spent
+from app.services.budget_service import record_budget_crossings
+from app.services.exchange_rate_service import MissingRateError, convert_cents
+from app.services.expense_search import apply_search
+from app.services.monthly_total_service import ExpenseEntry, apply_monthly_deltas, monthly_deltas
+from app.services.sync_service import EXPENSE, change_stamp, record_deletions
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+MAX_BULK_ITEMS = 50000
+
+
+def encode_cursor(expense: Expense) -> str:
+    raw = f"{expense.date.isoformat()}|{expense.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        date_part, id_part = raw.rsplit("|", 1)
+        return datetime.fromisoformat(date_part), int(id_part)
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _converted_cents(db: Session, user: User, amount_cents: int, currency: str, expense_date: datetime) -> int:
+    """
+    The amount as it counts towards the user's totals: in the user's currency, converted at the
+    rate of the expense's date. Raises MissingRateError when there is no such rate.
+    """
+    return convert_cents(db, amount_cents, currency, user.currency, expense_date)
+
+
+def _expense_entry(expense: Expense) -> ExpenseEntry:
+    return expense.category_id, expense.date, expense.converted_cents
+
+
+def _apply_expense_changes(
+    db: Session,
+    user_id: int,
+    added: Iterable[ExpenseEntry] = (),
+    removed: Iterable[ExpenseEntry] = ()
+) -> None:
+    """
+    Keep the user's running total and monthly rollups in step with an expense write, and record
+    the budget thresholds it crosses.
+    """
+    added, removed = list(added), list(removed)
+    adjust_total_spent(
+        db, user_id,
+        sum(amount for _, _, amount in added) - sum(amount for _, _, amount in removed)
+    )
+    deltas = monthly_deltas(added, removed)
+    record_budget_crossings(db, user_id, deltas, apply_monthly_deltas(db, user_id, deltas))
+
 
 def create_expense(db: Session, expense_data: ExpenseCreate, user: User) -> Expense:
-    expense = Expense(**expense_data.dict(), user_id=user.id)
+    """
+    Raises MissingRateError, before writing anything, for a currency without a rate on the expense's date.
+    """
+    values = expense_data.dict()
+    values["currency"] = values["currency"] or user.currency
+    values["date"] = values["date"] or datetime.now(timezone.utc)
+    expense = Expense(**values, user_id=user.id)
+    expense.converted_cents = _converted_cents(db, user, expense.amount_cents, expense.currency, expense.date)
+    entry = _expense_entry(expense)
+    for key, value in change_stamp(db, user.id).items():
+        setattr(expense, key, value)
     db.add(expense)
+    db.flush()
+    _apply_expense_changes(db, user.id, added=[entry])
     db.commit()
-    db.refresh(expense)
-    return expense
+    return get_expense(db, expense.id, user)
 
-def get_expenses(
+
+def insert_expense_rows(
     db: Session,
+    user: User,
+    rows: list[dict],
+    batch_size: int = EXPENSE_BULK_BATCH_SIZE
+) -> list[int]:
+    """
+    Insert expense rows (dicts with category_id, date, amount_cents, currency and description,
+    and converted_cents if already known) with one multi-row INSERT ... RETURNING per batch,
+    inside the caller's transaction. Returns the new ids in row order. Rows in a currency
+    without a rate on their date raise MissingRateError before their batch is written.
+    """
+    ids = []
+    if not rows:
+        return ids
+    stamp = change_stamp(db, user.id)
+    statement = insert(Expense).returning(Expense.id, sort_by_parameter_order=True)
+    for offset in range(0, len(rows), batch_size):
+        batch = [{**row, "user_id": user.id, **stamp} for row in rows[offset:offset + batch_size]]
+        for row in batch:
+            if "converted_cents" not in row:
+                row["converted_cents"] = _converted_cents(db, user, row["amount_cents"], row["currency"], row["date"])
+        ids.extend(db.scalars(statement, batch))
+        added = [(row["category_id"], row["date"], row["converted_cents"]) for row in batch]
+        _apply_expense_changes(db, user.id, added=added)
+    return ids
+
+
+def create_expenses_bulk(
+    db: Session,
+    items: list[Any],
+    user: User,
+    batch_size: int = EXPENSE_BULK_BATCH_SIZE
+) -> dict:
+    """
+    Validate and insert many expenses in one transaction. Invalid rows, including rows whose
+    category does not belong to the user or whose currency has no rate, are reported by index
+    and skipped.
+    """
+    errors = []
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, ExpenseCreate.model_validate(item)))
+        except ValidationError as exc:
+            detail = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}" for error in exc.errors()
+            )
+            errors.append({"index": index, "detail": detail})
+
+    category_ids = {expense.category_id for _, expense in valid}
+    owned = {
+        category_id for (category_id,) in
+        db.query(Category.id).filter(Category.user_id == user.id, Category.id.in_(category_ids))
+    } if category_ids else set()
+
+    rows = []
+    now = datetime.now(timezone.utc)
+    for index, expense in valid:
+        if expense.category_id not in owned:
+            errors.append({"index": index, "detail": "category_id: Category not found or not yours"})
+            continue
+        row = {
+            "category_id": expense.category_id,
+            "date": expense.date or now,
+            "amount_cents": to_cents(expense.amount),
+            "currency": expense.currency or user.currency,
+            "description": expense.description,
+        }
+        try:
+            row["converted_cents"] = _converted_cents(db, user, row["amount_cents"], row["currency"], row["date"])
+        except MissingRateError as exc:
+            errors.append({"index": index, "detail": f"currency: {exc}"})
+            continue
+        rows.append(row)
+
+    ids = insert_expense_rows(db, user, rows, batch_size)
+    db.commit()
+
+    return {"created": len(ids), "ids": ids, "errors": sorted(errors, key=lambda error: error["index"])}
+
+
+def _expense_criteria(
     user: User,
     category_id: Optional[int] = None,
-    min_amount: Optional[float] = None,
-    max_amount: Optional[float] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
-) -> List[Expense]:
-    query = db.query(Expense).filter(Expense.user_id == user.id)
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None
+) -> list:
+    criteria = [Expense.user_id == user.id]
 
     if category_id:
-        query = query.filter(Expense.category_id == category_id)
+        criteria.append(Expense.category_id == category_id)
     if min_amount:
-        query = query.filter(Expense.amount >= min_amount)
+        criteria.append(Expense.amount_cents >= to_cents(min_amount, ROUND_CEILING))
     if max_amount:
-        query = query.filter(Expense.amount <= max_amount)
+        criteria.append(Expense.amount_cents <= to_cents(max_amount, ROUND_FLOOR))
     if start_date:
-        query = query.filter(Expense.date >= start_date)
+        criteria.append(Expense.date >= start_date)
     if end_date:
-        query = query.filter(Expense.date <= end_date)
+        criteria.append(Expense.date <= end_date)
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        criteria.append(or_(
+            Expense.date < cursor_date,
+            and_(Expense.date == cursor_date, Expense.id < cursor_id)
+        ))
+
+    return criteria
+
+
+def _ordered(db: Session, query: Query, search: Optional[str]) -> Query:
+    # Search results are ranked by relevance first; date and id then break ties.
+    if search is not None:
+        query = apply_search(db, query, search)
+    return query.order_by(Expense.date.desc(), Expense.id.desc())
+
+
+def _filtered_expenses(db: Session, user: User, search: Optional[str] = None, **filters) -> Query:
+    query = (
+        db.query(Expense)
+        .options(joinedload(Expense.category))
+        .filter(*_expense_criteria(user, **filters))
+    )
+    return _ordered(db, query, search)
+
+
+def get_expenses(
+    db: Session,
+    user: User,
+    category_id: Optional[int] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    search: Optional[str] = None
+) -> List[Expense]:
+    query = _filtered_expenses(
+        db, user,
+        category_id=category_id,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        start_date=start_date,
+        end_date=end_date,
+        cursor=cursor,
+        search=search
+    )
+    if limit is not None:
+        query = query.limit(limit)
 
     return query.all()
 
 
-def get_expense(db: Session, expense_id: int, user: User) -> Expense | None:
-    return db.query(Expense).filter(Expense.id == expense_id, Expense.user_id == user.id).first()
+def get_expense_page(
+    db: Session,
+    user: User,
+    limit: int = DEFAULT_PAGE_SIZE,
+    **filters
+) -> tuple[List[Expense], Optional[str]]:
+    """
+    Return up to `limit` expenses (newest first) and the cursor of the next page,
+    or None when this is the last page. Search results are a single page of the best matches.
+    """
+    return _page(get_expenses(db, user, limit=limit + 1, **filters), limit, filters.get("search"))
+
+
+def _page(items: list, limit: int, search: Optional[str] = None) -> tuple[list, Optional[str]]:
+    # `items` holds up to limit + 1 results; the extra one only signals that another page exists.
+    # Ranked search results have no date order to continue from, so they never get a cursor.
+    if len(items) <= limit or search is not None:
+        return items[:limit], None
+
+    items = items[:limit]
+    return items, encode_cursor(items[-1])
+
+
+def iter_expenses(db: Session, user: User, **filters) -> Iterator[Expense]:
+    """
+    Yield every matching expense from a server-side cursor, STREAM_BATCH_SIZE rows at a time.
+    """
+    query = _filtered_expenses(db, user, **filters)
+    yield from query.yield_per(STREAM_BATCH_SIZE)
+
+
+def _expense_rows(db: Session, user: User, search: Optional[str] = None, **filters) -> Query:
+    query = (
+        db.query(
+            Expense.id,
+            Expense.date,
+            Expense.amount_cents,
+            Expense.currency,
+            Expense.description,
+            Expense.category_id,
+            Category.name.label("category_name")
+        )
+        .join(Category, Category.id == Expense.category_id)
+        .filter(*_expense_criteria(user, **filters))
+    )
+    return _ordered(db, query, search)
+
+
+def get_expense_row_page(
+    db: Session,
+    user: User,
+    limit: int = DEFAULT_PAGE_SIZE,
+    **filters
+) -> tuple[List[Row], Optional[str]]:
+    """
+    Like get_expense_page, but return plain (id, date, amount_cents, currency, description,
+    category_id, category_name) rows, for responses that are serialised without loading ORM objects.
+    """
+    return _page(_expense_rows(db, user, **filters).limit(limit + 1).all(), limit, filters.get("search"))
+
+
+def iter_expense_rows(db: Session, user: User, **filters) -> Iterator[Row]:
+    """
+    Like iter_expenses, but yield the plain rows of get_expense_row_page, for exports where
+    identity tracking would only cost memory.
+    """
+    yield from _expense_rows(db, user, **filters).yield_per(STREAM_BATCH_SIZE)
+
+
+def get_expense(db: Session, expense_id: int, user: User, for_update: bool = False) -> Expense | None:
+    query = (
+        db.query(Expense)
+        .options(joinedload(Expense.category))
+        .filter(Expense.id == expense_id, Expense.user_id == user.id)
+    )
+    if for_update:
+        query = query.with_for_update(of=Expense)
+
+    return query.first()
 
 def update_expense(db: Session, expense_id: int, update_data: ExpenseUpdate, user: User) -> Expense | None:
-    expense = get_expense(db, expense_id, user)
+    expense = get_expense(db, expense_id, user, for_update=True)
     if not expense:
         return None
-    for key, value in update_data.dict(exclude_unset=True).items():
+    before = _expense_entry(expense)
+    changes = update_data.dict(exclude_unset=True)
+    if "currency" in changes and changes["currency"] is None:
+        del changes["currency"]
+    for key, value in changes.items():
+        setattr(expense, key, value)
+    if changes.keys() & {"amount", "currency", "date"}:
+        # Raises MissingRateError before anything is flushed; the caller's rollback restores the expense.
+        expense.converted_cents = _converted_cents(db, user, expense.amount_cents, expense.currency, expense.date)
+    after = _expense_entry(expense)
+    for key, value in change_stamp(db, user.id).items():
         setattr(expense, key, value)
+    db.flush()
+    _apply_expense_changes(db, user.id, added=[after], removed=[before])
     db.commit()
-    db.refresh(expense)
-    return expense
+    return get_expense(db, expense_id, user)
 
 def delete_expense(db: Session, expense_id: int, user: User) -> bool:
-    expense = get_expense(db, expense_id, user)
+    expense = get_expense(db, expense_id, user, for_update=True)
     if not expense:
         return False
+    removed = _expense_entry(expense)
+    record_deletions(db, user.id, EXPENSE, [expense.id], change_stamp(db, user.id))
     db.delete(expense)
+    _apply_expense_changes(db, user.id, removed=[removed])
     db.commit()
     return True
@@ -0,0 +1,152 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Iterable, Optional
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.expense import Expense
+from app.models.expense_monthly_total import ExpenseMonthlyTotal
+from app.services.data_version_service import bump_data_versions
+from app.services.date_bucket import truncate_date
+
+# (category_id, date, amount_cents) of an expense as it affects the monthly totals.
+ExpenseEntry = tuple[Optional[int], datetime, int]
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def next_month(month: date) -> date:
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def monthly_deltas(
+    added: Iterable[ExpenseEntry] = (),
+    removed: Iterable[ExpenseEntry] = ()
+) -> dict[tuple[Optional[int], date], tuple[int, int]]:
+    deltas = defaultdict(lambda: [0, 0])
+    for sign, entries in ((1, added), (-1, removed)):
+        for category_id, expense_date, amount in entries:
+            delta = deltas[(category_id, month_start(expense_date))]
+            delta[0] += sign * amount
+            delta[1] += sign
+    return {key: (total, count) for key, (total, count) in deltas.items() if total or count}
+
+
+def apply_monthly_deltas(
+    db: Session,
+    user_id: int,
+    deltas: dict[tuple[Optional[int], date], tuple[int, int]]
+) -> dict[tuple[Optional[int], date], int]:
+    """
+    Upsert the given per (category, month) deltas inside the caller's transaction. Returns the
+    resulting total_cents of every row touched, read back from the same statement.
+    """
+    totals = apply_monthly_deltas_for_users(
+        db, {(user_id, category_id, month): delta for (category_id, month), delta in deltas.items()}
+    )
+    return {(category_id, month): total for (_, category_id, month), total in totals.items()}
+
+
+def apply_monthly_deltas_for_users(
+    db: Session,
+    deltas: dict[tuple[int, Optional[int], date], tuple[int, int]]
+) -> dict[tuple[int, Optional[int], date], int]:
+    """
+    apply_monthly_deltas for deltas of several users, keyed by (user_id, category_id, month),
+    in one statement.
+    """
+    if not deltas:
+        return {}
+
+    rows = [
+        {"user_id": user_id, "category_id": category_id, "month": month, "total_cents": total, "expense_count": count}
+        for (user_id, category_id, month), (total, count) in deltas.items()
+    ]
+    dialect = db.bind.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = dialect_insert(ExpenseMonthlyTotal)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "category_id", "month"],
+            set_={
+                "total_cents": ExpenseMonthlyTotal.total_cents + statement.excluded.total_cents,
+                "expense_count": ExpenseMonthlyTotal.expense_count + statement.excluded.expense_count,
+            }
+        ).returning(
+            ExpenseMonthlyTotal.user_id,
+            ExpenseMonthlyTotal.category_id,
+            ExpenseMonthlyTotal.month,
+            ExpenseMonthlyTotal.total_cents
+        )
+        return {
+            (user_id, category_id, month): total
+            for user_id, category_id, month, total in db.execute(statement, rows)
+        }
+
+    totals = {}
+    for row in rows:
+        key = (row["user_id"], row["category_id"], row["month"])
+        existing = db.query(ExpenseMonthlyTotal).filter(
+            ExpenseMonthlyTotal.user_id == row["user_id"],
+            ExpenseMonthlyTotal.category_id == row["category_id"],
+            ExpenseMonthlyTotal.month == row["month"]
+        )
+        updated = existing.update({
+            ExpenseMonthlyTotal.total_cents: ExpenseMonthlyTotal.total_cents + row["total_cents"],
+            ExpenseMonthlyTotal.expense_count: ExpenseMonthlyTotal.expense_count + row["expense_count"],
+        }, synchronize_session=False)
+        if updated:
+            totals[key] = existing.with_entities(ExpenseMonthlyTotal.total_cents).scalar()
+        else:
+            db.execute(insert(ExpenseMonthlyTotal), row)
+            totals[key] = row["total_cents"]
+    return totals
+
+
+def delete_category_totals(db: Session, user_id: int, category_id: int) -> None:
+    db.query(ExpenseMonthlyTotal).filter(
+        ExpenseMonthlyTotal.user_id == user_id,
+        ExpenseMonthlyTotal.category_id == category_id
+    ).delete(synchronize_session=False)
+
+
+def rebuild_monthly_totals(db: Session, user_id: Optional[int] = None) -> None:
+    """
+    Recompute the rollup rows from the expenses' stored amounts in their owner's currency, for
+    one user or everyone. The data version of every rebuilt user is bumped so
+    their cached aggregates are not served from before the rebuild.
+    """
+    if user_id is not None:
+        rebuilt = {user_id}
+    else:
+        rebuilt = {
+            rebuilt_id for rebuilt_id, in
+            db.query(ExpenseMonthlyTotal.user_id).union(db.query(Expense.user_id)).all()
+        }
+    delete = db.query(ExpenseMonthlyTotal)
+    source = db.query(
+        Expense.user_id,
+        Expense.category_id,
+        truncate_date(db, "month", Expense.date).label("month"),
+        func.sum(Expense.converted_cents),
+        func.count(Expense.id)
+    )
+    if user_id is not None:
+        delete = delete.filter(ExpenseMonthlyTotal.user_id == user_id)
+        source = source.filter(Expense.user_id == user_id)
+    source = source.group_by(Expense.user_id, Expense.category_id, "month")
+
+    delete.delete(synchronize_session=False)
+    db.execute(
+        insert(ExpenseMonthlyTotal).from_select(
+            ["user_id", "category_id", "month", "total_cents", "expense_count"],
+            source.statement
+        )
+    )
+    bump_data_versions(db, rebuilt)
+    db.commit()
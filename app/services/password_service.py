@@ -1,5 +1,22 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
 from bcrypt import hashpw, gensalt, checkpw
 
+from app.config import PASSWORD_HASH_MAX_QUEUE, PASSWORD_HASH_WORKERS
+from app.instrumentation import record_password_hash
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when the bcrypt pool already has its maximum number of running and queued jobs.
+    """
+
 
 def get_password_hash(password: str) -> str:
     return hashpw(password.encode("utf-8"), gensalt()).decode("utf-8")
@@ -9,4 +26,49 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
         return checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
     except ValueError:
-        return False
\ No newline at end of file
+        return False
+
+
+_executor: ThreadPoolExecutor
+_slots: threading.BoundedSemaphore
+
+
+def configure_password_pool(workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE) -> None:
+    """
+    (Re)create the bcrypt worker pool. bcrypt releases the GIL, so threads use every core.
+    """
+    global _executor, _slots
+    previous = globals().get("_executor")
+    _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+    _slots = threading.BoundedSemaphore(workers + max_queue)
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+configure_password_pool()
+
+
+def _timed(fn: Callable[..., T], *args) -> tuple[T, float]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+async def run_password_task(fn: Callable[..., T], *args) -> T:
+    """
+    Run a bcrypt call such as verify_password on the bounded pool without blocking the event loop.
+    Raises PasswordHasherBusy instead of queueing once the pool is saturated.
+    """
+    slots = _slots
+    if not slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        future = _executor.submit(_timed, fn, *args)
+    except BaseException:
+        slots.release()
+        raise
+    # Free the slot when the work finishes, even if the awaiting request was cancelled.
+    future.add_done_callback(lambda _: slots.release())
+    result, duration = await asyncio.wrap_future(future)
+    record_password_hash(duration)
+    return result
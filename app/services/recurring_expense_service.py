@@ -0,0 +1,279 @@
+import logging
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.config import EXPENSE_BULK_BATCH_SIZE, RECURRING_BATCH_SIZE
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.recurring_expense import RecurringExpense
+from app.models.user import User
+from app.schemas.recurring_expense_schema import RecurringExpenseCreate, RecurringExpenseUpdate
+from app.services.balance_service import adjust_total_spent_for_users
+from app.services.budget_service import record_budget_crossings_for_users
+from app.services.data_version_service import bump_data_versions
+from app.services.exchange_rate_service import MissingRateError, convert_cents
+from app.services.monthly_total_service import apply_monthly_deltas_for_users, monthly_deltas
+
+logger = logging.getLogger(__name__)
+
+
+def _occurrence(rule: RecurringExpense, month_index: int) -> date:
+    year, month = divmod(month_index, 12)
+    month += 1
+    return date(year, month, min(rule.day_of_month, monthrange(year, month)[1]))
+
+
+def occurrence_on_or_after(rule: RecurringExpense, day: date) -> date:
+    """
+    First date of the rule's schedule on or after `day`, ignoring its end date.
+    """
+    day = max(day, rule.start_date)
+    anchor = rule.start_date.year * 12 + rule.start_date.month - 1
+    months = day.year * 12 + day.month - 1 - anchor
+    step = -(-months // rule.interval_months)
+    # The day of month is clamped, so the occurrence in `day`'s month can still lie before it.
+    while (occurrence := _occurrence(rule, anchor + step * rule.interval_months)) < day:
+        step += 1
+    return occurrence
+
+
+def _scheduled(rule: RecurringExpense, day: date) -> Optional[date]:
+    occurrence = occurrence_on_or_after(rule, day)
+    return None if rule.end_date is not None and occurrence > rule.end_date else occurrence
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _category_owned(db: Session, category_id: int, user: User) -> bool:
+    return db.query(Category.id).filter(Category.id == category_id, Category.user_id == user.id).first() is not None
+
+
+def create_recurring_expense(
+    db: Session,
+    rule_data: RecurringExpenseCreate,
+    user: User,
+    today: Optional[date] = None
+) -> Optional[RecurringExpense]:
+    """
+    Create a rule and materialise its occurrences up to today; None if the category is not the
+    user's.
+    """
+    if not _category_owned(db, rule_data.category_id, user):
+        return None
+    values = rule_data.dict()
+    values["currency"] = values["currency"] or user.currency
+    rule = RecurringExpense(**values, user_id=user.id, created_at=datetime.now(timezone.utc))
+    rule.next_date = _scheduled(rule, rule.start_date)
+    db.add(rule)
+    db.flush()
+    _materialise(db, [(rule, user.currency)], today or _today())
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+
+def get_recurring_expenses(db: Session, user: User) -> List[RecurringExpense]:
+    return db.query(RecurringExpense).filter(RecurringExpense.user_id == user.id).order_by(RecurringExpense.id).all()
+
+
+def get_recurring_expense(db: Session, rule_id: int, user: User) -> Optional[RecurringExpense]:
+    return (
+        db.query(RecurringExpense)
+        .filter(RecurringExpense.id == rule_id, RecurringExpense.user_id == user.id)
+        .first()
+    )
+
+
+def update_recurring_expense(
+    db: Session,
+    rule_id: int,
+    update_data: RecurringExpenseUpdate,
+    user: User,
+    today: Optional[date] = None
+) -> Optional[RecurringExpense]:
+    """
+    Change what future occurrences look like, or when the rule ends; expenses already created
+    are left as they are. Raises ValueError for a category that is not the user's.
+    """
+    rule = get_recurring_expense(db, rule_id, user)
+    if not rule:
+        return None
+    changes = update_data.dict(exclude_unset=True)
+    if changes.get("category_id") is not None and not _category_owned(db, changes["category_id"], user):
+        raise ValueError("Category not found or not yours")
+    ended = rule.end_date
+    for key, value in changes.items():
+        # Only end_date may be cleared; None elsewhere means "unchanged".
+        if value is not None or key in ("end_date", "description"):
+            setattr(rule, key, value)
+    if rule.end_date is not None and rule.end_date < rule.start_date:
+        raise ValueError("end_date must not be before start_date")
+    if "end_date" in changes:
+        # A rule that had ended resumes after its old end date, never before it.
+        rule.next_date = _scheduled(rule, rule.next_date or ended + timedelta(days=1))
+        _materialise(db, [(rule, user.currency)], today or _today())
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+
+def delete_recurring_expense(db: Session, rule_id: int, user: User) -> bool:
+    """
+    Delete a rule. The expenses it created stay, no longer linked to it.
+    """
+    rule = get_recurring_expense(db, rule_id, user)
+    if not rule:
+        return False
+    _unlink_expenses(db, RecurringExpense.id == rule.id)
+    db.delete(rule)
+    db.commit()
+    return True
+
+
+def delete_category_recurring_expenses(db: Session, user_id: int, category_id: int) -> None:
+    """
+    Remove a category's rules inside the caller's transaction, before the category goes.
+    """
+    rules = (RecurringExpense.user_id == user_id, RecurringExpense.category_id == category_id)
+    _unlink_expenses(db, *rules)
+    db.query(RecurringExpense).filter(*rules).delete(synchronize_session=False)
+
+
+def _unlink_expenses(db: Session, *rules) -> None:
+    # Explicit because SQLite does not enforce ON DELETE SET NULL, and a reused rule id would
+    # otherwise collide with the old rule's occurrences.
+    rule_ids = db.query(RecurringExpense.id).filter(*rules).scalar_subquery()
+    db.query(Expense).filter(Expense.recurring_expense_id.in_(rule_ids)).update(
+        {Expense.recurring_expense_id: None},
+        synchronize_session=False
+    )
+
+
+def materialise_due_occurrences(
+    db: Session,
+    today: Optional[date] = None,
+    batch_size: int = RECURRING_BATCH_SIZE
+) -> int:
+    """
+    Create the expenses of every rule occurrence due by `today`, for all users, committing
+    after each batch of `batch_size` rules. Each batch is a fixed number of bulk statements
+    however many users and occurrences it covers, so catching up after downtime stays cheap.
+    Safe to run concurrently and repeatedly. Returns the number of expenses created.
+    """
+    today = today or _today()
+    created, last_id = 0, 0
+    while True:
+        # SKIP LOCKED lets concurrent runs share the work; the key on (rule, occurrence date)
+        # keeps any overlap from creating duplicates.
+        rules = (
+            db.query(RecurringExpense, User.currency)
+            .join(User, User.id == RecurringExpense.user_id)
+            .filter(RecurringExpense.next_date <= today, RecurringExpense.id > last_id)
+            .order_by(RecurringExpense.id)
+            .limit(batch_size)
+            .with_for_update(of=RecurringExpense, skip_locked=True)
+            .all()
+        )
+        if not rules:
+            return created
+        last_id = rules[-1][0].id
+        created += _materialise(db, rules, today)
+        db.commit()
+
+
+def _materialise(db: Session, rules: list[tuple[RecurringExpense, str]], today: date) -> int:
+    """
+    Insert the due occurrences of `rules`, given with their owner's currency, and advance their
+    next_date, inside the caller's transaction. Returns the number of expenses created.
+    """
+    due = []
+    for rule, user_currency in rules:
+        occurrence = rule.next_date
+        while occurrence is not None and occurrence <= today:
+            try:
+                converted = convert_cents(db, rule.amount_cents, rule.currency, user_currency, occurrence)
+            except MissingRateError as exc:
+                # Left due: the rule catches up on a later run once the rate is loaded.
+                logger.warning("Recurring expense %s waits for an exchange rate: %s", rule.id, exc)
+                break
+            due.append((rule, occurrence, converted))
+            occurrence = _scheduled(rule, occurrence + timedelta(days=1))
+        rule.next_date = occurrence
+    if not due:
+        return 0
+
+    versions = bump_data_versions(db, {rule.user_id for rule, _, _ in due})
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": rule.user_id,
+            "category_id": rule.category_id,
+            "amount_cents": rule.amount_cents,
+            "currency": rule.currency,
+            "converted_cents": converted,
+            "description": rule.description,
+            "date": datetime.combine(occurrence, time.min),
+            "recurring_expense_id": rule.id,
+            "occurrence_date": occurrence,
+            "version": versions[rule.user_id],
+            "updated_at": now,
+        }
+        for rule, occurrence, converted in due
+    ]
+    inserted = set(_insert_occurrences(db, rows))
+
+    entries = defaultdict(list)
+    for rule, occurrence, converted in due:
+        if (rule.id, occurrence) in inserted:
+            entries[rule.user_id].append((rule.category_id, datetime.combine(occurrence, time.min), converted))
+    adjust_total_spent_for_users(
+        db, {user_id: sum(amount for _, _, amount in user_entries) for user_id, user_entries in entries.items()}
+    )
+    deltas = {
+        (user_id, category_id, month): delta
+        for user_id, user_entries in entries.items()
+        for (category_id, month), delta in monthly_deltas(user_entries).items()
+    }
+    record_budget_crossings_for_users(db, deltas, apply_monthly_deltas_for_users(db, deltas))
+    return len(inserted)
+
+
+def _insert_occurrences(
+    db: Session,
+    rows: list[dict],
+    batch_size: int = EXPENSE_BULK_BATCH_SIZE
+) -> list[tuple[int, date]]:
+    """
+    Insert occurrence expense rows, skipping occurrences that already have one. Returns the
+    (recurring_expense_id, occurrence_date) of the rows inserted.
+    """
+    dialect = db.bind.dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        inserted = []
+        for row in rows:
+            exists = db.query(Expense.id).filter(
+                Expense.recurring_expense_id == row["recurring_expense_id"],
+                Expense.occurrence_date == row["occurrence_date"]
+            ).first()
+            if not exists:
+                db.execute(insert(Expense), row)
+                inserted.append((row["recurring_expense_id"], row["occurrence_date"]))
+        return inserted
+
+    dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    statement = (
+        dialect_insert(Expense)
+        .on_conflict_do_nothing(index_elements=["recurring_expense_id", "occurrence_date"])
+        .returning(Expense.recurring_expense_id, Expense.occurrence_date)
+    )
+    inserted = []
+    for offset in range(0, len(rows), batch_size):
+        inserted.extend(tuple(row) for row in db.execute(statement, rows[offset:offset + batch_size]))
+    return inserted
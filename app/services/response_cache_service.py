@@ -0,0 +1,67 @@
+import json
+import threading
+from typing import Any, Awaitable, Callable
+
+from app.cache import CacheBackend, TTLCache
+from app.config import RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """
+    Caches computed read responses per user and query parameters.
+
+    Every key embeds the user's data version, read from the database by the caller. Any committed
+    write bumps it, from whichever process, so older entries become unreachable and age out of
+    the backend.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(
+        self,
+        user_id: int,
+        data_version: int,
+        name: str,
+        params: dict,
+        load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        # The version must be read before loading: if a write commits while we load, the possibly
+        # stale value is stored under the old version, which no later request asks for.
+        params = json.dumps(params, sort_keys=True, default=str)
+        key = f"response:{user_id}:{data_version}:{name}:{params}"
+        value = self.backend.get(key, _MISSING)
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is _MISSING:
+            value = await load()
+            self.backend.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+        return {**self.backend.stats(), **stats}
+
+
+response_cache = ResponseCache(TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL))
+
+
+def configure_response_cache(backend: CacheBackend) -> None:
+    response_cache.backend = backend
+    response_cache.clear()
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Iterable, List, Optional
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+from typing_extensions import TypedDict
+
+
+# Plain-dict mirrors of ExpenseRead and CategoryRead. Dumping dicts through a prebuilt adapter
+# skips constructing a model per row, which costs more than the serialisation itself.
+class CategoryJson(TypedDict):
+    name: str
+    id: int
+
+
+class ExpenseCategoryJson(TypedDict):
+    id: int
+    name: str
+
+
+class ExpenseJson(TypedDict):
+    id: int
+    description: Optional[str]
+    amount: float
+    currency: str
+    date: datetime
+    category: ExpenseCategoryJson
+
+
+class SyncDeletedJson(TypedDict):
+    categories: List[int]
+    expenses: List[int]
+
+
+class SyncJson(TypedDict):
+    token: int
+    categories: List[CategoryJson]
+    expenses: List[ExpenseJson]
+    deleted: SyncDeletedJson
+
+
+_expense = TypeAdapter(ExpenseJson)
+_expense_list = TypeAdapter(List[ExpenseJson])
+_category_list = TypeAdapter(List[CategoryJson])
+_sync = TypeAdapter(SyncJson)
+
+
+def _expense_dict(row: Row) -> ExpenseJson:
+    expense_id, date, amount_cents, currency, description, category_id, category_name = row
+    return {
+        "id": expense_id,
+        "description": description,
+        # The float nearest to the exact amount, which JSON writes as that decimal (like Money).
+        "amount": amount_cents / 100,
+        "currency": currency,
+        "date": date,
+        "category": {"id": category_id, "name": category_name},
+    }
+
+
+def expense_rows_json(rows: Iterable[Row]) -> bytes:
+    """
+    ExpenseRead JSON array for (id, date, amount_cents, currency, description, category_id,
+    category_name) rows.
+    """
+    return _expense_list.dump_json([_expense_dict(row) for row in rows])
+
+
+def expense_row_json(row: Row) -> bytes:
+    return _expense.dump_json(_expense_dict(row))
+
+
+def category_rows_json(rows: Iterable[Row]) -> bytes:
+    """
+    CategoryRead JSON array for (id, name) rows.
+    """
+    return _category_list.dump_json([{"name": name, "id": category_id} for category_id, name in rows])
+
+
+def sync_json(changes: dict) -> bytes:
+    """
+    SyncRead JSON for the result of sync_service.get_changes.
+    """
+    return _sync.dump_json({
+        "token": changes["token"],
+        "categories": [{"name": name, "id": category_id} for category_id, name in changes["categories"]],
+        "expenses": [_expense_dict(row) for row in changes["expenses"]],
+        "deleted": changes["deleted"],
+    })
@@ -1,9 +1,56 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime
+from sqlalchemy import and_, func, or_
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 from typing import Optional
 
 from app.models.expense import Expense
+from app.models.expense_monthly_total import ExpenseMonthlyTotal
+from app.money import from_cents
+from app.schemas.spending_aggregation_schema import SpendingGroupBy
+from app.services.date_bucket import truncate_date
+from app.services.monthly_total_service import month_start, next_month
+
+_PERIODS = {
+    SpendingGroupBy.day: "day",
+    SpendingGroupBy.week: "week",
+    SpendingGroupBy.month: "month",
+    SpendingGroupBy.category_month: "month",
+}
+_CATEGORY_GROUPINGS = (SpendingGroupBy.category, SpendingGroupBy.category_month)
+_ROLLUP_GROUPINGS = (SpendingGroupBy.category, SpendingGroupBy.month, SpendingGroupBy.category_month)
+
+
+def _first_full_month(start_date: Optional[datetime]) -> Optional[date]:
+    if start_date is None:
+        return None
+    month = month_start(start_date)
+    if start_date == datetime.combine(month, time.min, tzinfo=start_date.tzinfo):
+        return month
+    return next_month(month)
+
+
+def _end_of_full_months(end_date: Optional[datetime]) -> Optional[date]:
+    """
+    First month, exclusive, after the last month that ends on or before the inclusive end_date.
+    """
+    if end_date is None:
+        return None
+    month = month_start(end_date)
+    following = next_month(month)
+    if end_date + timedelta(microseconds=1) >= datetime.combine(following, time.min, tzinfo=end_date.tzinfo):
+        return following
+    return month
+
+
+def _raw_total(db: Session, user_id: int, category_id: Optional[int], *conditions) -> int:
+    query = (
+        db.query(func.sum(Expense.converted_cents))
+        .filter(Expense.user_id == user_id, *conditions)
+    )
+    if category_id:
+        query = query.filter(Expense.category_id == category_id)
+    return int(query.scalar() or 0)
 
 
 def get_total_spending(
@@ -12,16 +59,93 @@ def get_total_spending(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     category_id: Optional[int] = None,
-) -> float:
-    query = db.query(func.sum(Expense.amount)).filter(Expense.user_id == user_id)
-    
-    if start_date:
-        query = query.filter(Expense.date >= start_date)
-    if end_date:
-        query = query.filter(Expense.date <= end_date)
+) -> Decimal:
+    """
+    Whole calendar months inside the range are read from the monthly rollup table;
+    only the partial months at either edge are summed from raw expense rows. Amounts are
+    in the user's currency.
+    """
+    first_month = _first_full_month(start_date)
+    end_month = _end_of_full_months(end_date)
+
+    if first_month and end_month and first_month >= end_month:
+        conditions = [Expense.date >= start_date, Expense.date <= end_date]
+        return from_cents(_raw_total(db, user_id, category_id, *conditions))
+
+    query = db.query(func.sum(ExpenseMonthlyTotal.total_cents)).filter(ExpenseMonthlyTotal.user_id == user_id)
+    if first_month:
+        query = query.filter(ExpenseMonthlyTotal.month >= first_month)
+    if end_month:
+        query = query.filter(ExpenseMonthlyTotal.month < end_month)
     if category_id:
-        query = query.filter(Expense.category_id == category_id)
-        
-    total = query.scalar()
-    
-    return total or 0.0
+        query = query.filter(ExpenseMonthlyTotal.category_id == category_id)
+    total = int(query.scalar() or 0)
+
+    edges = []
+    if start_date and first_month > start_date.date():
+        edges.append(and_(
+            Expense.date >= start_date,
+            Expense.date < datetime.combine(first_month, time.min, tzinfo=start_date.tzinfo)
+        ))
+    if end_date and datetime.combine(end_month, time.min, tzinfo=end_date.tzinfo) <= end_date:
+        edges.append(and_(
+            Expense.date >= datetime.combine(end_month, time.min, tzinfo=end_date.tzinfo),
+            Expense.date <= end_date
+        ))
+    if edges:
+        total += _raw_total(db, user_id, category_id, or_(*edges))
+
+    return from_cents(total)
+
+
+def _covers_whole_months(start_date: Optional[datetime], end_date: Optional[datetime]) -> bool:
+    starts_on_month = start_date is None or _first_full_month(start_date) == month_start(start_date)
+    ends_on_month = end_date is None or _end_of_full_months(end_date) != month_start(end_date)
+    return starts_on_month and ends_on_month
+
+
+def get_spending_breakdown(
+    db: Session,
+    user_id: int,
+    group_by: SpendingGroupBy,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category_id: Optional[int] = None,
+) -> list[dict]:
+    """
+    Spending totals per bucket in the user's currency, all computed by a single GROUP BY query.
+    Ranges made of whole months are grouped from the monthly rollup, anything else from raw
+    expense rows.
+    """
+    if group_by in _ROLLUP_GROUPINGS and _covers_whole_months(start_date, end_date):
+        model, amount, period = ExpenseMonthlyTotal, ExpenseMonthlyTotal.total_cents, ExpenseMonthlyTotal.month
+        conditions = [ExpenseMonthlyTotal.user_id == user_id]
+        if start_date:
+            conditions.append(ExpenseMonthlyTotal.month >= month_start(start_date))
+        if end_date:
+            conditions.append(ExpenseMonthlyTotal.month <= month_start(end_date))
+    else:
+        model, amount = Expense, Expense.converted_cents
+        period = truncate_date(db, _PERIODS[group_by], Expense.date) if group_by in _PERIODS else None
+        conditions = [Expense.user_id == user_id]
+        if start_date:
+            conditions.append(Expense.date >= start_date)
+        if end_date:
+            conditions.append(Expense.date <= end_date)
+    if category_id:
+        conditions.append(model.category_id == category_id)
+
+    keys = []
+    if group_by in _CATEGORY_GROUPINGS:
+        keys.append(model.category_id.label("category_id"))
+    if group_by in _PERIODS:
+        keys.append(period.label("period"))
+
+    rows = (
+        db.query(*keys, func.sum(amount).label("total"))
+        .filter(*conditions)
+        .group_by(*keys)
+        .order_by(*keys)
+        .all()
+    )
+    return [{**row._asdict(), "total": from_cents(row.total)} for row in rows]
@@ -0,0 +1,220 @@
+import csv
+import re
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+from sqlalchemy.orm import Session
+
+from app.config import EXPENSE_BULK_BATCH_SIZE
+from app.models.category import Category
+from app.models.user import User
+from app.money import to_cents
+from app.schemas.statement_import_schema import (
+    DebitSign,
+    StatementFormat,
+    StatementImportError,
+    StatementImportResult,
+)
+from app.services.expense_service import insert_expense_rows
+from app.services.sync_service import change_stamp
+
+MAX_REPORTED_ERRORS = 100
+OFX_CHUNK_SIZE = 64 * 1024
+
+# A parsed statement line: (line number, fields), (line number, error message), or
+# (line number, None) for a credit, which is not spending and is skipped.
+ParsedRow = tuple[int, dict | str | None]
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def _parse_amount(value: str) -> Decimal:
+    value = value.strip().replace(" ", "")
+    # Whichever separator comes last is the decimal one: "1,234.56", "1.234,56" and "12,50" all work.
+    if value.rfind(",") > value.rfind("."):
+        value = value.replace(".", "").replace(",", ".")
+    else:
+        value = value.replace(",", "")
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"invalid amount: {value!r}") from None
+    if amount == 0:
+        raise ValueError("amount must not be zero")
+    to_cents(amount)
+    return amount
+
+
+def _parse_date(value: str, date_format: Optional[str]) -> datetime:
+    value = value.strip()
+    if date_format:
+        return datetime.strptime(value, date_format)
+    return datetime.fromisoformat(value)
+
+
+def parse_csv(
+    lines: Iterable[str],
+    date_column: str = "date",
+    amount_column: str = "amount",
+    description_column: str = "description",
+    category_column: str = "category",
+    date_format: Optional[str] = None,
+    debit_sign: DebitSign = DebitSign.negative
+) -> Iterator[ParsedRow]:
+    """
+    Parse a CSV statement with a header row one line at a time. Debits are negative amounts, or
+    positive ones with `debit_sign=positive`; they import as positive expenses and credits are
+    skipped.
+    """
+    reader = csv.DictReader(lines)
+    for record in reader:
+        line = reader.line_num
+        try:
+            amount = _parse_amount(record.get(amount_column) or "")
+            if debit_sign == DebitSign.negative:
+                amount = -amount
+            if amount < 0:
+                yield line, None
+                continue
+            date_value = (record.get(date_column) or "").strip()
+            yield line, {
+                "amount": amount,
+                "date": _parse_date(date_value, date_format) if date_value else None,
+                "description": (record.get(description_column) or "").strip() or None,
+                "category": (record.get(category_column) or "").strip() or None,
+            }
+        except ValueError as exc:
+            yield line, str(exc)
+
+
+def _ofx_date(value: str) -> datetime:
+    digits = re.match(r"\d{8}(\d{6})?", value.strip())
+    if not digits:
+        raise ValueError(f"invalid OFX date: {value!r}")
+    text = digits.group(0)
+    return datetime.strptime(text, "%Y%m%d%H%M%S" if len(text) == 14 else "%Y%m%d")
+
+
+def _ofx_tokens(stream: TextIO) -> Iterator[tuple[bool, str, str]]:
+    """
+    Yield (is_closing, tag, text) for every tag of an OFX (SGML or XML) document, reading fixed-size
+    chunks so a statement written on a single line is never held in memory whole.
+    """
+    buffer = ""
+    while True:
+        chunk = stream.read(OFX_CHUNK_SIZE)
+        buffer += chunk
+        # Until the input ends, the text after the last "<" may be an incomplete tag; keep it for the next read.
+        limit = buffer.rfind("<") if chunk else len(buffer)
+        if limit < 0:
+            buffer = ""
+            continue
+        consumed = 0
+        for match in _OFX_TAG.finditer(buffer, 0, limit):
+            yield match.group(1) == "/", match.group(2).upper(), match.group(3).strip()
+            consumed = match.end()
+        buffer = buffer[consumed:]
+        if not chunk:
+            return
+
+
+def parse_ofx(stream: TextIO) -> Iterator[ParsedRow]:
+    """
+    Parse the <STMTTRN> transactions of an OFX statement. Only debits (negative TRNAMT) are
+    spending; credits are skipped. Rows are numbered by transaction.
+    """
+    number = 0
+    transaction = None
+    for closing, tag, text in _ofx_tokens(stream):
+        if tag == "STMTTRN":
+            if not closing:
+                transaction = {}
+                continue
+            if transaction is None:
+                continue
+            number += 1
+            fields, transaction = transaction, None
+            try:
+                amount = -_parse_amount(fields["TRNAMT"])
+                if amount < 0:
+                    yield number, None
+                    continue
+                yield number, {
+                    "amount": amount,
+                    "date": _ofx_date(fields["DTPOSTED"]) if fields.get("DTPOSTED") else None,
+                    "description": fields.get("NAME") or fields.get("MEMO") or None,
+                    "category": None,
+                }
+            except (KeyError, ValueError) as exc:
+                yield number, f"invalid transaction: {exc}"
+        elif transaction is not None and not closing and text:
+            transaction[tag] = text
+
+
+def import_statement(
+    db: Session,
+    user: User,
+    stream: TextIO,
+    statement_format: StatementFormat = StatementFormat.csv,
+    default_category: str = "Imported",
+    batch_size: int = EXPENSE_BULK_BATCH_SIZE,
+    on_progress: Optional[Callable[[StatementImportResult], None]] = None,
+    **csv_options
+) -> StatementImportResult:
+    """
+    Import a bank statement as expenses of `user`, committing every `batch_size` rows so memory
+    and transaction size are bounded by the batch, not the file. Categories are matched by name
+    and created on first use. `on_progress` is called after each committed batch.
+    """
+    if statement_format == StatementFormat.ofx:
+        parsed = parse_ofx(stream)
+    else:
+        parsed = parse_csv(stream, **csv_options)
+
+    result = StatementImportResult()
+    categories = {
+        name: category_id for category_id, name in
+        db.query(Category.id, Category.name).filter(Category.user_id == user.id)
+    }
+    now = datetime.now(timezone.utc)
+    batch = []
+
+    def flush() -> None:
+        insert_expense_rows(db, user, batch, batch_size)
+        db.commit()
+        result.imported += len(batch)
+        batch.clear()
+        if on_progress:
+            on_progress(result)
+
+    for line, row in parsed:
+        result.rows_read += 1
+        if row is None:
+            result.skipped += 1
+            continue
+        if isinstance(row, str):
+            result.failed += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                result.errors.append(StatementImportError(line=line, detail=row))
+            continue
+
+        name = row["category"] or default_category
+        if name not in categories:
+            category = Category(name=name, user_id=user.id, **change_stamp(db, user.id))
+            db.add(category)
+            db.flush()
+            categories[name] = category.id
+            result.categories_created += 1
+
+        batch.append({
+            "category_id": categories[name],
+            "date": row["date"] or now,
+            "amount_cents": to_cents(row["amount"]),
+            "currency": user.currency,
+            "description": row["description"],
+        })
+        if len(batch) >= batch_size:
+            flush()
+
+    flush()
+    return result
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from typing import Iterable
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.tombstone import Tombstone
+from app.models.user import User
+from app.services.data_version_service import bump_data_version, get_data_version
+
+CATEGORY = "category"
+EXPENSE = "expense"
+
+
+def change_stamp(db: Session, user_id: int) -> dict:
+    """
+    Bump the user's data version and return the `version` and `updated_at` values to write on
+    every category or expense the caller creates, updates or deletes in the same transaction.
+    """
+    return {"version": bump_data_version(db, user_id), "updated_at": datetime.now(timezone.utc)}
+
+
+def record_deletions(db: Session, user_id: int, entity: str, ids: Iterable[int], stamp: dict) -> None:
+    rows = [
+        {"user_id": user_id, "entity": entity, "entity_id": entity_id,
+         "version": stamp["version"], "deleted_at": stamp["updated_at"]}
+        for entity_id in ids
+    ]
+    if rows:
+        db.execute(insert(Tombstone), rows)
+
+
+def get_changes(db: Session, user: User, since: int = 0) -> dict:
+    """
+    Categories and expenses written, and ids deleted, after version `since`, with the token to
+    pass as `since` next time. `since=0` returns everything the user has and no deletions.
+    Raises ValueError for a token the user's data has not reached.
+    """
+    # Everything stamped up to the token has committed (each write holds the user row until it
+    # does), so bounding every query by it keeps later writes for the next sync.
+    token, _ = get_data_version(db, user)
+    if since > token:
+        raise ValueError("Sync token is ahead of the server's data")
+
+    def changed(model) -> list:
+        criteria = [model.user_id == user.id, model.version <= token]
+        if since:
+            criteria.append(model.version > since)
+        return criteria
+
+    categories = db.query(Category.id, Category.name).filter(*changed(Category)).order_by(Category.id).all()
+    expenses = (
+        db.query(
+            Expense.id,
+            Expense.date,
+            Expense.amount_cents,
+            Expense.currency,
+            Expense.description,
+            Expense.category_id,
+            Category.name.label("category_name")
+        )
+        .join(Category, Category.id == Expense.category_id)
+        .filter(*changed(Expense))
+        .order_by(Expense.id)
+        .all()
+    )
+    deleted = {CATEGORY: set(), EXPENSE: set()}
+    if since:
+        for entity, entity_id in db.query(Tombstone.entity, Tombstone.entity_id).filter(*changed(Tombstone)):
+            deleted[entity].add(entity_id)
+
+    return {
+        "token": token,
+        "categories": categories,
+        "expenses": expenses,
+        "deleted": {"categories": sorted(deleted[CATEGORY]), "expenses": sorted(deleted[EXPENSE])},
+    }
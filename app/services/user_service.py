@@ -1,10 +1,18 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
 
+from app.cache import TTLCache
+from app.config import DEFAULT_CURRENCY, USER_CACHE_SIZE, USER_CACHE_TTL
 from app.models.user import User
 from app.schemas.user_schema import UserCreate
 from app.services.password_service import get_password_hash
 
 
+# Users resolved from access tokens, keyed by email (the token subject).
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+_CHANGED_EMAILS = "user_cache_changed_emails"
+
+
 def get_users(db: Session):
     return db.query(User).all()
 
@@ -17,11 +25,12 @@ def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
 
-def create_user(db: Session, user: UserCreate):
+def create_user(db: Session, user: UserCreate, hashed_password: str | None = None):
     db_user = User(
         email=str(user.email),
         username=user.username,
-        password=get_password_hash(user.password)
+        password=hashed_password or get_password_hash(user.password),
+        currency=user.currency or DEFAULT_CURRENCY
     )
     db.add(db_user)
     db.commit()
@@ -34,4 +43,21 @@ def delete_user(db: Session, user_id: int):
     if db_user:
         db.delete(db_user)
         db.commit()
-    return
\ No newline at end of file
+        user_cache.delete(db_user.email)
+    return
+
+
+@event.listens_for(User, "after_update")
+def _mark_updated_user(mapper, connection, target: User) -> None:
+    # Evicting at flush time would let a concurrent request reload and re-cache the old
+    # committed row, so remember the emails and evict once the transaction commits. Both the
+    # old and the new email are dropped in case the email itself changed.
+    session = object_session(target)
+    emails = session.info.setdefault(_CHANGED_EMAILS, set())
+    emails.update((*inspect(target).attrs.email.history.deleted, target.email))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for email in session.info.pop(_CHANGED_EMAILS, ()):
+        user_cache.delete(email)
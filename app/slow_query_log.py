@@ -0,0 +1,195 @@
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from typing import Any, Optional
+from sqlalchemy import event
+
+from app.instrumentation import current_request
+
+logger = logging.getLogger(__name__)
+
+# Bounds how long a background EXPLAIN ANALYZE may run; it executes the statement again.
+EXPLAIN_TIMEOUT_MS = 30000
+EXPLAIN_STATEMENT_NAME = "slow_query_explain"
+
+# Parameters holding money: integers too, since amounts are stored as cents.
+_MONEY_PARAMETER = re.compile(r"amount|cents|total|balance", re.IGNORECASE)
+
+# A literal "%" or a pyformat/format placeholder of the PostgreSQL drivers.
+_PLACEHOLDER = re.compile(r"%%|%\((\w+)\)s|%s")
+
+
+def redact_parameters(parameters: Any, name: Optional[str] = None) -> Any:
+    """
+    Keep ids, limits and flags so the filter combination and user stay visible; replace every
+    other value (amounts, dates, text) with its type name. Integers are money when their
+    parameter is named like an amount, so those are replaced too.
+    """
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value, key) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return type(parameters)(redact_parameters(value, name) for value in parameters)
+    if parameters is None or isinstance(parameters, bool):
+        return parameters
+    if isinstance(parameters, int) and not (name and _MONEY_PARAMETER.search(name)):
+        return parameters
+    return f"<{type(parameters).__name__}>"
+
+
+class SlowQueryLog:
+    """
+    Logs statements slower than `threshold_ms`, sampled at `sample_rate`. When `explain_engine`
+    is a PostgreSQL engine, sampled slow SELECTs from connections using the same driver are
+    EXPLAIN (ANALYZE, BUFFERS)ed on a background thread; plans beyond `queue_size` are dropped
+    rather than delaying requests.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        sample_rate: float = 1.0,
+        explain_engine=None,
+        queue_size: int = 16
+    ):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.explain_engine = explain_engine if _explainable(explain_engine) else None
+        self.explains_dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def listen(self, engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def _handle_error(self, exception_context):
+        started = exception_context.connection.info.get("slow_query_started") if exception_context.connection else None
+        if started:
+            started.pop()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["slow_query_started"].pop()
+        if context is not None and not context.execution_options.get("slow_query_log", True):
+            return
+        if duration < self.threshold or random.random() >= self.sample_rate:
+            return
+
+        metrics = current_request.get()
+        route = metrics.route if metrics is not None else None
+        # Compiled statements keep their parameters by name, even for positional drivers like SQLite.
+        logged = parameters
+        named = context.compiled_parameters if context is not None and context.compiled is not None else None
+        if named:
+            logged = named if executemany else named[0]
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s | parameters: %s",
+            duration * 1000, route or "-", statement, redact_parameters(logged)
+        )
+        if self._should_explain(conn, statement, executemany):
+            self._enqueue_explain(route, statement, parameters)
+
+    def _should_explain(self, conn, statement: str, executemany: bool) -> bool:
+        if self.explain_engine is None or executemany:
+            return False
+        # The plan is captured on explain_engine, so the statement must be in its driver's paramstyle.
+        if conn.dialect.driver != self.explain_engine.dialect.driver:
+            return False
+        return statement.lstrip().upper().startswith("SELECT")
+
+    def _enqueue_explain(self, route: Optional[str], statement: str, parameters: Any) -> None:
+        try:
+            self._queue.put_nowait((route, statement, parameters))
+        except queue.Full:
+            with self._lock:
+                self.explains_dropped += 1
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_explains, name="slow-query-explain", daemon=True)
+                self._worker.start()
+
+    def _run_explains(self) -> None:
+        while True:
+            route, statement, parameters = self._queue.get()
+            try:
+                plan = self.explain(statement, parameters)
+                logger.warning("Plan of slow query on %s: %s\n%s", route or "-", statement, plan)
+            except Exception as exc:
+                # Not logger.exception: database errors quote the statement's parameters.
+                logger.warning("Could not EXPLAIN slow query: %s (%s)", statement, type(exc).__name__)
+            finally:
+                self._queue.task_done()
+
+    def explain(self, statement: str, parameters: Any) -> str:
+        # The drivers bind parameters client-side, so EXPLAIN of the statement itself would print
+        # amounts, dates and search terms in the plan. A prepared statement with a forced generic
+        # plan shows $1, $2, ... instead, while ANALYZE still runs it with the real values.
+        prepared, values = numbered_placeholders(statement, parameters)
+        arguments = f" ({', '.join(['%s'] * len(values))})" if values else ""
+        with self.explain_engine.connect() as conn:
+            options = {"slow_query_log": False}
+            try:
+                # A read-only transaction that is rolled back keeps the re-execution free of side
+                # effects (SELECT ... FOR UPDATE is refused instead of taking locks).
+                conn.exec_driver_sql("SET TRANSACTION READ ONLY", execution_options=options)
+                conn.exec_driver_sql(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}", execution_options=options)
+                conn.exec_driver_sql("SET LOCAL plan_cache_mode = force_generic_plan", execution_options=options)
+                conn.exec_driver_sql(f"PREPARE {EXPLAIN_STATEMENT_NAME} AS {prepared}", execution_options=options)
+                rows = conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS) EXECUTE {EXPLAIN_STATEMENT_NAME}{arguments}",
+                    values or None,
+                    execution_options=options
+                ).all()
+            finally:
+                # Prepared statements outlive the transaction; drop it before the connection is pooled again.
+                conn.rollback()
+                conn.exec_driver_sql("DEALLOCATE ALL", execution_options=options)
+                conn.commit()
+        return "\n".join(row[0] for row in rows)
+
+
+def numbered_placeholders(statement: str, parameters: Any) -> tuple[str, tuple]:
+    """
+    Rewrite a driver-paramstyle statement with $1, $2, ... placeholders, as PREPARE expects, and
+    return it with the parameter values in that order.
+    """
+    values, numbers, positional = [], {}, iter(parameters or ())
+
+    def replace(match: re.Match) -> str:
+        if match.group(0) == "%%":
+            return "%"
+        name = match.group(1)
+        if name is None:
+            values.append(next(positional))
+            return f"${len(values)}"
+        if name not in numbers:
+            values.append(parameters[name])
+            numbers[name] = len(values)
+        return f"${numbers[name]}"
+
+    return _PLACEHOLDER.sub(replace, statement), tuple(values)
+
+
+def _explainable(engine) -> bool:
+    return engine is not None and engine.dialect.name == "postgresql"
+
+
+def enable_slow_query_log(
+    engines: list,
+    threshold_ms: float,
+    sample_rate: float = 1.0,
+    explain_engine=None,
+    queue_size: int = 16
+) -> SlowQueryLog:
+    slow_query_log = SlowQueryLog(threshold_ms, sample_rate, explain_engine, queue_size)
+    for engine in engines:
+        slow_query_log.listen(engine)
+    return slow_query_log
@@ -0,0 +1,101 @@
+"""
+Latency of get_total_spending for one user with a large history, comparing the
+monthly-rollup path against a plain SUM over raw expense rows.
+
+    python benchmarks/bench_aggregate.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, func, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.models.category import Category  # noqa: E402
+from app.models.expense import Expense  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.monthly_total_service import rebuild_monthly_totals  # noqa: E402
+from app.services.spending_aggregation_service import get_total_spending  # noqa: E402
+from benchmarks.seed import create_tables  # noqa: E402
+
+HISTORY_START = datetime(2015, 1, 1)
+HISTORY_DAYS = 10 * 365
+
+
+def seed(db: Session, rows: int, categories: int = 20, batch_size: int = 50_000) -> int:
+    user = User(email="bench@example.com", username="bench", password="x")
+    db.add(user)
+    db.flush()
+    category_ids = []
+    for i in range(categories):
+        category = Category(name=f"Category {i}", user_id=user.id)
+        db.add(category)
+        db.flush()
+        category_ids.append(category.id)
+
+    rng = random.Random(42)
+    for offset in range(0, rows, batch_size):
+        batch = []
+        for _ in range(min(batch_size, rows - offset)):
+            amount_cents = rng.randint(100, 20000)
+            batch.append({
+                "amount_cents": amount_cents,
+                "converted_cents": amount_cents,
+                "category_id": rng.choice(category_ids),
+                "user_id": user.id,
+                "date": HISTORY_START + timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400)),
+            })
+        db.execute(insert(Expense), batch)
+    db.commit()
+    rebuild_monthly_totals(db, user.id)
+    return user.id
+
+
+def raw_total(db: Session, user_id: int, start: datetime, end: datetime) -> int:
+    return db.query(func.sum(Expense.amount_cents)).filter(
+        Expense.user_id == user_id, Expense.date >= start, Expense.date <= end
+    ).scalar() or 0
+
+
+def measure(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        create_tables(engine)
+        with Session(engine) as db:
+            started = time.perf_counter()
+            user_id = seed(db, args.rows)
+            print(f"seeded {args.rows} expenses in {time.perf_counter() - started:.1f}s")
+
+            print(f"{'range (days)':>12} {'rollup ms':>10} {'raw ms':>10}")
+            for days in (30, 90, 365, 3 * 365, HISTORY_DAYS):
+                start = HISTORY_START + timedelta(days=10, hours=5)
+                end = start + timedelta(days=days)
+                rollup_ms = measure(lambda: get_total_spending(db, user_id, start, end), args.repeat)
+                raw_ms = measure(lambda: raw_total(db, user_id, start, end), args.repeat)
+                print(f"{days:>12} {rollup_ms:>10.2f} {raw_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
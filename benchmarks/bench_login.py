@@ -0,0 +1,90 @@
+"""
+Login burst against the in-process app: login throughput for increasing bcrypt pool
+sizes, and the latency of an authenticated endpoint polled during the burst.
+
+    python benchmarks/bench_login.py --logins 64
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp.name}/bench.db")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+import httpx  # noqa: E402
+
+from app.services.password_service import configure_password_pool  # noqa: E402
+from main import app  # noqa: E402
+
+CREDENTIALS = {"username": "bench@example.com", "password": "benchmark-password"}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def ping(client: httpx.AsyncClient, headers: dict, stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/api/users/me", headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def burst(client: httpx.AsyncClient, headers: dict, logins: int, workers: int) -> dict:
+    configure_password_pool(workers=workers, max_queue=logins)
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    pinger = asyncio.create_task(ping(client, headers, stop, latencies))
+
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(client.post("/api/auth/token", data=CREDENTIALS) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await pinger
+
+    return {
+        "workers": workers,
+        "logins_per_second": sum(r.status_code == 200 for r in responses) / elapsed,
+        "rejected": sum(r.status_code == 503 for r in responses),
+        "ping_p50_ms": statistics.median(latencies),
+        "ping_p99_ms": percentile(latencies, 99),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/users/", json={
+            "username": "bench", "email": CREDENTIALS["username"], "password": CREDENTIALS["password"]
+        })
+        token = (await client.post("/api/auth/token", data=CREDENTIALS)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        print(f"{'workers':>7} {'logins/s':>9} {'rejected':>8} {'ping p50 ms':>11} {'ping p99 ms':>11}")
+        workers = 1
+        while True:
+            result = await burst(client, headers, args.logins, workers)
+            print(
+                f"{result['workers']:>7} {result['logins_per_second']:>9.1f} {result['rejected']:>8} "
+                f"{result['ping_p50_ms']:>11.2f} {result['ping_p99_ms']:>11.2f}"
+            )
+            if workers >= args.max_workers:
+                break
+            workers = min(workers * 2, args.max_workers)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
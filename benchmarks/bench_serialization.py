@@ -0,0 +1,76 @@
+"""
+Time to build the JSON body of one expense list page: ORM objects validated through the
+response model (the previous path) against column rows dumped with a prebuilt TypeAdapter.
+
+    python benchmarks/bench_serialization.py --rows 20000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.models.user import User  # noqa: E402
+from app.schemas.expense_schema import ExpenseRead  # noqa: E402
+from app.services.expense_service import MAX_PAGE_SIZE, get_expense_page, get_expense_row_page  # noqa: E402
+from app.services.serialization_service import expense_rows_json  # noqa: E402
+from benchmarks.seed import create_tables, seed  # noqa: E402
+
+
+RESPONSE_MODEL = TypeAdapter(List[ExpenseRead])
+
+
+def orm_page(db: Session, user: User, limit: int) -> bytes:
+    # FastAPI's response_model path: validate from attributes, dump to Python, then json.dumps.
+    expenses, _ = get_expense_page(db, user, limit=limit)
+    content = RESPONSE_MODEL.dump_python(RESPONSE_MODEL.validate_python(expenses, from_attributes=True), mode="json")
+    db.expunge_all()
+    return json.dumps(content).encode("utf-8")
+
+
+def row_page(db: Session, user: User, limit: int) -> bytes:
+    rows, _ = get_expense_row_page(db, user, limit=limit)
+    return expense_rows_json(rows)
+
+
+def measure(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        create_tables(engine)
+        with Session(engine) as db:
+            seed(db, users=1, rows=args.rows)
+            user = db.query(User).one()
+
+            print(f"{'page size':>9} {'orm ms':>8} {'rows ms':>8} {'speedup':>8}")
+            for limit in (100, 500, MAX_PAGE_SIZE):
+                orm_ms = measure(lambda: orm_page(db, user, limit), args.repeat)
+                row_ms = measure(lambda: row_page(db, user, limit), args.repeat)
+                print(f"{limit:>9} {orm_ms:>8.2f} {row_ms:>8.2f} {orm_ms / row_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
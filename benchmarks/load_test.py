@@ -0,0 +1,270 @@
+"""
+Load test of the API: seeds synthetic data, drives the main endpoints with concurrent
+clients and reports latency percentiles and throughput per scenario as JSON.
+
+By default the app runs in-process on a temporary SQLite database. Point --base-url at a
+running server (and --database-url at its database, unless it is already seeded with
+--skip-seed) to measure a real deployment.
+
+    python benchmarks/load_test.py --rows 100000 --output baseline.json
+    python benchmarks/load_test.py --rows 100000 --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from benchmarks.seed import BENCH_PASSWORD, HISTORY_DAYS, HISTORY_START, bench_email  # noqa: E402
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def random_range(rng: random.Random) -> tuple[str, str]:
+    start = HISTORY_START + timedelta(days=rng.randrange(HISTORY_DAYS - 90))
+    end = start + timedelta(days=rng.choice((7, 30, 90)))
+    return start.isoformat(), end.isoformat()
+
+
+class Client:
+    """
+    A seeded user as seen by one simulated client.
+    """
+
+    def __init__(self, email: str, headers: dict, category_ids: list[int]):
+        self.email = email
+        self.headers = headers
+        self.category_ids = category_ids
+
+
+async def login(http: httpx.AsyncClient, client: Client, rng: random.Random) -> httpx.Response:
+    return await http.post("/api/auth/token", data={"username": client.email, "password": BENCH_PASSWORD})
+
+
+async def list_expenses(http: httpx.AsyncClient, client: Client, rng: random.Random) -> httpx.Response:
+    return await http.get("/api/expenses/", params={"limit": 100}, headers=client.headers)
+
+
+async def filter_expenses(http: httpx.AsyncClient, client: Client, rng: random.Random) -> httpx.Response:
+    start, end = random_range(rng)
+    params = {"start_date": start, "end_date": end, "category_id": rng.choice(client.category_ids), "min_amount": 20}
+    return await http.get("/api/expenses/", params=params, headers=client.headers)
+
+
+async def aggregate(http: httpx.AsyncClient, client: Client, rng: random.Random) -> httpx.Response:
+    start, end = random_range(rng)
+    return await http.get("/api/aggregate/", params={"start_date": start, "end_date": end}, headers=client.headers)
+
+
+async def aggregate_by_category(http: httpx.AsyncClient, client: Client, rng: random.Random) -> httpx.Response:
+    return await http.get("/api/aggregate/", params={"group_by": "category_month"}, headers=client.headers)
+
+
+async def balance(http: httpx.AsyncClient, client: Client, rng: random.Random) -> httpx.Response:
+    return await http.get("/api/balance/", headers=client.headers)
+
+
+async def bulk_create(http: httpx.AsyncClient, client: Client, rng: random.Random) -> httpx.Response:
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    items = [
+        {
+            "amount": round(rng.uniform(1, 200), 2),
+            "category_id": rng.choice(client.category_ids),
+            "date": (now - timedelta(days=rng.randrange(365))).isoformat(),
+        }
+        for _ in range(100)
+    ]
+    return await http.post("/api/expenses/bulk", json=items, headers=client.headers)
+
+
+SCENARIOS = {
+    "login": login,
+    "list_expenses": list_expenses,
+    "filter_expenses": filter_expenses,
+    "aggregate": aggregate,
+    "aggregate_by_category": aggregate_by_category,
+    "balance": balance,
+    "bulk_create": bulk_create,
+}
+
+
+async def run_scenario(http: httpx.AsyncClient, clients: list[Client], scenario, requests: int, concurrency: int, seed: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker(index: int) -> None:
+        nonlocal remaining, errors
+        rng = random.Random(seed * 1000 + index)
+        client = clients[index % len(clients)]
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await scenario(http, client, rng)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": len(latencies) / elapsed,
+        "mean_ms": sum(latencies) / len(latencies),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def connect_clients(http: httpx.AsyncClient, users: int) -> list[Client]:
+    clients = []
+    for index in range(users):
+        email = bench_email(index)
+        response = await http.post("/api/auth/token", data={"username": email, "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        categories = (await http.get("/api/categories/", headers=headers)).json()
+        clients.append(Client(email, headers, [category["id"] for category in categories]))
+    return clients
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list[str]:
+    """
+    Print per-scenario changes against `baseline` and return the scenarios whose p95 latency
+    rose, or whose throughput fell, by more than `max_regression` percent.
+    """
+    regressions = []
+    print(f"{'scenario':<22} {'p50 ms':>16} {'p95 ms':>16} {'p99 ms':>16} {'req/s':>16}", file=sys.stderr)
+    for name, result in report["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        cells = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "requests_per_second"):
+            change = (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            cells.append(f"{result[key]:>8.1f} {change:>+6.1f}%")
+        print(f"{name:<22} " + " ".join(cells), file=sys.stderr)
+
+        p95_change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        rps_change = (before["requests_per_second"] - result["requests_per_second"]) / before["requests_per_second"] * 100
+        if p95_change > max_regression or rps_change > max_regression:
+            regressions.append(name)
+    return regressions
+
+
+async def run(args) -> dict:
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        from main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://bench"
+
+    if not args.skip_seed:
+        from app.db import SessionLocal, engine
+        from benchmarks.seed import create_tables, seed
+
+        create_tables(engine)
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            seed(db, args.users, args.categories, args.rows, args.seed)
+        print(f"seeded {args.rows} expenses in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=60) as http:
+        clients = await connect_clients(http, args.users)
+        scenarios = {}
+        for name in args.scenarios:
+            requests = args.logins if name == "login" else args.requests
+            scenarios[name] = await run_scenario(http, clients, SCENARIOS[name], requests, args.concurrency, args.seed)
+            print(f"{name}: {json.dumps(scenarios[name])}", file=sys.stderr)
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "target": args.base_url or "in-process",
+        "config": {
+            "users": args.users,
+            "categories": args.categories,
+            "rows": args.rows,
+            "requests": args.requests,
+            "logins": args.logins,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--categories", type=int, default=10, help="categories per user")
+    parser.add_argument("--rows", type=int, default=100_000, help="expenses to seed, 1K to 10M")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--logins", type=int, default=50, help="requests for the bcrypt-bound login scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--database-url", help="database to seed; defaults to a temporary SQLite file")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse data seeded by an earlier run")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=10.0,
+                        help="with --compare, exit 1 when p95 or req/s of a scenario is this many percent worse")
+    args = parser.parse_args()
+    if args.base_url and not (args.database_url or args.skip_seed):
+        parser.error("--base-url needs the server's --database-url to seed, or --skip-seed")
+
+    # app.config reads the environment on import, so configure it before anything imports app.
+    tmp = tempfile.TemporaryDirectory()
+    # Never fall back to DATABASE_URL from the environment: seeding would write into that database.
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp.name}/bench.db"
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(report, json.load(file), args.max_regression)
+        if regressions:
+            print(f"regressions over {args.max_regression}%: {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Seed a database with synthetic users, categories and expenses for benchmarking.
+Every user gets the password BENCH_PASSWORD. The data is deterministic for a given --seed.
+
+    DATABASE_URL=postgresql://... python benchmarks/seed.py --users 100 --rows 10000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_PASSWORD = "benchmark-password"
+HISTORY_START = datetime(2022, 1, 1)
+HISTORY_DAYS = 3 * 365
+
+
+def bench_email(index: int) -> str:
+    return f"bench{index}@example.com"
+
+
+def create_tables(engine) -> None:
+    """
+    Create every table of the app's models, importing them first so they are all registered.
+    """
+    from app.db import Base
+    from app.models import (  # noqa: F401  (register tables)
+        budget,
+        budget_alert,
+        category,
+        exchange_rate,
+        expense,
+        expense_monthly_total,
+        recurring_expense,
+        tombstone,
+        user,
+    )
+
+    Base.metadata.create_all(bind=engine)
+
+
+def seed(
+    db,
+    users: int = 10,
+    categories: int = 10,
+    rows: int = 100_000,
+    seed: int = 42,
+    batch_size: int = 50_000,
+    progress=None
+) -> list[str]:
+    """
+    Insert `users` users with `categories` categories each and `rows` expenses spread evenly over
+    them, then build the running totals and monthly rollups. Returns the users' emails.
+    """
+    from sqlalchemy import insert
+
+    from app.models.category import Category
+    from app.models.expense import Expense
+    from app.models.user import User
+    from app.services.balance_service import reconcile_balances
+    from app.services.monthly_total_service import rebuild_monthly_totals
+    from app.services.password_service import get_password_hash
+
+    rng = random.Random(seed)
+    password = get_password_hash(BENCH_PASSWORD)
+    emails = [bench_email(i) for i in range(users)]
+    user_ids = list(db.scalars(
+        insert(User).returning(User.id, sort_by_parameter_order=True),
+        [{"email": email, "username": f"bench{i}", "password": password} for i, email in enumerate(emails)]
+    ))
+    category_ids = {
+        user_id: list(db.scalars(
+            insert(Category).returning(Category.id, sort_by_parameter_order=True),
+            [{"name": f"Category {i}", "user_id": user_id} for i in range(categories)]
+        ))
+        for user_id in user_ids
+    }
+
+    for offset in range(0, rows, batch_size):
+        batch = []
+        for _ in range(min(batch_size, rows - offset)):
+            user_id = rng.choice(user_ids)
+            amount_cents = rng.randint(100, 20000)
+            # Every expense is in the user's own currency, so nothing needs converting.
+            batch.append({
+                "amount_cents": amount_cents,
+                "converted_cents": amount_cents,
+                "category_id": rng.choice(category_ids[user_id]),
+                "user_id": user_id,
+                "date": HISTORY_START + timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400)),
+                "description": rng.choice(("coffee", "groceries", "fuel", "rent", "cinema", None)),
+            })
+        db.execute(insert(Expense), batch)
+        db.commit()
+        if progress:
+            progress(offset + len(batch))
+
+    rebuild_monthly_totals(db)
+    reconcile_balances(db)
+    return emails
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--categories", type=int, default=10, help="categories per user")
+    parser.add_argument("--rows", type=int, default=100_000, help="expenses in total")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from app.db import SessionLocal, engine
+
+    create_tables(engine)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        seed(
+            db, args.users, args.categories, args.rows, args.seed,
+            progress=lambda done: print(f"{done} expenses", file=sys.stderr)
+        )
+    print(f"seeded {args.users} users and {args.rows} expenses in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
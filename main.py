@@ -1,18 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routes import auth_router, user_router, category_router, expense_router, balance_router, spending_aggregation_router
+from app.routes import auth_router, user_router, category_router, expense_router, recurring_expense_router, balance_router, spending_aggregation_router, budget_router, sync_router, metrics_router
+from app.config import RECURRING_SCHEDULER_INTERVAL
 from app.db import Base, engine
+from app.instrumentation import MetricsMiddleware
+from app.scheduler import start_recurring_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler = start_recurring_scheduler(RECURRING_SCHEDULER_INTERVAL)
+    yield
+    if scheduler is not None:
+        scheduler.cancel()
+
 
 app = FastAPI(
     title="Home Budget API",
     description="A simple REST API for tracking home expenses.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth_router.auth_router, prefix="/api")
 app.include_router(user_router.user_router,  prefix="/api", tags=["Users"])
 app.include_router(category_router.category_router, prefix="/api", tags=["Categories"])
 app.include_router(expense_router.expense_router, prefix="/api", tags=["Expenses"])
+app.include_router(recurring_expense_router.recurring_expense_router, prefix="/api")
 app.include_router(spending_aggregation_router.spending_aggregation_router, prefix="/api")
 app.include_router(balance_router.balance_router, prefix="/api")
+app.include_router(budget_router.budget_router, prefix="/api")
+app.include_router(sync_router.sync_router, prefix="/api")
+app.include_router(metrics_router.metrics_router)
 
 Base.metadata.create_all(bind=engine)
\ No newline at end of file
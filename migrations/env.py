@@ -3,20 +3,12 @@ from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
+from app.config import DATABASE_URL
 from app.db import Base
 from app.models import user
 
 from alembic import context
 
-import os
-from dotenv import load_dotenv
-
-
-load_dotenv()
-
-DATABASE_URL = os.getenv("DATABASE_URL")
-print("DATABASE_URL =", DATABASE_URL)
-
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -0,0 +1,32 @@
+"""Add composite indexes for expense queries
+
+Revision ID: 3f9c2a7d1e84
+Revises: bea59feb9cc8
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1e84'
+down_revision: Union[str, None] = 'bea59feb9cc8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_expenses_user_id_date', 'expenses', ['user_id', 'date'], unique=False)
+    op.create_index('ix_expenses_user_id_category_id_date', 'expenses', ['user_id', 'category_id', 'date'], unique=False)
+    op.create_index('ix_expenses_user_id_id', 'expenses', ['user_id', 'id'], unique=False)
+    op.create_index('ix_categories_user_id_id', 'categories', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_categories_user_id_id', table_name='categories')
+    op.drop_index('ix_expenses_user_id_id', table_name='expenses')
+    op.drop_index('ix_expenses_user_id_category_id_date', table_name='expenses')
+    op.drop_index('ix_expenses_user_id_date', table_name='expenses')
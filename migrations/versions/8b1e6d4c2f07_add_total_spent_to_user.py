@@ -0,0 +1,30 @@
+"""Add total_spent to user
+
+Revision ID: 8b1e6d4c2f07
+Revises: 3f9c2a7d1e84
+Create Date: 2026-10-18 11:04:52.918340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e6d4c2f07'
+down_revision: Union[str, None] = '3f9c2a7d1e84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('total_spent', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE users SET total_spent = COALESCE("
+        "(SELECT SUM(expenses.amount) FROM expenses WHERE expenses.user_id = users.id), 0)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'total_spent')
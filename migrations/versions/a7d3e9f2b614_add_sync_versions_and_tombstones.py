@@ -0,0 +1,48 @@
+"""Add sync versions to categories and expenses, and tombstones
+
+Revision ID: a7d3e9f2b614
+Revises: f1b8d5a3c790
+Create Date: 2026-10-18 20:14:52.731046
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9f2b614'
+down_revision: Union[str, None] = 'f1b8d5a3c790'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows keep version 0, so they reach clients through their first (since=0) sync.
+    for table in ('categories', 'expenses'):
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Users have few categories; ix_categories_user_id_id serves their part of a sync.
+    op.create_index('ix_expenses_user_id_version', 'expenses', ['user_id', 'version'], unique=False)
+
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_user_id_version', 'tombstones', ['user_id', 'version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tombstones_user_id_version', table_name='tombstones')
+    op.drop_table('tombstones')
+    op.drop_index('ix_expenses_user_id_version', table_name='expenses')
+    for table in ('expenses', 'categories'):
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'version')
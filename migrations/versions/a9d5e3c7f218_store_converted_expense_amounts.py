@@ -0,0 +1,42 @@
+"""Store converted expense amounts
+
+Revision ID: a9d5e3c7f218
+Revises: e2b7f4a9c086
+Create Date: 2026-10-19 09:12:47.530614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d5e3c7f218'
+down_revision: Union[str, None] = 'e2b7f4a9c086'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Plain ADD COLUMN with a default rather than batch mode, which would rebuild expenses and
+    # drop its search triggers.
+    op.add_column('expenses', sa.Column('converted_cents', sa.BigInteger(), server_default='0', nullable=False))
+    # Existing rows count at the rate in effect on their date, as the totals were computed so far.
+    op.execute(
+        "UPDATE expenses SET converted_cents = CASE "
+        "WHEN currency = (SELECT users.currency FROM users WHERE users.id = expenses.user_id) THEN amount_cents "
+        "ELSE coalesce(CAST(round(amount_cents * ("
+        "SELECT exchange_rates.rate FROM exchange_rates "
+        "WHERE exchange_rates.base = expenses.currency "
+        "AND exchange_rates.quote = (SELECT users.currency FROM users WHERE users.id = expenses.user_id) "
+        "AND exchange_rates.date <= expenses.date "
+        "ORDER BY exchange_rates.date DESC LIMIT 1"
+        ")) AS BIGINT), 0) END"
+    )
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column('expenses', 'converted_cents', server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column('expenses', 'converted_cents')
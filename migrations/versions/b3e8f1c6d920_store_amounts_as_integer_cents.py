@@ -0,0 +1,50 @@
+"""Store amounts as integer cents
+
+Revision ID: b3e8f1c6d920
+Revises: a7d3e9f2b614
+Create Date: 2026-10-18 21:40:07.518263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8f1c6d920'
+down_revision: Union[str, None] = 'a7d3e9f2b614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, old column, old type, new column)
+COLUMNS = (
+    ('expenses', 'amount', sa.Float(), 'amount_cents'),
+    ('expense_monthly_totals', 'total', sa.Float(), 'total_cents'),
+    ('users', 'total_spent', sa.Numeric(12, 2), 'total_spent_cents'),
+)
+
+
+def _set_not_null(table: str, column: str, type_) -> None:
+    # SQLite cannot change a column's nullability in place; the model supplies values there.
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column(table, column, existing_type=type_, nullable=False)
+
+
+def upgrade() -> None:
+    for table, old, _, new in COLUMNS:
+        server_default = '0' if new == 'total_spent_cents' else None
+        op.add_column(table, sa.Column(new, sa.BigInteger(), server_default=server_default, nullable=True))
+        # Rounding repairs float values like 12.339999 as well as sub-cent drift in float sums.
+        op.execute(f"UPDATE {table} SET {new} = CAST(ROUND({old} * 100) AS BIGINT)")
+        _set_not_null(table, new, sa.BigInteger())
+        op.drop_column(table, old)
+
+
+def downgrade() -> None:
+    for table, old, type_, new in COLUMNS:
+        server_default = '0' if old == 'total_spent' else None
+        op.add_column(table, sa.Column(old, type_, server_default=server_default, nullable=True))
+        op.execute(f"UPDATE {table} SET {old} = {new} / 100.0")
+        _set_not_null(table, old, type_)
+        op.drop_column(table, new)
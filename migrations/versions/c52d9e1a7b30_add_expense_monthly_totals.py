@@ -0,0 +1,49 @@
+"""Add expense_monthly_totals rollup table
+
+Revision ID: c52d9e1a7b30
+Revises: 8b1e6d4c2f07
+Create Date: 2026-10-18 12:21:07.553871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52d9e1a7b30'
+down_revision: Union[str, None] = '8b1e6d4c2f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('expense_monthly_totals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('expense_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'category_id', 'month', name='uq_expense_monthly_totals_user_category_month')
+    )
+    op.create_index('ix_expense_monthly_totals_user_id_month', 'expense_monthly_totals', ['user_id', 'month'], unique=False)
+    if op.get_bind().dialect.name == 'sqlite':
+        month = "date(date, 'start of month')"
+    else:
+        month = "date_trunc('month', date)::date"
+    op.execute(
+        "INSERT INTO expense_monthly_totals (user_id, category_id, month, total, expense_count) "
+        f"SELECT user_id, category_id, {month}, SUM(amount), COUNT(id) "
+        "FROM expenses WHERE user_id IS NOT NULL "
+        f"GROUP BY user_id, category_id, {month}"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_expense_monthly_totals_user_id_month', table_name='expense_monthly_totals')
+    op.drop_table('expense_monthly_totals')
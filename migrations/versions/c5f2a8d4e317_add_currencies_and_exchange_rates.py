@@ -0,0 +1,40 @@
+"""Add currencies and exchange rates
+
+Revision ID: c5f2a8d4e317
+Revises: b3e8f1c6d920
+Create Date: 2026-10-18 23:05:41.206537
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import DEFAULT_CURRENCY
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f2a8d4e317'
+down_revision: Union[str, None] = 'b3e8f1c6d920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing users and expenses are in the deployment's currency.
+    op.add_column('users', sa.Column('currency', sa.String(length=3), server_default=DEFAULT_CURRENCY, nullable=False))
+    op.add_column('expenses', sa.Column('currency', sa.String(length=3), server_default=DEFAULT_CURRENCY, nullable=False))
+    op.create_table(
+        'exchange_rates',
+        sa.Column('base', sa.String(length=3), nullable=False),
+        sa.Column('quote', sa.String(length=3), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('rate', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.PrimaryKeyConstraint('base', 'quote', 'date')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('exchange_rates')
+    op.drop_column('expenses', 'currency')
+    op.drop_column('users', 'currency')
@@ -0,0 +1,68 @@
+"""Add recurring expenses
+
+Revision ID: e2b7f4a9c086
+Revises: d8a4c2f6b153
+Create Date: 2026-10-19 00:41:08.372915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import DEFAULT_CURRENCY
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7f4a9c086'
+down_revision: Union[str, None] = 'd8a4c2f6b153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'recurring_expenses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('amount_cents', sa.BigInteger(), nullable=False),
+        sa.Column('currency', sa.String(length=3), server_default=DEFAULT_CURRENCY, nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('interval_months', sa.Integer(), server_default='1', nullable=False),
+        sa.Column('day_of_month', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('next_date', sa.Date(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_recurring_expenses_user_id_id', 'recurring_expenses', ['user_id', 'id'], unique=False)
+    op.create_index('ix_recurring_expenses_next_date', 'recurring_expenses', ['next_date'], unique=False)
+
+    # Plain ADD COLUMN rather than batch mode, which would rebuild expenses and drop its search
+    # triggers. SQLite cannot add the foreign key that way; the service unlinks expenses itself.
+    op.add_column('expenses', sa.Column('recurring_expense_id', sa.Integer(), nullable=True))
+    op.add_column('expenses', sa.Column('occurrence_date', sa.Date(), nullable=True))
+    if op.get_bind().dialect.name != 'sqlite':
+        op.create_foreign_key(
+            'fk_expenses_recurring_expense_id', 'expenses', 'recurring_expenses',
+            ['recurring_expense_id'], ['id'], ondelete='SET NULL'
+        )
+    op.create_index(
+        'uq_expenses_recurring_expense_id_occurrence_date', 'expenses',
+        ['recurring_expense_id', 'occurrence_date'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_expenses_recurring_expense_id_occurrence_date', table_name='expenses')
+    if op.get_bind().dialect.name != 'sqlite':
+        op.drop_constraint('fk_expenses_recurring_expense_id', 'expenses', type_='foreignkey')
+    op.drop_column('expenses', 'occurrence_date')
+    op.drop_column('expenses', 'recurring_expense_id')
+    op.drop_index('ix_recurring_expenses_next_date', table_name='recurring_expenses')
+    op.drop_index('ix_recurring_expenses_user_id_id', table_name='recurring_expenses')
+    op.drop_table('recurring_expenses')
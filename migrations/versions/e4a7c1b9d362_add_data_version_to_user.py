@@ -0,0 +1,28 @@
+"""Add data_version and data_updated_at to user
+
+Revision ID: e4a7c1b9d362
+Revises: c52d9e1a7b30
+Create Date: 2026-10-18 14:02:36.184529
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c1b9d362'
+down_revision: Union[str, None] = 'c52d9e1a7b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('data_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_updated_at')
+    op.drop_column('users', 'data_version')
@@ -0,0 +1,60 @@
+"""Add full-text search over expense descriptions
+
+Revision ID: f1b8d5a3c790
+Revises: e4a7c1b9d362
+Create Date: 2026-10-18 18:32:11.402957
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b8d5a3c790'
+down_revision: Union[str, None] = 'e4a7c1b9d362'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # The generated column fills itself for existing rows.
+        op.execute(
+            "ALTER TABLE expenses ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, ''))) STORED"
+        )
+        op.execute("CREATE INDEX ix_expenses_search_vector ON expenses USING gin (search_vector)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE expenses_fts USING fts5("
+            "description, content='expenses', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "CREATE TRIGGER expenses_fts_insert AFTER INSERT ON expenses BEGIN "
+            "INSERT INTO expenses_fts(rowid, description) VALUES (new.id, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER expenses_fts_delete AFTER DELETE ON expenses BEGIN "
+            "INSERT INTO expenses_fts(expenses_fts, rowid, description) VALUES ('delete', old.id, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER expenses_fts_update AFTER UPDATE OF description ON expenses BEGIN "
+            "INSERT INTO expenses_fts(expenses_fts, rowid, description) VALUES ('delete', old.id, old.description); "
+            "INSERT INTO expenses_fts(rowid, description) VALUES (new.id, new.description); END"
+        )
+        op.execute("INSERT INTO expenses_fts(expenses_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_expenses_search_vector', table_name='expenses')
+        op.drop_column('expenses', 'search_vector')
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER expenses_fts_update")
+        op.execute("DROP TRIGGER expenses_fts_delete")
+        op.execute("DROP TRIGGER expenses_fts_insert")
+        op.execute("DROP TABLE expenses_fts")
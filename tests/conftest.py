@@ -3,8 +3,35 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.db import Base
 from app.models.user import User
+from app.models.budget import Budget
+from app.models.budget_alert import BudgetAlert
 from app.models.category import Category
+from app.models.exchange_rate import ExchangeRate
 from app.models.expense import Expense
+from app.models.expense_monthly_total import ExpenseMonthlyTotal
+from app.models.recurring_expense import RecurringExpense
+from app.models.tombstone import Tombstone
+from app.services.exchange_rate_service import rate_cache
+from app.services.response_cache_service import response_cache
+from app.services.user_service import user_cache
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+@pytest.fixture(autouse=True)
+def clear_rate_cache():
+    rate_cache.clear()
+    yield
+    rate_cache.clear()
 
 @pytest.fixture(scope="function")
 def engine():
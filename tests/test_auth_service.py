@@ -12,6 +12,7 @@ from app.services.auth_service import (
 )
 from app.models.user import User
 from app.models.token import TokenData
+from app.services.user_service import user_cache
 import jwt
 import asyncio
 
@@ -35,7 +36,7 @@ async def test_authenticate_user_success(mocker, mock_db):
     mocker.patch("app.services.auth_service.get_user_by_email", return_value=user)
     mocker.patch("app.services.auth_service.verify_password", return_value=True)
 
-    result = authenticate_user("user@test.com", "plaintextpassword", mock_db)
+    result = await authenticate_user("user@test.com", "plaintextpassword", mock_db)
     assert result == user
 
 
@@ -48,7 +49,7 @@ async def test_authenticate_user_fail_wrong_password(mocker, mock_db):
     mocker.patch("app.services.auth_service.get_user_by_email", return_value=user)
     mocker.patch("app.services.auth_service.verify_password", return_value=False)
 
-    result = authenticate_user("user@test.com", "wrongpassword", mock_db)
+    result = await authenticate_user("user@test.com", "wrongpassword", mock_db)
     assert result is False
 
 
@@ -59,7 +60,7 @@ async def test_authenticate_user_fail_no_user(mocker, mock_db):
     """
     mocker.patch("app.services.auth_service.get_user_by_email", return_value=None)
 
-    result = authenticate_user("nouser@test.com", "password", mock_db)
+    result = await authenticate_user("nouser@test.com", "password", mock_db)
     assert result is False
 
 
@@ -126,3 +127,35 @@ async def test_get_current_active_user_returns_user():
     user = DummyUser(email="user@test.com", password="hashedpassword")
     result = await get_current_active_user(user)
     assert result == user
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_is_cached_per_token_subject(mocker):
+    """
+    Test that repeated requests with the same subject resolve the user from the cache
+    """
+    user = DummyUser(email="user@test.com", password="hashedpassword")
+    token_data = {"sub": user.email, "exp": datetime.now(timezone.utc).timestamp() + 600}
+    test_token = jwt.encode(token_data, JWT_SECRET_KEY, algorithm=ALGORITHM)
+    lookup = mocker.patch("app.services.auth_service.get_user_by_email", return_value=user)
+
+    first = await get_current_user(test_token, db=None)
+    second = await get_current_user(test_token, db=None)
+
+    assert first is second is user
+    lookup.assert_called_once()
+    assert user_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_detaches_cached_user(db, test_user):
+    """
+    Test that the cached user survives commits made by later requests
+    """
+    token = create_access_token({"sub": test_user.email})
+
+    user = await get_current_user(token, db=db)
+    db.commit()
+
+    assert user not in db
+    assert (await get_current_user(token, db=db)).username == "testuser"
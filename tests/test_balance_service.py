@@ -0,0 +1,66 @@
+import pytest
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.expense_schema import ExpenseCreate, ExpenseUpdate
+from app.services.balance_service import get_balance, reconcile_balances
+from app.services.category_service import create_category, delete_category
+from app.services.expense_service import create_expense, create_expenses_bulk, delete_expense, update_expense
+from app.services.spending_aggregation_service import get_total_spending
+
+
+@pytest.fixture
+def category(db: Session, test_user):
+    return create_category(db, CategoryCreate(name="Bills"), test_user)
+
+
+def test_get_balance_for_new_user(db: Session, test_user):
+    balance = get_balance(db, test_user)
+
+    assert balance == {"starting_balance": 1000.0, "total_spent": 0.0, "current_balance": 1000.0, "currency": "EUR"}
+
+
+def test_expense_writes_keep_total_spent_current(db: Session, test_user, category):
+    first = create_expense(db, ExpenseCreate(amount=100.25, category_id=category.id), test_user)
+    second = create_expense(db, ExpenseCreate(amount=50, category_id=category.id), test_user)
+    assert get_balance(db, test_user)["total_spent"] == 150.25
+
+    update_expense(db, first.id, ExpenseUpdate(amount=80), test_user)
+    assert get_balance(db, test_user)["total_spent"] == 130.0
+
+    delete_expense(db, second.id, test_user)
+    balance = get_balance(db, test_user)
+    assert balance["total_spent"] == 80.0
+    assert balance["current_balance"] == 920.0
+
+
+def test_totals_of_many_small_amounts_are_exact(db: Session, test_user, category):
+    create_expenses_bulk(db, [{"amount": "0.10", "category_id": category.id}] * 1000, test_user)
+
+    assert get_balance(db, test_user)["total_spent"] == Decimal("100.00")
+    assert get_total_spending(db, test_user.id) == Decimal("100.00")
+    assert reconcile_balances(db) == []
+
+
+def test_delete_category_subtracts_cascaded_expenses(db: Session, test_user, category):
+    other = create_category(db, CategoryCreate(name="Fun"), test_user)
+    create_expense(db, ExpenseCreate(amount=30, category_id=category.id), test_user)
+    create_expense(db, ExpenseCreate(amount=20, category_id=category.id), test_user)
+    create_expense(db, ExpenseCreate(amount=5, category_id=other.id), test_user)
+
+    delete_category(db, category.id, test_user)
+
+    assert get_balance(db, test_user)["total_spent"] == 5.0
+
+
+def test_reconcile_balances_repairs_drift(db: Session, test_user, another_user, category):
+    create_expense(db, ExpenseCreate(amount=40, category_id=category.id), test_user)
+    db.query(User).filter(User.id == test_user.id).update({User.total_spent_cents: 99900})
+    db.commit()
+
+    repaired = reconcile_balances(db)
+
+    assert repaired == [(test_user.id, Decimal("999.00"), Decimal("40.00"))]
+    assert get_balance(db, test_user)["total_spent"] == 40.0
+    assert reconcile_balances(db) == []
@@ -0,0 +1,13 @@
+from sqlalchemy import func, select
+from app.models.expense import Expense
+from app.models.expense_monthly_total import ExpenseMonthlyTotal
+from benchmarks.seed import seed
+
+
+def test_seed_inserts_expenses_with_their_converted_amounts(db):
+    emails = seed(db, users=2, categories=2, rows=50, batch_size=20)
+
+    assert len(emails) == 2
+    assert db.scalar(select(func.count()).select_from(Expense)) == 50
+    assert db.scalar(select(func.count()).where(Expense.converted_cents != Expense.amount_cents)) == 0
+    assert db.scalar(select(func.sum(ExpenseMonthlyTotal.total_cents))) == db.scalar(select(func.sum(Expense.amount_cents)))
@@ -0,0 +1,110 @@
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from app.models.budget import Budget
+from app.models.budget_alert import BudgetAlert
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.expense_schema import ExpenseCreate, ExpenseUpdate
+from app.services.budget_service import (
+    crossed_thresholds,
+    delete_budget,
+    get_budget_alerts,
+    get_budget_status,
+    set_budget
+)
+from app.services.category_service import create_category, delete_category
+from app.services.expense_service import create_expense, create_expenses_bulk, delete_expense, update_expense
+
+
+@pytest.fixture
+def food(db: Session, test_user):
+    return create_category(db, CategoryCreate(name="Food"), test_user)
+
+
+@pytest.fixture
+def rent(db: Session, test_user):
+    return create_category(db, CategoryCreate(name="Rent"), test_user)
+
+
+def _spend(db: Session, user, category, amount, day: datetime = datetime(2024, 3, 10)):
+    return create_expense(db, ExpenseCreate(amount=amount, category_id=category.id, date=day), user)
+
+
+def test_crossed_thresholds_reports_each_threshold_once():
+    assert crossed_thresholds(10000, 0, 7999) == []
+    assert crossed_thresholds(10000, 7999, 8000) == [80]
+    assert crossed_thresholds(10000, 0, 12000) == [80, 100]
+    assert crossed_thresholds(10000, 8500, 9000) == []
+
+
+def test_status_lists_every_category_for_the_month(db: Session, test_user, food, rent):
+    set_budget(db, food.id, Decimal("200"), test_user)
+    _spend(db, test_user, food, 50)
+    _spend(db, test_user, food, 25.5)
+    _spend(db, test_user, food, 99, datetime(2024, 4, 1))
+    _spend(db, test_user, rent, 800)
+
+    status = get_budget_status(db, test_user, date(2024, 3, 1))
+
+    assert status == [
+        {"category_id": food.id, "category_name": "Food", "budget": Decimal("200.00"), "spent": Decimal("75.50"),
+         "remaining": Decimal("124.50"), "percent_used": 37.8},
+        {"category_id": rent.id, "category_name": "Rent", "budget": None, "spent": Decimal("800.00"),
+         "remaining": None, "percent_used": None},
+    ]
+    assert get_budget_status(db, test_user, date(2024, 5, 1))[0]["spent"] == 0
+
+
+def test_writes_record_alerts_when_thresholds_are_crossed(db: Session, test_user, food):
+    set_budget(db, food.id, Decimal("100"), test_user)
+    first = _spend(db, test_user, food, 50)
+    assert db.query(BudgetAlert).count() == 0
+
+    second = _spend(db, test_user, food, 35)
+    update_expense(db, first.id, ExpenseUpdate(amount=70), test_user)
+
+    alerts = get_budget_alerts(db, test_user)
+    assert [(alert["threshold"], alert["spent"]) for alert in alerts] == [(100, Decimal("105.00")), (80, Decimal("85.00"))]
+    assert alerts[0]["month"] == date(2024, 3, 1)
+    assert alerts[0]["budget"] == Decimal("100.00")
+
+    # Dropping below a threshold and crossing it again does not repeat the alert.
+    delete_expense(db, second.id, test_user)
+    _spend(db, test_user, food, 40)
+    assert db.query(BudgetAlert).count() == 2
+
+
+def test_bulk_writes_and_other_months_are_evaluated_separately(db: Session, test_user, food, rent):
+    set_budget(db, food.id, Decimal("10"), test_user)
+
+    create_expenses_bulk(db, [
+        {"amount": 6, "category_id": food.id, "date": "2024-03-01T00:00:00"},
+        {"amount": 6, "category_id": food.id, "date": "2024-03-02T00:00:00"},
+        {"amount": 9, "category_id": food.id, "date": "2024-04-02T00:00:00"},
+        {"amount": 500, "category_id": rent.id, "date": "2024-03-02T00:00:00"},
+    ], test_user)
+
+    alerts = get_budget_alerts(db, test_user)
+    assert sorted((alert["month"], alert["threshold"]) for alert in alerts) == [
+        (date(2024, 3, 1), 80), (date(2024, 3, 1), 100), (date(2024, 4, 1), 80)
+    ]
+    assert [alert["threshold"] for alert in get_budget_alerts(db, test_user, month=date(2024, 4, 1))] == [80]
+
+
+def test_budgets_belong_to_the_categorys_owner(db: Session, test_user, another_user, food):
+    assert set_budget(db, food.id, Decimal("10"), another_user) is None
+    assert set_budget(db, food.id, Decimal("10"), test_user).amount == Decimal("10.00")
+    assert set_budget(db, food.id, Decimal("20"), test_user).amount == Decimal("20.00")
+    assert delete_budget(db, food.id, another_user) is False
+    assert db.query(Budget).count() == 1
+
+
+def test_deleting_a_category_removes_its_budget_and_alerts(db: Session, test_user, food):
+    set_budget(db, food.id, Decimal("10"), test_user)
+    _spend(db, test_user, food, 20)
+
+    delete_category(db, food.id, test_user)
+
+    assert db.query(Budget).count() == 0
+    assert db.query(BudgetAlert).count() == 0
@@ -0,0 +1,107 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from fastapi import HTTPException, Response
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.schemas.category_schema import CategoryCreate, CategoryUpdate
+from app.schemas.expense_schema import ExpenseCreate
+from app.services.balance_service import reconcile_balances
+from app.services.category_service import create_category, delete_category, update_category
+from app.services.data_version_service import bump_data_version, check_data_version, get_data_version
+from app.services.expense_service import create_expense, create_expenses_bulk, delete_expense
+
+
+def test_bump_data_version_returns_new_version(db: Session, test_user, another_user):
+    assert bump_data_version(db, test_user.id) == 1
+    assert bump_data_version(db, test_user.id) == 2
+    db.commit()
+
+    version, updated_at = get_data_version(db, test_user)
+    assert version == 2
+    assert abs(updated_at - datetime.now(timezone.utc)) < timedelta(minutes=1)
+    assert get_data_version(db, another_user) == (0, None)
+
+
+def test_category_and_expense_writes_bump_version(db: Session, test_user):
+    versions = [get_data_version(db, test_user)[0]]
+
+    category = create_category(db, CategoryCreate(name="Food"), test_user)
+    versions.append(get_data_version(db, test_user)[0])
+    update_category(db, category.id, CategoryUpdate(name="Groceries"), test_user)
+    versions.append(get_data_version(db, test_user)[0])
+    expense = create_expense(db, ExpenseCreate(amount=5, category_id=category.id), test_user)
+    versions.append(get_data_version(db, test_user)[0])
+    create_expenses_bulk(db, [{"amount": 1, "category_id": category.id}], test_user)
+    versions.append(get_data_version(db, test_user)[0])
+    delete_expense(db, expense.id, test_user)
+    versions.append(get_data_version(db, test_user)[0])
+    delete_category(db, category.id, test_user)
+    versions.append(get_data_version(db, test_user)[0])
+
+    assert versions == sorted(set(versions))
+
+
+def test_reconcile_bumps_only_repaired_users(db: Session, test_user, another_user):
+    db.query(User).filter(User.id == test_user.id).update({User.total_spent_cents: 1000})
+    db.commit()
+
+    reconcile_balances(db)
+
+    assert get_data_version(db, test_user)[0] == 1
+    assert get_data_version(db, another_user)[0] == 0
+
+
+@pytest.fixture
+def inline_run_db(mocker):
+    # The in-memory test database lives on one connection, so keep queries off the threadpool.
+    async def run_inline(db, fn, *args, **kwargs):
+        return fn(db, *args, **kwargs)
+    mocker.patch("app.services.data_version_service.run_db", run_inline)
+
+
+async def _check(db: Session, user, **headers) -> Response:
+    response = Response()
+    await check_data_version(
+        response,
+        if_none_match=headers.get("if_none_match"),
+        if_modified_since=headers.get("if_modified_since"),
+        db=db,
+        current_user=user
+    )
+    return response
+
+
+@pytest.mark.asyncio
+async def test_check_data_version_answers_304_for_current_etag(db: Session, test_user, inline_run_db):
+    bump_data_version(db, test_user.id)
+    db.commit()
+    response = await _check(db, test_user)
+    etag = response.headers["ETag"]
+    assert etag == f'W/"{test_user.id}-1"'
+
+    with pytest.raises(HTTPException) as exc:
+        await _check(db, test_user, if_none_match=f'"other", {etag.removeprefix("W/")}')
+    assert exc.value.status_code == 304
+    assert exc.value.headers["ETag"] == etag
+
+    bump_data_version(db, test_user.id)
+    db.commit()
+    response = await _check(db, test_user, if_none_match=etag)
+    assert response.headers["ETag"] == f'W/"{test_user.id}-2"'
+
+
+@pytest.mark.asyncio
+async def test_check_data_version_honours_if_modified_since(db: Session, test_user, inline_run_db):
+    bump_data_version(db, test_user.id)
+    db.commit()
+    last_modified = (await _check(db, test_user)).headers["Last-Modified"]
+
+    with pytest.raises(HTTPException) as exc:
+        await _check(db, test_user, if_modified_since=last_modified)
+    assert exc.value.status_code == 304
+
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1), usegmt=True)
+    await _check(db, test_user, if_modified_since=earlier)
+    # If-None-Match takes precedence over If-Modified-Since.
+    await _check(db, test_user, if_none_match='"stale"', if_modified_since=last_modified)
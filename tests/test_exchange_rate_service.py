@@ -0,0 +1,141 @@
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from app.models.exchange_rate import ExchangeRate
+from app.models.expense import Expense
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.expense_schema import ExpenseCreate, ExpenseUpdate
+from app.schemas.spending_aggregation_schema import SpendingGroupBy
+from app.services.balance_service import get_balance, reconcile_balances
+from app.services.category_service import create_category, delete_category
+from app.services.exchange_rate_service import (
+    MissingRateError,
+    get_rate,
+    load_rates,
+    parse_rates_csv,
+    rate_cache,
+    revalue_expenses
+)
+from app.services.expense_service import create_expense, create_expenses_bulk, delete_expense, update_expense
+from app.services.monthly_total_service import rebuild_monthly_totals
+from app.services.spending_aggregation_service import get_spending_breakdown, get_total_spending
+
+
+@pytest.fixture
+def category(db: Session, test_user):
+    return create_category(db, CategoryCreate(name="Travel"), test_user)
+
+
+@pytest.fixture
+def rates(db: Session):
+    load_rates(db, [
+        (date(2024, 1, 1), "USD", "EUR", Decimal("0.9")),
+        (date(2024, 2, 1), "USD", "EUR", Decimal("0.8")),
+    ])
+
+
+def test_parse_rates_csv_reads_rows_and_names_bad_lines():
+    lines = ["date,base,quote,rate\n", "2024-01-01,usd,EUR,0.9\n", "2024-01-02,USD,EUR,-1\n"]
+
+    rates = parse_rates_csv(lines)
+
+    assert next(rates) == (date(2024, 1, 1), "USD", "EUR", Decimal("0.9"))
+    with pytest.raises(ValueError, match="line 3: rate must be positive"):
+        next(rates)
+
+
+def test_load_rates_adds_inverse_pairs_and_replaces_existing_rates(db: Session, rates):
+    assert db.query(ExchangeRate).count() == 4
+    assert get_rate(db, "EUR", "USD", date(2024, 1, 15)) == Decimal("1.11111111")
+
+    load_rates(db, [(date(2024, 1, 1), "USD", "EUR", Decimal("0.95"))])
+
+    assert db.query(ExchangeRate).count() == 4
+    assert get_rate(db, "USD", "EUR", date(2024, 1, 15)) == Decimal("0.95")
+
+
+def test_get_rate_uses_latest_rate_on_or_before_the_day(db: Session, rates):
+    assert get_rate(db, "USD", "EUR", datetime(2024, 1, 31, 23, 59)) == Decimal("0.9")
+    assert get_rate(db, "USD", "EUR", date(2024, 3, 10)) == Decimal("0.8")
+    assert get_rate(db, "EUR", "EUR", date(2000, 1, 1)) == 1
+    with pytest.raises(MissingRateError):
+        get_rate(db, "USD", "EUR", date(2023, 12, 31))
+
+
+def test_foreign_expenses_count_in_the_users_currency(db: Session, test_user, category, rates):
+    create_expense(db, ExpenseCreate(amount=10, currency="USD", category_id=category.id, date=datetime(2024, 1, 10)), test_user)
+    create_expense(db, ExpenseCreate(amount=10, currency="USD", category_id=category.id, date=datetime(2024, 2, 10)), test_user)
+    create_expense(db, ExpenseCreate(amount=1, category_id=category.id, date=datetime(2024, 2, 11)), test_user)
+
+    assert get_balance(db, test_user)["total_spent"] == Decimal("18.00")
+    # Whole months come from the rollup, partial ones are converted in SQL; both must agree.
+    assert get_total_spending(db, test_user.id, datetime(2024, 1, 1), datetime(2024, 2, 29, 23, 59, 59)) == Decimal("18.00")
+    assert get_total_spending(db, test_user.id, datetime(2024, 1, 5), datetime(2024, 2, 10, 12)) == Decimal("17.00")
+    buckets = get_spending_breakdown(db, test_user.id, SpendingGroupBy.day, datetime(2024, 2, 1), datetime(2024, 2, 28))
+    assert [bucket["total"] for bucket in buckets] == [Decimal("8.00"), Decimal("1.00")]
+    assert reconcile_balances(db) == []
+
+
+def test_updates_and_deletes_reverse_the_converted_amount(db: Session, test_user, category, rates):
+    expense = create_expense(db, ExpenseCreate(amount=10, category_id=category.id, date=datetime(2024, 1, 10)), test_user)
+
+    update_expense(db, expense.id, ExpenseUpdate(currency="USD", date=datetime(2024, 2, 10)), test_user)
+    assert get_balance(db, test_user)["total_spent"] == Decimal("8.00")
+
+    delete_expense(db, expense.id, test_user)
+    create_expense(db, ExpenseCreate(amount=5, currency="USD", category_id=category.id, date=datetime(2024, 1, 10)), test_user)
+    delete_category(db, category.id, test_user)
+    assert get_balance(db, test_user)["total_spent"] == 0
+
+
+def test_expense_without_a_rate_is_rejected_before_writing(db: Session, test_user, category, rates):
+    with pytest.raises(MissingRateError):
+        create_expense(db, ExpenseCreate(amount=10, currency="GBP", category_id=category.id), test_user)
+    db.rollback()
+
+    result = create_expenses_bulk(db, [
+        {"amount": 10, "currency": "GBP", "category_id": category.id},
+        {"amount": 10, "currency": "USD", "category_id": category.id, "date": "2024-01-10T00:00:00"},
+    ], test_user)
+
+    assert result["created"] == 1
+    assert result["errors"][0]["index"] == 0
+    assert db.query(Expense).count() == 1
+    assert get_balance(db, test_user)["total_spent"] == Decimal("9.00")
+
+
+def test_rebuild_after_a_rate_correction_revalues_foreign_expenses(db: Session, test_user, category, rates):
+    create_expense(db, ExpenseCreate(amount=10, currency="USD", category_id=category.id, date=datetime(2024, 1, 10)), test_user)
+
+    load_rates(db, [(date(2024, 1, 1), "USD", "EUR", Decimal("0.85"))])
+    assert revalue_expenses(db, date(2024, 1, 1)) == 1
+    rebuild_monthly_totals(db)
+    repaired = reconcile_balances(db)
+
+    assert repaired == [(test_user.id, Decimal("9.00"), Decimal("8.50"))]
+    assert get_total_spending(db, test_user.id) == Decimal("8.50")
+
+
+def test_totals_reverse_the_amount_stored_at_write_time(db: Session, test_user, category, rates):
+    expense = create_expense(db, ExpenseCreate(amount=10, currency="USD", category_id=category.id, date=datetime(2024, 1, 10)), test_user)
+    create_expense(db, ExpenseCreate(amount=10, currency="USD", category_id=category.id, date=datetime(2024, 1, 11)), test_user)
+    assert expense.converted_cents == 900
+
+    # A correction nothing has revalued yet must not unbalance later updates and deletes.
+    load_rates(db, [(date(2024, 1, 1), "USD", "EUR", Decimal("0.5"))])
+    update_expense(db, expense.id, ExpenseUpdate(description="Taxi"), test_user)
+    assert get_balance(db, test_user)["total_spent"] == Decimal("18.00")
+    delete_expense(db, expense.id, test_user)
+    delete_category(db, category.id, test_user)
+
+    assert get_balance(db, test_user)["total_spent"] == 0
+    assert reconcile_balances(db) == []
+
+
+def test_only_rates_of_the_exact_day_are_cached(db: Session, rates):
+    get_rate(db, "USD", "EUR", date(2024, 2, 1))
+    get_rate(db, "USD", "EUR", date(2024, 2, 5))
+
+    assert rate_cache.get(("USD", "EUR", date(2024, 2, 1))) == Decimal("0.8")
+    assert rate_cache.get(("USD", "EUR", date(2024, 2, 5))) is None
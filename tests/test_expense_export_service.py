@@ -0,0 +1,77 @@
+import csv
+import io
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.expense_export_schema import ExportFormat
+from app.schemas.expense_schema import ExpenseCreate
+from app.services import expense_export_service
+from app.services.category_service import create_category
+from app.services.expense_export_service import export_expenses
+from app.services.expense_service import create_expense, iter_expense_rows
+
+
+@pytest.fixture
+def expenses(db: Session, test_user, another_user):
+    food = create_category(db, CategoryCreate(name="Food"), test_user)
+    rent = create_category(db, CategoryCreate(name="Rent"), test_user)
+    for i in range(5):
+        create_expense(
+            db,
+            ExpenseCreate(amount=i + 1, category_id=food.id, date=datetime(2024, 1, 1) + timedelta(days=i), description=f"meal {i}"),
+            test_user
+        )
+    create_expense(db, ExpenseCreate(amount=900, category_id=rent.id, date=datetime(2024, 2, 1)), test_user)
+    other = create_category(db, CategoryCreate(name="Food"), another_user)
+    create_expense(db, ExpenseCreate(amount=7, category_id=other.id, date=datetime(2024, 1, 3)), another_user)
+    return food, rent
+
+
+def _read_csv(chunks) -> list[dict]:
+    return list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+
+
+def test_iter_expense_rows_applies_filters(db: Session, test_user, expenses):
+    food, _ = expenses
+
+    rows = list(iter_expense_rows(db, test_user, category_id=food.id, min_amount=2, end_date=datetime(2024, 1, 4)))
+
+    assert [(row.amount_cents, row.category_name) for row in rows] == [(400, "Food"), (300, "Food"), (200, "Food")]
+
+
+def test_csv_export_streams_rows_in_chunks(db: Session, test_user, expenses, monkeypatch):
+    monkeypatch.setattr(expense_export_service, "CSV_FLUSH_ROWS", 2)
+
+    chunks = list(export_expenses(iter_expense_rows(db, test_user), ExportFormat.csv))
+
+    assert len(chunks) == 3
+    records = _read_csv(chunks)
+    assert len(records) == 6
+    assert records[0] == {
+        "id": records[0]["id"], "date": "2024-02-01T00:00:00", "amount": "900.00",
+        "currency": "EUR", "description": "", "category_id": str(expenses[1].id), "category": "Rent"
+    }
+    assert records[-1]["description"] == "meal 0"
+
+
+def test_csv_export_of_no_rows_is_just_the_header(db: Session, test_user):
+    assert _read_csv(export_expenses(iter_expense_rows(db, test_user), ExportFormat.csv)) == []
+
+
+@pytest.mark.parametrize("export_format", [ExportFormat.arrow, ExportFormat.parquet])
+def test_arrow_exports_round_trip(db: Session, test_user, expenses, monkeypatch, export_format):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+    monkeypatch.setattr(expense_export_service, "ARROW_BATCH_SIZE", 4)
+
+    data = b"".join(export_expenses(iter_expense_rows(db, test_user), export_format))
+
+    if export_format == ExportFormat.parquet:
+        table = pyarrow.parquet.read_table(pyarrow.BufferReader(data))
+    else:
+        table = pyarrow.ipc.open_stream(data).read_all()
+    assert table.column_names == list(expense_export_service.EXPORT_COLUMNS)
+    assert table.column("amount").to_pylist() == [900.0, 5.0, 4.0, 3.0, 2.0, 1.0]
+    assert table.column("date").to_pylist()[0] == datetime(2024, 2, 1)
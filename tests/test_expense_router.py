@@ -0,0 +1,30 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.db import get_db
+from app.routes.expense_router import expense_router
+from app.services.auth_service import get_current_user
+
+
+@pytest.fixture
+def client(db, test_user):
+    app = FastAPI()
+    app.include_router(expense_router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: test_user
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/expenses/", "/expenses/export"])
+@pytest.mark.parametrize("query", ["min_amount=1e30", "max_amount=10000000000000000", "min_amount=0.001"])
+def test_amount_filters_outside_money_range_are_rejected(client, path, query):
+    response = client.get(f"{path}?{query}")
+
+    assert response.status_code == 422
+
+
+def test_amount_filters_in_money_range_are_accepted(client):
+    response = client.get("/expenses/?min_amount=0.01&max_amount=9999999999999.99")
+
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,106 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.expense_schema import ExpenseCreate, ExpenseUpdate
+from app.services.category_service import create_category, delete_category
+from app.services.expense_search import search_terms
+from app.services.expense_service import (
+    create_expense,
+    create_expenses_bulk,
+    delete_expense,
+    get_expense_page,
+    get_expense_row_page,
+    get_expenses,
+    update_expense,
+)
+
+
+@pytest.fixture
+def category(db: Session, test_user):
+    return create_category(db, CategoryCreate(name="Food"), test_user)
+
+
+def _add(db: Session, user, category, description: str, days: int = 0):
+    return create_expense(
+        db,
+        ExpenseCreate(amount=1, category_id=category.id, description=description, date=datetime(2024, 1, 1) + timedelta(days=days)),
+        user
+    )
+
+
+def _search(db: Session, user, search: str, **filters) -> list:
+    return [expense.description for expense in get_expenses(db, user, search=search, **filters)]
+
+
+def test_search_terms_drop_query_syntax():
+    assert search_terms('Café "latte" OR -decaf* NEAR(x)') == ["café", "latte", "or", "decaf", "near", "x"]
+
+
+def test_search_matches_every_term_as_prefix(db: Session, test_user, category):
+    _add(db, test_user, category, "Coffee beans from the market")
+    _add(db, test_user, category, "Coffee with Ana")
+    _add(db, test_user, category, "Market groceries")
+    _add(db, test_user, category, None)
+
+    assert sorted(_search(db, test_user, "cof")) == ["Coffee beans from the market", "Coffee with Ana"]
+    assert _search(db, test_user, "COFFEE mark") == ["Coffee beans from the market"]
+    assert _search(db, test_user, "tea") == []
+    assert _search(db, test_user, "!!") == []
+
+
+def test_search_ignores_accents_and_operators(db: Session, test_user, category):
+    _add(db, test_user, category, "Café latte")
+
+    assert _search(db, test_user, "cafe") == ["Café latte"]
+    assert _search(db, test_user, 'latte OR "tea"') == []
+    assert _search(db, test_user, "latte*)") == ["Café latte"]
+
+
+def test_search_ranks_better_matches_first(db: Session, test_user, category):
+    _add(db, test_user, category, "Lunch at the office canteen with the whole team on Friday", days=2)
+    _add(db, test_user, category, "Lunch lunch", days=0)
+    _add(db, test_user, category, "Lunch", days=1)
+
+    assert _search(db, test_user, "lunch") == [
+        "Lunch lunch", "Lunch", "Lunch at the office canteen with the whole team on Friday"
+    ]
+
+
+def test_search_combines_with_filters_and_other_users(db: Session, test_user, another_user, category):
+    other_category = create_category(db, CategoryCreate(name="Food"), another_user)
+    _add(db, test_user, category, "Pizza", days=0)
+    _add(db, test_user, category, "Pizza", days=40)
+    _add(db, another_user, other_category, "Pizza")
+
+    assert len(_search(db, test_user, "pizza")) == 2
+    assert len(_search(db, test_user, "pizza", start_date=datetime(2024, 2, 1))) == 1
+    assert len(_search(db, another_user, "pizza")) == 1
+
+
+def test_search_index_follows_writes(db: Session, test_user, category):
+    expense = _add(db, test_user, category, "Taxi home")
+    create_expenses_bulk(db, [{"amount": 2, "category_id": category.id, "description": "Taxi to airport"}], test_user)
+    assert len(_search(db, test_user, "taxi")) == 2
+
+    update_expense(db, expense.id, ExpenseUpdate(description="Bus home"), test_user)
+    assert _search(db, test_user, "taxi") == ["Taxi to airport"]
+    assert _search(db, test_user, "bus") == ["Bus home"]
+
+    delete_expense(db, expense.id, test_user)
+    assert _search(db, test_user, "bus") == []
+
+    delete_category(db, category.id, test_user)
+    assert _search(db, test_user, "taxi") == []
+
+
+def test_search_results_are_a_single_page(db: Session, test_user, category):
+    for i in range(5):
+        _add(db, test_user, category, f"Parking {i}", days=i)
+
+    expenses, cursor = get_expense_page(db, test_user, limit=3, search="parking")
+    rows, row_cursor = get_expense_row_page(db, test_user, limit=3, search="park")
+
+    assert len(expenses) == 3 and cursor is None
+    assert [row.description for row in rows] == [expense.description for expense in expenses]
+    assert row_cursor is None
@@ -0,0 +1,177 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.category import Category
+from app.models.expense import Expense
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.expense_schema import ExpenseCreate, ExpenseRead, ExpenseUpdate
+from app.services.balance_service import get_balance
+from app.services.category_service import create_category
+from app.services.spending_aggregation_service import get_total_spending
+from app.services.expense_service import (
+    create_expense,
+    create_expenses_bulk,
+    decode_cursor,
+    get_expense,
+    get_expense_page,
+    get_expenses,
+    iter_expenses,
+    update_expense,
+)
+
+
+@pytest.fixture
+def category(db: Session, test_user):
+    return create_category(db, CategoryCreate(name="Groceries"), test_user)
+
+
+@pytest.fixture
+def statements(engine):
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(engine, "before_cursor_execute", count)
+
+
+def _add_expenses(db: Session, user, category, count: int, start: datetime = datetime(2024, 1, 1)):
+    for i in range(count):
+        create_expense(db, ExpenseCreate(amount=i + 1, category_id=category.id, date=start + timedelta(days=i)), user)
+
+
+def test_get_expenses_returns_newest_first(db: Session, test_user, category):
+    _add_expenses(db, test_user, category, 3)
+
+    expenses = get_expenses(db, test_user)
+
+    assert [e.amount for e in expenses] == [3, 2, 1]
+
+
+def test_get_expense_page_walks_all_pages(db: Session, test_user, category):
+    _add_expenses(db, test_user, category, 5)
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = get_expense_page(db, test_user, limit=2, cursor=cursor)
+        seen.extend(e.id for e in page)
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+def test_get_expense_page_breaks_date_ties_by_id(db: Session, test_user, category):
+    same_day = datetime(2024, 3, 1)
+    for amount in (1, 2, 3):
+        create_expense(db, ExpenseCreate(amount=amount, category_id=category.id, date=same_day), test_user)
+
+    first, cursor = get_expense_page(db, test_user, limit=2)
+    second, last_cursor = get_expense_page(db, test_user, limit=2, cursor=cursor)
+
+    assert [e.amount for e in first + second] == [3, 2, 1]
+    assert last_cursor is None
+
+
+def test_get_expense_page_respects_filters(db: Session, test_user, category):
+    _add_expenses(db, test_user, category, 4)
+
+    page, cursor = get_expense_page(db, test_user, limit=10, min_amount=3)
+
+    assert [e.amount for e in page] == [4, 3]
+    assert cursor is None
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_iter_expenses_yields_every_expense(db: Session, test_user, another_user, category):
+    _add_expenses(db, test_user, category, 7)
+    other_category = create_category(db, CategoryCreate(name="Other"), another_user)
+    _add_expenses(db, another_user, other_category, 2)
+
+    streamed = list(iter_expenses(db, test_user))
+
+    assert len(streamed) == 7
+    assert all(isinstance(e, Expense) and e.user_id == test_user.id for e in streamed)
+
+
+def test_listing_expenses_runs_a_constant_number_of_queries(db: Session, test_user, statements):
+    categories = [Category(name=f"Cat{i}", user_id=test_user.id) for i in range(10)]
+    db.add_all(categories)
+    db.flush()
+    db.add_all(
+        Expense(
+            amount=1, converted_cents=100, category_id=categories[i % 10].id, user_id=test_user.id,
+            date=datetime(2024, 1, 1)
+        )
+        for i in range(1000)
+    )
+    db.commit()
+    db.refresh(test_user)
+    db.expunge_all()
+    statements.clear()
+
+    expenses = get_expenses(db, test_user)
+    serialized = [ExpenseRead.model_validate(e, from_attributes=True) for e in expenses]
+
+    assert len(serialized) == 1000
+    assert len(statements) == 1
+
+
+def test_single_expense_paths_load_category_eagerly(db: Session, test_user, category, statements):
+    expense = create_expense(db, ExpenseCreate(amount=5, category_id=category.id), test_user)
+    db.expunge_all()
+    statements.clear()
+
+    fetched = get_expense(db, expense.id, test_user)
+    ExpenseRead.model_validate(fetched, from_attributes=True)
+    assert len(statements) == 1
+
+    other = create_category(db, CategoryCreate(name="Other"), test_user)
+    updated = update_expense(db, expense.id, ExpenseUpdate(category_id=other.id), test_user)
+    statements.clear()
+
+    assert ExpenseRead.model_validate(updated, from_attributes=True).category.name == "Other"
+    assert statements == []
+
+
+def test_create_expenses_bulk_inserts_valid_rows_and_reports_errors(db: Session, test_user, another_user, category):
+    foreign = create_category(db, CategoryCreate(name="Not mine"), another_user)
+    items = [
+        {"amount": 10, "category_id": category.id, "date": "2024-01-05T00:00:00", "description": "a"},
+        {"amount": -1, "category_id": category.id},
+        {"amount": 5, "category_id": foreign.id},
+        {"amount": 7.5, "category_id": category.id, "date": "2024-02-01T00:00:00"},
+        "not an object",
+    ]
+
+    result = create_expenses_bulk(db, items, test_user)
+
+    assert result["created"] == 2
+    assert [error["index"] for error in result["errors"]] == [1, 2, 4]
+    assert "amount" in result["errors"][0]["detail"]
+    created = [get_expense(db, expense_id, test_user) for expense_id in result["ids"]]
+    assert [(e.amount, e.description) for e in created] == [(10, "a"), (7.5, None)]
+    assert get_balance(db, test_user)["total_spent"] == 17.5
+    assert get_total_spending(db, test_user.id, datetime(2024, 2, 1)) == 7.5
+
+
+def test_create_expenses_bulk_inserts_in_batches(db: Session, test_user, category, statements):
+    items = [{"amount": i + 1, "category_id": category.id, "date": "2024-03-01T00:00:00"} for i in range(5)]
+
+    result = create_expenses_bulk(db, items, test_user, batch_size=2)
+
+    # Totals and rollups are applied once per batch of inserted rows.
+    rollup_upserts = [s for s in statements if s.startswith("INSERT INTO expense_monthly_totals")]
+    assert result["created"] == 5
+    assert len(rollup_upserts) == 3
+    assert [e.amount for e in get_expenses(db, test_user)] == [5, 4, 3, 2, 1]
+    assert result["ids"] == sorted(result["ids"])
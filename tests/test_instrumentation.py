@@ -0,0 +1,98 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app import instrumentation
+from app.instrumentation import (
+    Histogram,
+    MetricsMiddleware,
+    RequestMetrics,
+    current_request,
+    instrument_engine,
+    render_metrics,
+)
+from app.services.password_service import run_password_task
+
+
+@pytest.fixture
+def fresh_histograms():
+    for histogram in instrumentation.HISTOGRAMS:
+        histogram.clear()
+    yield
+    for histogram in instrumentation.HISTOGRAMS:
+        histogram.clear()
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("work_seconds", "Work.", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(("/a",), value)
+
+    assert histogram.render() == [
+        "# HELP work_seconds Work.",
+        "# TYPE work_seconds histogram",
+        'work_seconds_bucket{route="/a",le="0.1"} 2',
+        'work_seconds_bucket{route="/a",le="1.0"} 3',
+        'work_seconds_bucket{route="/a",le="+Inf"} 4',
+        'work_seconds_sum{route="/a"} 3.65',
+        'work_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_instrumented_engine_counts_statements_of_current_request(engine):
+    instrument_engine(engine)
+    metrics = RequestMetrics()
+    token = current_request.set(metrics)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+            with pytest.raises(Exception):
+                conn.execute(text("SELECT * FROM missing_table"))
+    finally:
+        current_request.reset(token)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 3"))
+
+    assert metrics.sql_count == 2
+    assert metrics.sql_time > 0
+
+
+@pytest.mark.asyncio
+async def test_password_tasks_add_to_current_request():
+    metrics = RequestMetrics()
+    token = current_request.set(metrics)
+    try:
+        await run_password_task(lambda: None)
+    finally:
+        current_request.reset(token)
+
+    assert metrics.password_hash_time > 0
+
+
+def test_middleware_records_route_metrics_and_server_timing(engine, fresh_histograms):
+    instrument_engine(engine)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    client = TestClient(app)
+    response = client.get("/items/7")
+    client.get("/items/8")
+    client.get("/nowhere")
+
+    timing = response.headers["server-timing"]
+    assert timing.startswith("app;dur=")
+    assert 'desc="1 queries"' in timing
+    exposition = render_metrics()
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 2' in exposition
+    assert 'http_request_sql_queries_sum{method="GET",route="/items/{item_id}",status="200"} 2' in exposition
+    assert 'http_response_size_bytes_sum{method="GET",route="/items/{item_id}",status="200"} 16' in exposition
+    assert 'route="unmatched",status="404"' in exposition
+    assert "http_request_password_hash_duration_seconds_count" not in exposition
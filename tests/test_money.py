@@ -0,0 +1,30 @@
+import pytest
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from app.money import from_cents, to_cents
+
+
+@pytest.mark.parametrize("amount, cents", [
+    (Decimal("12.34"), 1234),
+    ("0.1", 10),
+    (0.1, 10),
+    (19.99, 1999),
+    (7, 700),
+])
+def test_to_cents_is_exact(amount, cents):
+    assert to_cents(amount) == cents
+
+
+@pytest.mark.parametrize("amount", ["0.001", "abc", "NaN", "Infinity"])
+def test_to_cents_rejects_sub_cent_and_invalid_amounts(amount):
+    with pytest.raises(ValueError):
+        to_cents(amount)
+
+
+def test_to_cents_rounds_when_asked():
+    assert to_cents("10.005", ROUND_CEILING) == 1001
+    assert to_cents("10.005", ROUND_FLOOR) == 1000
+
+
+def test_from_cents_keeps_two_places():
+    assert str(from_cents(1234)) == "12.34"
+    assert str(from_cents(500)) == "5.00"
@@ -1,5 +1,13 @@
+import asyncio
+import threading
 import pytest
-from app.services.password_service import get_password_hash, verify_password
+from app.services.password_service import (
+    PasswordHasherBusy,
+    configure_password_pool,
+    get_password_hash,
+    run_password_task,
+    verify_password,
+)
 
 
 def test_get_password_hash_returns_string():
@@ -39,3 +47,39 @@ def test_verify_password_invalid_hash():
     invalid_hash = "not_a_valid_hash"
 
     assert verify_password(plain, invalid_hash) is False
+
+
+@pytest.fixture
+def small_password_pool():
+    configure_password_pool(workers=1, max_queue=1)
+    yield
+    configure_password_pool()
+
+
+@pytest.mark.asyncio
+async def test_run_password_task_returns_result_off_the_event_loop():
+    """
+    Test that bcrypt work submitted to the pool runs on a bcrypt worker thread
+    """
+    hashed = await run_password_task(get_password_hash, "pooled")
+
+    assert await run_password_task(verify_password, "pooled", hashed) is True
+    assert await run_password_task(lambda: threading.current_thread().name) != threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_run_password_task_rejects_work_when_saturated(small_password_pool):
+    """
+    Test that once workers and queue are full, further work raises PasswordHasherBusy and capacity comes back afterwards
+    """
+    release = threading.Event()
+    running = asyncio.ensure_future(run_password_task(release.wait))
+    queued = asyncio.ensure_future(run_password_task(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHasherBusy):
+        await run_password_task(verify_password, "x", "y")
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert await run_password_task(verify_password, "x", "not_a_valid_hash") is False
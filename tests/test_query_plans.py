@@ -0,0 +1,62 @@
+from datetime import date, datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.category import Category
+from app.models.expense import Expense
+from app.services.budget_service import _budget_status_query
+from app.services.expense_service import _filtered_expenses
+
+
+def _query_plan(db: Session, query) -> str:
+    compiled = query.statement.compile(dialect=db.bind.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_date_range_filter_uses_user_date_index(db: Session, test_user):
+    query = _filtered_expenses(db, test_user, start_date=datetime(2024, 1, 1), end_date=datetime(2024, 2, 1))
+
+    assert "ix_expenses_user_id_date" in _query_plan(db, query)
+
+
+def test_category_filter_uses_user_category_date_index(db: Session, test_user):
+    query = _filtered_expenses(db, test_user, category_id=1, start_date=datetime(2024, 1, 1))
+
+    assert "ix_expenses_user_id_category_id_date" in _query_plan(db, query)
+
+
+def test_total_spent_does_not_scan_expenses(db: Session, test_user):
+    query = db.query(func.sum(Expense.amount_cents)).filter(Expense.user_id == test_user.id)
+    plan = _query_plan(db, query)
+
+    assert "USING INDEX ix_expenses_user_id" in plan
+    assert "SCAN expenses" not in plan
+
+
+def test_user_categories_use_user_id_index(db: Session, test_user):
+    query = db.query(Category).filter(Category.user_id == test_user.id)
+
+    assert "ix_categories_user_id_id" in _query_plan(db, query)
+
+
+def test_search_uses_full_text_index(db: Session, test_user):
+    query = _filtered_expenses(db, test_user, search="coffee")
+    plan = _query_plan(db, query)
+
+    assert "expenses_fts VIRTUAL TABLE INDEX" in plan
+    assert "SEARCH expenses USING INTEGER PRIMARY KEY" in plan
+
+
+def test_sync_delta_uses_user_version_index(db: Session, test_user):
+    query = db.query(Expense.id).filter(Expense.user_id == test_user.id, Expense.version > 3, Expense.version <= 9)
+
+    assert "ix_expenses_user_id_version (user_id=? AND version>? AND version<?)" in _query_plan(db, query)
+
+
+def test_budget_status_reads_rollup_not_expenses(db: Session, test_user):
+    plan = _query_plan(db, _budget_status_query(db, test_user, date(2024, 1, 1)))
+
+    assert "SEARCH expense_monthly_totals USING INDEX" in plan
+    assert "(user_id=? AND category_id=? AND month=?)" in plan
+    assert "expenses " not in plan
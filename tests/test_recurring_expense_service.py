@@ -0,0 +1,143 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.budget_alert import BudgetAlert
+from app.models.expense import Expense
+from app.models.expense_monthly_total import ExpenseMonthlyTotal
+from app.models.recurring_expense import RecurringExpense
+from app.models.user import User
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.recurring_expense_schema import RecurringExpenseCreate, RecurringExpenseUpdate
+from app.services.balance_service import get_balance, reconcile_balances
+from app.services.budget_service import set_budget
+from app.services.category_service import create_category
+from app.services.recurring_expense_service import (
+    create_recurring_expense,
+    delete_recurring_expense,
+    materialise_due_occurrences,
+    occurrence_on_or_after,
+    update_recurring_expense
+)
+
+
+@pytest.fixture
+def rent(db: Session, test_user):
+    return create_category(db, CategoryCreate(name="Rent"), test_user)
+
+
+def _rule(db: Session, user, category, today: date, **values):
+    values = {"amount": 500, "category_id": category.id, "day_of_month": 1, "start_date": date(2024, 1, 1), **values}
+    return create_recurring_expense(db, RecurringExpenseCreate(**values), user, today=today)
+
+
+def _occurrences(db: Session, rule) -> list[date]:
+    return [
+        occurrence for occurrence, in db.query(Expense.occurrence_date)
+        .filter(Expense.recurring_expense_id == rule.id)
+        .order_by(Expense.occurrence_date)
+    ]
+
+
+def test_occurrences_use_the_last_day_of_short_months():
+    rule = RecurringExpense(day_of_month=31, interval_months=1, start_date=date(2024, 1, 15))
+    assert occurrence_on_or_after(rule, date(2024, 1, 1)) == date(2024, 1, 31)
+    assert occurrence_on_or_after(rule, date(2024, 2, 1)) == date(2024, 2, 29)
+    assert occurrence_on_or_after(rule, date(2024, 3, 1)) == date(2024, 3, 31)
+
+    quarterly = RecurringExpense(day_of_month=10, interval_months=3, start_date=date(2024, 1, 20))
+    assert occurrence_on_or_after(quarterly, date(2024, 1, 20)) == date(2024, 4, 10)
+    assert occurrence_on_or_after(quarterly, date(2024, 4, 11)) == date(2024, 7, 10)
+
+
+def test_creating_a_rule_catches_up_to_today(db: Session, test_user, rent):
+    rule = _rule(db, test_user, rent, today=date(2024, 3, 15), description="Flat")
+
+    assert _occurrences(db, rule) == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert rule.next_date == date(2024, 4, 1)
+    assert get_balance(db, test_user)["total_spent"] == Decimal("1500.00")
+    assert db.query(ExpenseMonthlyTotal).count() == 3
+    assert reconcile_balances(db) == []
+
+
+def test_scheduler_materialises_due_occurrences_for_all_users(db: Session, test_user, another_user, rent):
+    other_rent = create_category(db, CategoryCreate(name="Rent"), another_user)
+    first = _rule(db, test_user, rent, today=date(2024, 1, 1))
+    second = _rule(db, another_user, other_rent, today=date(2024, 1, 1), amount=20, day_of_month=15)
+
+    assert materialise_due_occurrences(db, today=date(2024, 3, 20), batch_size=1) == 5
+    assert materialise_due_occurrences(db, today=date(2024, 3, 20)) == 0
+
+    assert _occurrences(db, first) == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert _occurrences(db, second) == [date(2024, 1, 15), date(2024, 2, 15), date(2024, 3, 15)]
+    assert get_balance(db, another_user)["total_spent"] == Decimal("60.00")
+
+
+def test_occurrences_are_created_once_even_if_next_date_falls_behind(db: Session, test_user, rent):
+    rule = _rule(db, test_user, rent, today=date(2024, 2, 10))
+    # As after a run that inserted its expenses but failed before advancing the rule.
+    db.query(RecurringExpense).update({RecurringExpense.next_date: date(2024, 1, 1)})
+    db.commit()
+
+    assert materialise_due_occurrences(db, today=date(2024, 3, 10)) == 1
+    assert _occurrences(db, rule) == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert get_balance(db, test_user)["total_spent"] == Decimal("1500.00")
+
+
+def test_rules_stop_at_their_end_date_and_resume_when_it_moves(db: Session, test_user, rent):
+    rule = _rule(db, test_user, rent, today=date(2024, 6, 1), end_date=date(2024, 2, 20))
+    assert _occurrences(db, rule) == [date(2024, 1, 1), date(2024, 2, 1)]
+    assert rule.next_date is None
+
+    rule = update_recurring_expense(
+        db, rule.id, RecurringExpenseUpdate(end_date=date(2024, 4, 1), amount=600), test_user, today=date(2024, 6, 1)
+    )
+
+    assert _occurrences(db, rule) == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1), date(2024, 4, 1)]
+    assert get_balance(db, test_user)["total_spent"] == Decimal("2200.00")
+
+
+def test_deleting_a_rule_keeps_its_expenses(db: Session, test_user, rent):
+    rule = _rule(db, test_user, rent, today=date(2024, 2, 1))
+
+    assert delete_recurring_expense(db, rule.id, test_user) is True
+
+    assert db.query(Expense).filter(Expense.recurring_expense_id.isnot(None)).count() == 0
+    assert db.query(Expense).count() == 2
+
+
+def test_foreign_rules_wait_for_an_exchange_rate(db: Session, test_user, rent):
+    rule = _rule(db, test_user, rent, today=date(2024, 2, 1), currency="USD")
+
+    assert _occurrences(db, rule) == []
+    assert rule.next_date == date(2024, 1, 1)
+
+
+def test_materialised_expenses_raise_budget_alerts(db: Session, test_user, rent):
+    set_budget(db, rent.id, Decimal("500"), test_user)
+    _rule(db, test_user, rent, today=date(2024, 1, 1))
+
+    assert db.query(BudgetAlert.threshold).order_by(BudgetAlert.threshold).all() == [(80,), (100,)]
+
+
+def test_catch_up_statement_count_does_not_grow_with_users(db: Session, engine):
+    def catch_up(users: int) -> int:
+        for index in range(users):
+            user = User(email=f"u{users}-{index}@example.com", username=f"u{users}-{index}", password="x")
+            db.add(user)
+            db.commit()
+            category = create_category(db, CategoryCreate(name="Bills"), user)
+            _rule(db, user, category, today=date(2023, 12, 31))
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            created = materialise_due_occurrences(db, today=date(2024, 12, 31))
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert created == users * 12
+        return len(statements)
+
+    assert catch_up(3) == catch_up(30)
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy.orm import Session
+from app.cache import TTLCache
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.expense_schema import ExpenseCreate
+from app.services.category_service import create_category, delete_category
+from app.services.data_version_service import bump_data_version, get_data_version
+from app.services.expense_service import create_expense
+from app.services.monthly_total_service import rebuild_monthly_totals
+from app.services.response_cache_service import ResponseCache, configure_response_cache, response_cache
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return {"calls": self.calls}
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_caches_per_user_and_params():
+    cache = ResponseCache(TTLCache(maxsize=100, ttl=60))
+    load = Loader()
+
+    assert await cache.get_or_load(1, 1, "aggregate", {"category_id": 2}, load) == {"calls": 1}
+    assert await cache.get_or_load(1, 1, "aggregate", {"category_id": 2}, load) == {"calls": 1}
+    assert await cache.get_or_load(1, 1, "aggregate", {"category_id": 3}, load) == {"calls": 2}
+    assert await cache.get_or_load(2, 1, "aggregate", {"category_id": 2}, load) == {"calls": 3}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 3, 0.25)
+
+
+@pytest.mark.asyncio
+async def test_entries_are_keyed_by_data_version():
+    cache = ResponseCache(TTLCache(maxsize=100, ttl=60))
+    load = Loader()
+    await cache.get_or_load(1, 1, "balance", {}, load)
+    await cache.get_or_load(2, 1, "balance", {}, load)
+
+    assert await cache.get_or_load(1, 2, "balance", {}, load) == {"calls": 3}
+    assert await cache.get_or_load(2, 1, "balance", {}, load) == {"calls": 2}
+
+
+@pytest.mark.asyncio
+async def test_zero_size_backend_disables_caching():
+    cache = ResponseCache(TTLCache(maxsize=0, ttl=60))
+    load = Loader()
+
+    await cache.get_or_load(1, 1, "balance", {}, load)
+    await cache.get_or_load(1, 1, "balance", {}, load)
+
+    assert load.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_from_another_session_make_entries_unreachable(db: Session, engine, test_user):
+    load = Loader()
+    category = create_category(db, CategoryCreate(name="Food"), test_user)
+
+    async def get_balance():
+        version, _ = get_data_version(db, test_user)
+        return await response_cache.get_or_load(test_user.id, version, "balance", {}, load)
+
+    await get_balance()
+    # As another worker or the CLI would: nothing in this process sees the commit happen.
+    with Session(engine) as other:
+        bump_data_version(other, test_user.id)
+        other.commit()
+    assert await get_balance() == {"calls": 2}
+
+    create_expense(db, ExpenseCreate(amount=5, category_id=category.id), test_user)
+    assert await get_balance() == {"calls": 3}
+
+    rebuild_monthly_totals(db, test_user.id)
+    assert await get_balance() == {"calls": 4}
+
+    delete_category(db, category.id, test_user)
+    assert await get_balance() == {"calls": 5}
+
+
+@pytest.mark.asyncio
+async def test_configure_response_cache_swaps_backend():
+    original = response_cache.backend
+    backend = TTLCache(maxsize=5, ttl=60)
+    try:
+        configure_response_cache(backend)
+        await response_cache.get_or_load(1, 1, "balance", {}, Loader())
+        assert backend.stats()["size"] == 1
+    finally:
+        configure_response_cache(original)
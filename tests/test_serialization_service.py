@@ -0,0 +1,48 @@
+import json
+from datetime import datetime, timedelta
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from app.schemas.category_schema import CategoryCreate, CategoryRead
+from app.schemas.expense_schema import ExpenseCreate, ExpenseRead
+from app.services.category_service import create_category, get_categories, get_category_rows
+from app.services.expense_service import create_expense, get_expense_page, get_expense_row_page
+from app.services.serialization_service import category_rows_json, expense_row_json, expense_rows_json
+
+
+def _validated_json(schema, objects) -> list:
+    # What FastAPI produces from ORM objects through response_model.
+    adapter = TypeAdapter(List[schema])
+    return adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+
+
+def test_expense_rows_json_matches_response_model_output(db: Session, test_user):
+    food = create_category(db, CategoryCreate(name="Food"), test_user)
+    rent = create_category(db, CategoryCreate(name="Rent"), test_user)
+    for i in range(5):
+        create_expense(db, ExpenseCreate(
+            amount=i + 0.25,
+            category_id=(food if i % 2 else rent).id,
+            date=datetime(2024, 1, 1, 12, 30) + timedelta(days=i),
+            description="rent \"deposit\"" if i == 0 else None
+        ), test_user)
+
+    expenses, cursor = get_expense_page(db, test_user, limit=3)
+    rows, row_cursor = get_expense_row_page(db, test_user, limit=3)
+
+    assert row_cursor == cursor
+    assert json.loads(expense_rows_json(rows)) == _validated_json(ExpenseRead, expenses)
+    assert json.loads(expense_row_json(rows[0])) == _validated_json(ExpenseRead, expenses)[0]
+    next_rows, _ = get_expense_row_page(db, test_user, limit=3, cursor=row_cursor)
+    assert [row.description for row in next_rows] == [None, "rent \"deposit\""]
+
+
+def test_category_rows_json_matches_response_model_output(db: Session, test_user, another_user):
+    create_category(db, CategoryCreate(name="Food"), test_user)
+    create_category(db, CategoryCreate(name="Travel"), test_user)
+    create_category(db, CategoryCreate(name="Other"), another_user)
+
+    body = category_rows_json(get_category_rows(db, test_user))
+
+    assert json.loads(body) == _validated_json(CategoryRead, get_categories(db, test_user))
+    assert json.loads(category_rows_json([])) == []
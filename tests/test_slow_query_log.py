@@ -0,0 +1,126 @@
+import logging
+import threading
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import text
+from app.instrumentation import RequestMetrics, current_request
+from app.services.expense_service import get_expenses
+from app.slow_query_log import SlowQueryLog, enable_slow_query_log, numbered_placeholders, redact_parameters
+
+
+class Route:
+    path = "/api/expenses/"
+
+
+def test_redact_parameters_keeps_only_ids_and_flags():
+    assert redact_parameters({"user_id": 3, "amount": 12.5, "date": datetime(2024, 1, 1), "flag": True, "x": None}) == {
+        "user_id": 3, "amount": "<float>", "date": "<datetime>", "flag": True, "x": None
+    }
+    assert redact_parameters([(1, "secret", Decimal("1.00"))]) == [(1, "<str>", "<Decimal>")]
+    assert redact_parameters({"amount_cents_1": 499999, "total_spent_cents": 5, "param_1": 100, "ids": [1, 2]}) == {
+        "amount_cents_1": "<int>", "total_spent_cents": "<int>", "param_1": 100, "ids": [1, 2]
+    }
+
+
+def test_amount_filters_in_cents_are_redacted(db, engine, test_user, caplog):
+    enable_slow_query_log([engine], threshold_ms=0)
+
+    with caplog.at_level(logging.WARNING, logger="app.slow_query_log"):
+        get_expenses(db, test_user, min_amount=Decimal("4999.99"))
+
+    message = next(record.getMessage() for record in caplog.records if "FROM expenses" in record.getMessage())
+    assert "499999" not in message
+    assert "'amount_cents_1': '<int>'" in message
+    assert f"'user_id_1': {test_user.id}" in message
+
+
+def test_logs_statements_over_threshold_with_route(engine, caplog):
+    enable_slow_query_log([engine], threshold_ms=0)
+    token = current_request.set(RequestMetrics({"route": Route()}))
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.slow_query_log"), engine.connect() as conn:
+            conn.execute(text("SELECT :amount, :user_id"), {"amount": 99.5, "user_id": 7})
+    finally:
+        current_request.reset(token)
+
+    message = caplog.records[-1].getMessage()
+    assert message.startswith("Slow query (")
+    assert "on /api/expenses/: SELECT ?, ?" in message
+    assert "{'amount': '<float>', 'user_id': 7}" in message
+    assert "99.5" not in message
+
+
+def test_fast_and_unsampled_statements_are_not_logged(engine, caplog):
+    enable_slow_query_log([engine], threshold_ms=60000)
+    enable_slow_query_log([engine], threshold_ms=0, sample_rate=0)
+
+    with caplog.at_level(logging.WARNING, logger="app.slow_query_log"), engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert caplog.records == []
+
+
+def test_sqlite_statements_are_not_explained(engine):
+    slow_query_log = enable_slow_query_log([engine], threshold_ms=0, explain_engine=engine)
+
+    assert slow_query_log.explain_engine is None
+
+
+def test_slow_selects_are_explained_in_the_background(engine, caplog):
+    slow_query_log = SlowQueryLog(threshold_ms=0, queue_size=1)
+    slow_query_log.explain_engine = engine
+    release = threading.Event()
+    explained = []
+
+    def explain(statement, parameters):
+        release.wait(5)
+        explained.append((statement, parameters))
+        return "Seq Scan on expenses"
+
+    slow_query_log.explain = explain
+    slow_query_log.listen(engine)
+
+    with caplog.at_level(logging.WARNING, logger="app.slow_query_log"), engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+        conn.execute(text("SELECT 3"))
+        conn.execute(text("CREATE TABLE t (id INTEGER)"))
+        release.set()
+        slow_query_log._queue.join()
+
+    assert explained[0][0] == "SELECT 1"
+    assert slow_query_log.explains_dropped >= 1
+    assert any("Seq Scan on expenses" in record.getMessage() for record in caplog.records)
+    assert all(not statement.startswith("CREATE") for statement, _ in explained)
+
+
+def test_numbered_placeholders_rewrites_driver_paramstyles():
+    statement = (
+        "SELECT * FROM expenses WHERE user_id = %(user_id_1)s "
+        "AND (description LIKE '10%%' OR user_id = %(user_id_1)s) LIMIT %(param_1)s"
+    )
+
+    assert numbered_placeholders(statement, {"user_id_1": 3, "param_1": 100}) == (
+        "SELECT * FROM expenses WHERE user_id = $1 AND (description LIKE '10%' OR user_id = $1) LIMIT $2",
+        (3, 100)
+    )
+    assert numbered_placeholders("SELECT %s, %s", (1, "x")) == ("SELECT $1, $2", (1, "x"))
+    assert numbered_placeholders("SELECT 1", None) == ("SELECT 1", ())
+
+
+def test_failed_explains_do_not_log_parameters(engine, caplog):
+    slow_query_log = SlowQueryLog(threshold_ms=0)
+    slow_query_log.explain_engine = engine
+
+    def explain(statement, parameters):
+        raise RuntimeError(f"[parameters: {parameters}]")
+
+    slow_query_log.explain = explain
+    slow_query_log.listen(engine)
+
+    with caplog.at_level(logging.WARNING, logger="app.slow_query_log"), engine.connect() as conn:
+        conn.execute(text("SELECT :search"), {"search": "secret"})
+        slow_query_log._queue.join()
+
+    assert "Could not EXPLAIN slow query: SELECT ? (RuntimeError)" in caplog.text
+    assert "secret" not in caplog.text
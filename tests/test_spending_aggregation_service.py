@@ -0,0 +1,151 @@
+import pytest
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from app.models.expense_monthly_total import ExpenseMonthlyTotal
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.expense_schema import ExpenseCreate, ExpenseUpdate
+from app.schemas.spending_aggregation_schema import SpendingGroupBy
+from app.services.category_service import create_category, delete_category
+from app.services.expense_service import create_expense, delete_expense, update_expense
+from app.services.monthly_total_service import rebuild_monthly_totals
+from app.services.spending_aggregation_service import get_spending_breakdown, get_total_spending
+
+
+@pytest.fixture
+def categories(db: Session, test_user):
+    return [create_category(db, CategoryCreate(name=name), test_user) for name in ("Food", "Rent")]
+
+
+@pytest.fixture
+def expenses(db: Session, test_user, categories):
+    created = []
+    day = datetime(2024, 1, 1, 12)
+    for i in range(40):
+        category = categories[i % 2]
+        created.append(create_expense(
+            db, ExpenseCreate(amount=i + 1, category_id=category.id, date=day + timedelta(days=9 * i)), test_user
+        ))
+    return created
+
+
+def _expected(expenses, start=None, end=None, category_id=None):
+    return sum(
+        e.amount for e in expenses
+        if (start is None or e.date >= start)
+        and (end is None or e.date <= end)
+        and (category_id is None or e.category_id == category_id)
+    )
+
+
+def _monthly_rows(db: Session, user_id: int):
+    return sorted(
+        (row.category_id, row.month, row.total_cents, row.expense_count)
+        for row in db.query(ExpenseMonthlyTotal).filter(ExpenseMonthlyTotal.user_id == user_id)
+    )
+
+
+@pytest.mark.parametrize("start, end", [
+    (None, None),
+    (datetime(2024, 3, 1), None),
+    (None, datetime(2024, 6, 30, 23, 59, 59, 999999)),
+    (datetime(2024, 2, 15), datetime(2024, 9, 10)),
+    (datetime(2024, 3, 1), datetime(2024, 5, 31, 23, 59, 59, 999999)),
+    (datetime(2024, 4, 3), datetime(2024, 4, 20)),
+    (datetime(2024, 4, 3), datetime(2024, 5, 20)),
+])
+def test_get_total_spending_matches_raw_sum(db: Session, test_user, categories, expenses, start, end):
+    assert get_total_spending(db, test_user.id, start, end) == _expected(expenses, start, end)
+    assert get_total_spending(db, test_user.id, start, end, categories[1].id) == _expected(
+        expenses, start, end, categories[1].id
+    )
+
+
+def test_get_total_spending_ignores_other_users(db: Session, test_user, another_user, expenses):
+    other_category = create_category(db, CategoryCreate(name="Other"), another_user)
+    create_expense(db, ExpenseCreate(amount=500, category_id=other_category.id, date=datetime(2024, 2, 1)), another_user)
+
+    assert get_total_spending(db, test_user.id) == _expected(expenses)
+
+
+def test_monthly_totals_follow_updates_and_deletes(db: Session, test_user, categories):
+    expense = create_expense(
+        db, ExpenseCreate(amount=10, category_id=categories[0].id, date=datetime(2024, 1, 31)), test_user
+    )
+    update_expense(
+        db, expense.id, ExpenseUpdate(amount=15, category_id=categories[1].id, date=datetime(2024, 2, 1)), test_user
+    )
+
+    assert get_total_spending(db, test_user.id, datetime(2024, 1, 1), datetime(2024, 1, 31, 23, 59, 59)) == 0
+    assert get_total_spending(db, test_user.id, datetime(2024, 2, 1), None, categories[1].id) == 15
+
+    delete_expense(db, expense.id, test_user)
+    assert get_total_spending(db, test_user.id) == 0
+
+
+def test_delete_category_removes_its_monthly_totals(db: Session, test_user, categories, expenses):
+    delete_category(db, categories[0].id, test_user)
+
+    assert all(row[0] == categories[1].id for row in _monthly_rows(db, test_user.id))
+    assert get_total_spending(db, test_user.id) == _expected(expenses, category_id=categories[1].id)
+
+
+def test_rebuild_monthly_totals_matches_incremental_rows(db: Session, test_user, expenses):
+    incremental = _monthly_rows(db, test_user.id)
+    db.query(ExpenseMonthlyTotal).delete()
+    db.commit()
+
+    rebuild_monthly_totals(db, test_user.id)
+
+    assert _monthly_rows(db, test_user.id) == incremental
+
+
+def _expected_buckets(expenses, group_by, start=None, end=None):
+    periods = {
+        SpendingGroupBy.day: lambda d: d.date(),
+        SpendingGroupBy.week: lambda d: d.date() - timedelta(days=d.weekday()),
+        SpendingGroupBy.month: lambda d: date(d.year, d.month, 1),
+        SpendingGroupBy.category_month: lambda d: date(d.year, d.month, 1),
+    }
+    totals = defaultdict(Decimal)
+    for e in expenses:
+        if (start is None or e.date >= start) and (end is None or e.date <= end):
+            key = {}
+            if group_by in (SpendingGroupBy.category, SpendingGroupBy.category_month):
+                key["category_id"] = e.category_id
+            if group_by in periods:
+                key["period"] = periods[group_by](e.date)
+            totals[tuple(key.items())] += e.amount
+    return sorted(
+        ({**dict(key), "total": total} for key, total in totals.items()),
+        key=lambda bucket: tuple(v for k, v in bucket.items() if k != "total")
+    )
+
+
+@pytest.mark.parametrize("group_by", list(SpendingGroupBy))
+@pytest.mark.parametrize("start, end", [
+    (None, None),
+    (datetime(2024, 2, 1), datetime(2024, 7, 31, 23, 59, 59, 999999)),
+    (datetime(2024, 2, 10), datetime(2024, 7, 20)),
+])
+def test_get_spending_breakdown_matches_raw_grouping(db: Session, test_user, expenses, group_by, start, end):
+    buckets = get_spending_breakdown(db, test_user.id, group_by, start, end)
+
+    assert buckets == _expected_buckets(expenses, group_by, start, end)
+
+
+def test_get_spending_breakdown_weeks_start_on_monday(db: Session, test_user, categories):
+    for day in (date(2024, 5, 5), date(2024, 5, 6), date(2024, 5, 12), date(2024, 5, 13)):
+        create_expense(
+            db, ExpenseCreate(amount=1, category_id=categories[0].id, date=datetime.combine(day, datetime.min.time())),
+            test_user
+        )
+
+    buckets = get_spending_breakdown(db, test_user.id, SpendingGroupBy.week)
+
+    assert buckets == [
+        {"period": date(2024, 4, 29), "total": 1},
+        {"period": date(2024, 5, 6), "total": 2},
+        {"period": date(2024, 5, 13), "total": 1},
+    ]
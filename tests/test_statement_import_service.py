@@ -0,0 +1,120 @@
+import io
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from app.models.category import Category
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.statement_import_schema import DebitSign, StatementFormat
+from app.services import statement_import_service
+from app.services.balance_service import get_balance
+from app.services.category_service import create_category
+from app.services.expense_service import get_expenses
+from app.services.statement_import_service import import_statement, parse_csv, parse_ofx
+
+CSV_STATEMENT = """Booking date,Amount,Payee,Type
+05.01.2024,-12.50,Bakery,Food
+06.01.2024,"-1.234,00",Landlord,Rent
+07.01.2024,abc,Broken,Food
+08.01.2024,-3.20,Kiosk,
+"""
+
+OFX_SGML = (
+    "OFXHEADER:100\nDATA:OFXSGML\n\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>"
+    "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240105120000[+1:CET]<TRNAMT>-12.50<NAME>Bakery</STMTTRN>"
+    "<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240106<TRNAMT>2500.00<NAME>Salary</STMTTRN>"
+    "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240107<TRNAMT>-40.00<MEMO>Fuel</STMTTRN>"
+    "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"
+)
+
+OFX_XML = """<?xml version="1.0"?>
+<OFX>
+  <STMTTRN>
+    <TRNTYPE>DEBIT</TRNTYPE>
+    <DTPOSTED>20240301</DTPOSTED>
+    <TRNAMT>-9.99</TRNAMT>
+    <NAME>Streaming</NAME>
+  </STMTTRN>
+</OFX>
+"""
+
+
+def _csv_options():
+    return dict(
+        date_column="Booking date",
+        amount_column="Amount",
+        description_column="Payee",
+        category_column="Type",
+        date_format="%d.%m.%Y",
+    )
+
+
+def test_parse_csv_maps_columns_and_reports_bad_rows():
+    rows = list(parse_csv(io.StringIO(CSV_STATEMENT), **_csv_options()))
+
+
+    assert rows[0] == (2, {"amount": 12.5, "date": datetime(2024, 1, 5), "description": "Bakery", "category": "Food"})
+    assert rows[1][1]["amount"] == 1234.0
+    assert rows[2][0] == 4 and isinstance(rows[2][1], str)
+    assert rows[3][1]["category"] is None
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64 * 1024])
+def test_parse_ofx_reads_debits_across_chunk_boundaries(monkeypatch, chunk_size):
+    monkeypatch.setattr(statement_import_service, "OFX_CHUNK_SIZE", chunk_size)
+
+    rows = list(parse_ofx(io.StringIO(OFX_SGML)))
+
+    assert rows == [
+        (1, {"amount": 12.5, "date": datetime(2024, 1, 5, 12), "description": "Bakery", "category": None}),
+        (2, None),
+        (3, {"amount": 40.0, "date": datetime(2024, 1, 7), "description": "Fuel", "category": None}),
+    ]
+
+
+def test_parse_ofx_accepts_xml_statements():
+    rows = list(parse_ofx(io.StringIO(OFX_XML)))
+
+    assert rows == [(1, {"amount": Decimal("9.99"), "date": datetime(2024, 3, 1), "description": "Streaming", "category": None})]
+
+
+@pytest.mark.parametrize("debit_sign, salary", [(DebitSign.negative, "2500.00"), (DebitSign.positive, "-2500.00")])
+def test_import_statement_skips_csv_credits(db: Session, test_user, debit_sign, salary):
+    debit = "-12.50" if debit_sign == DebitSign.negative else "12.50"
+    statement = f"date,amount,description\n2024-01-05,{debit},Bakery\n2024-01-06,{salary},Salary\n"
+
+    result = import_statement(db, test_user, io.StringIO(statement), debit_sign=debit_sign)
+
+    assert (result.rows_read, result.imported, result.skipped, result.failed) == (2, 1, 1, 0)
+    assert [e.description for e in get_expenses(db, test_user)] == ["Bakery"]
+    assert get_balance(db, test_user)["total_spent"] == Decimal("12.50")
+
+
+def test_import_statement_creates_categories_and_commits_in_batches(db: Session, test_user):
+    create_category(db, CategoryCreate(name="Food"), test_user)
+    stream = io.StringIO(CSV_STATEMENT)
+    progress = []
+
+    result = import_statement(
+        db, test_user, stream,
+        batch_size=2,
+        on_progress=lambda r: progress.append(r.imported),
+        **_csv_options()
+    )
+
+    assert (result.rows_read, result.imported, result.failed, result.categories_created) == (4, 3, 1, 2)
+    assert result.errors[0].line == 4
+    assert progress == [2, 3]
+    names = {c.name for c in db.query(Category).filter(Category.user_id == test_user.id)}
+    assert names == {"Food", "Rent", "Imported"}
+    assert sorted(e.amount for e in get_expenses(db, test_user)) == [Decimal("3.20"), Decimal("12.50"), Decimal("1234.00")]
+    assert get_balance(db, test_user)["total_spent"] == Decimal("1249.70")
+
+
+def test_import_statement_from_ofx(db: Session, test_user):
+    result = import_statement(
+        db, test_user, io.StringIO(OFX_SGML), statement_format=StatementFormat.ofx, default_category="Bank"
+    )
+
+    assert (result.rows_read, result.imported, result.skipped) == (3, 2, 1)
+    assert {e.category.name for e in get_expenses(db, test_user)} == {"Bank"}
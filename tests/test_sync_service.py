@@ -0,0 +1,93 @@
+import json
+import pytest
+from sqlalchemy.orm import Session
+from app.schemas.category_schema import CategoryCreate, CategoryUpdate
+from app.schemas.expense_schema import ExpenseCreate, ExpenseUpdate
+from app.services.category_service import create_category, delete_category, update_category
+from app.services.data_version_service import bump_data_version
+from app.services.expense_service import create_expense, create_expenses_bulk, delete_expense, update_expense
+from app.services.serialization_service import sync_json
+from app.services.sync_service import get_changes
+
+
+def _ids(rows) -> list[int]:
+    return [row[0] for row in rows]
+
+
+def test_full_sync_returns_everything_without_deletions(db: Session, test_user, another_user):
+    food = create_category(db, CategoryCreate(name="Food"), test_user)
+    expense = create_expense(db, ExpenseCreate(amount=5, category_id=food.id), test_user)
+    deleted = create_expense(db, ExpenseCreate(amount=7, category_id=food.id), test_user)
+    delete_expense(db, deleted.id, test_user)
+    create_category(db, CategoryCreate(name="Theirs"), another_user)
+
+    changes = get_changes(db, test_user)
+
+    assert changes["token"] == 4
+    assert _ids(changes["categories"]) == [food.id]
+    assert _ids(changes["expenses"]) == [expense.id]
+    assert changes["deleted"] == {"categories": [], "expenses": []}
+
+
+def test_delta_contains_only_later_writes_and_deletions(db: Session, test_user):
+    food = create_category(db, CategoryCreate(name="Food"), test_user)
+    rent = create_category(db, CategoryCreate(name="Rent"), test_user)
+    kept = create_expense(db, ExpenseCreate(amount=5, category_id=food.id), test_user)
+    changed = create_expense(db, ExpenseCreate(amount=6, category_id=food.id), test_user)
+    removed = create_expense(db, ExpenseCreate(amount=7, category_id=food.id), test_user)
+    token = get_changes(db, test_user)["token"]
+
+    update_expense(db, changed.id, ExpenseUpdate(amount=60), test_user)
+    delete_expense(db, removed.id, test_user)
+    update_category(db, rent.id, CategoryUpdate(name="Housing"), test_user)
+    bulk = create_expenses_bulk(db, [{"amount": 1, "category_id": rent.id}], test_user)
+
+    changes = get_changes(db, test_user, since=token)
+
+    assert _ids(changes["categories"]) == [rent.id]
+    assert _ids(changes["expenses"]) == [changed.id, *bulk["ids"]]
+    assert kept.id not in _ids(changes["expenses"])
+    assert changes["deleted"] == {"categories": [], "expenses": [removed.id]}
+    assert get_changes(db, test_user, since=changes["token"])["expenses"] == []
+
+
+def test_deleting_category_records_its_expenses(db: Session, test_user):
+    food = create_category(db, CategoryCreate(name="Food"), test_user)
+    first = create_expense(db, ExpenseCreate(amount=5, category_id=food.id), test_user)
+    second = create_expense(db, ExpenseCreate(amount=6, category_id=food.id), test_user)
+    token = get_changes(db, test_user)["token"]
+
+    delete_category(db, food.id, test_user)
+
+    changes = get_changes(db, test_user, since=token)
+    assert changes["deleted"] == {"categories": [food.id], "expenses": sorted([first.id, second.id])}
+    assert changes["categories"] == [] and changes["expenses"] == []
+
+
+def test_writes_after_token_wait_for_next_sync(db: Session, test_user):
+    food = create_category(db, CategoryCreate(name="Food"), test_user)
+    # A row stamped with a version above the token read, as if committed mid-sync.
+    expense = create_expense(db, ExpenseCreate(amount=5, category_id=food.id), test_user)
+    expense.version = bump_data_version(db, test_user.id) + 1
+    db.commit()
+
+    changes = get_changes(db, test_user)
+    assert _ids(changes["expenses"]) == []
+
+
+def test_token_ahead_of_data_is_rejected(db: Session, test_user):
+    with pytest.raises(ValueError):
+        get_changes(db, test_user, since=1)
+
+
+def test_sync_json_matches_list_shapes(db: Session, test_user):
+    food = create_category(db, CategoryCreate(name="Food"), test_user)
+    expense = create_expense(db, ExpenseCreate(amount=5, description="Lunch", category_id=food.id), test_user)
+
+    body = json.loads(sync_json(get_changes(db, test_user)))
+
+    assert body["token"] == 2
+    assert body["categories"] == [{"name": "Food", "id": food.id}]
+    assert body["expenses"][0]["id"] == expense.id
+    assert body["expenses"][0]["category"] == {"id": food.id, "name": "Food"}
+    assert body["deleted"] == {"categories": [], "expenses": []}
@@ -6,6 +6,7 @@ from app.services.user_service import (
     get_user_by_email,
     create_user,
     delete_user,
+    user_cache,
 )
 from app.models.user import User
 from app.schemas.user_schema import UserCreate
@@ -92,3 +93,32 @@ def test_delete_user_deletes_and_commits_when_found(mock_db):
 
     mock_db.delete.assert_called_once_with(user)
     mock_db.commit.assert_called_once()
+
+
+def test_delete_user_invalidates_cached_user(mock_db):
+    """
+    Test delete_user drops the user from the authenticated user cache
+    """
+    user = User(id=1, email="cached@example.com")
+    user_cache.set(user.email, user)
+    mock_db.query.return_value.filter.return_value.first.return_value = user
+
+    delete_user(mock_db, 1)
+
+    assert user_cache.get(user.email) is None
+
+
+def test_updating_user_invalidates_old_and_new_email(db, test_user):
+    """
+    Test that an ORM update of a user evicts it from the cache under both emails once it commits
+    """
+    user_cache.set("test@example.com", test_user)
+    user_cache.set("renamed@example.com", test_user)
+
+    test_user.email = "renamed@example.com"
+    db.flush()
+    assert user_cache.get("test@example.com") is test_user
+    db.commit()
+
+    assert user_cache.get("test@example.com") is None
+    assert user_cache.get("renamed@example.com") is None